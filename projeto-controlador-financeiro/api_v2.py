@@ -2,7 +2,7 @@
 API REST v2 com autenticação JWT para o Controlador Financeiro.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, make_response, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import (
     JWTManager, create_access_token, jwt_required, 
@@ -10,7 +10,15 @@ from flask_jwt_extended import (
 )
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from functools import wraps
+from urllib.parse import urlencode
+import hashlib
+import io
+import itertools
+import json
 import os
+import shutil
+import tempfile
 
 from finance.models import Transaction, Money, Category
 from finance.repository import JSONTransactionRepository
@@ -20,10 +28,17 @@ from finance.auth_models import User
 from finance.auth_repository import JSONUserRepository
 from finance.auth_service import AuthService
 from finance.report_service import ReportService
+from finance.forecast_service import ForecastService
+from finance.export_service import ExportService, FORMATS as EXPORT_FORMATS
+from finance.import_service import ImportService
 from finance.investment_models import Investment
 from finance.investment_repository import JSONInvestmentRepository
 from finance.investment_service import InvestmentService
-from finance.simulation_service import SimulationService
+from finance.accrual_service import AccrualService, start_scheduler
+from finance.returns_service import ReturnsService
+from finance.simulation_service import FAST, PrecisionPolicy, SimulationService
+from finance.monte_carlo import ReturnModel, load_returns
+from finance.simulation_cache import SimulationCache
 from finance.price_service import PriceService
 
 
@@ -53,14 +68,71 @@ def create_app():
     auth_service = AuthService(user_repository)
     
     report_service = ReportService(transaction_repository)
+    forecast_service = ForecastService(report_service)
+    export_service = ExportService(transaction_repository)
+    import_service = ImportService(transaction_repository)
     
     investments_path = os.getenv('INVESTMENTS_DB_PATH', os.path.expanduser('~/.finance_app/investments.json'))
     investment_storage = JSONStorage(investments_path)
     investment_repository = JSONInvestmentRepository(investment_storage)
     investment_service = InvestmentService(investment_repository)
+    returns_service = ReturnsService(investment_repository)
+    
+    # Rendimento automático dos investimentos a cada ACCRUAL_INTERVAL segundos (0 = desligado;
+    # também disponível como `python -m finance.cli accrue`)
+    accrual_interval = float(os.getenv('ACCRUAL_INTERVAL', '0'))
+    if accrual_interval > 0:
+        start_scheduler(AccrualService(investment_repository), accrual_interval)
+    
+    # Séries históricas de rendimento (CSV) para o bootstrap do Monte Carlo
+    returns_dir = os.getenv('RETURNS_DIR', os.path.expanduser('~/.finance_app/returns'))
+    monte_carlo_workers = int(os.getenv('MONTE_CARLO_WORKERS', '1'))
+    
+    # Resultados de simulação por parâmetros normalizados (SIMULATION_CACHE_DIR ativa o disco)
+    # Modo rápido por padrão; volta ao exato quando o limite teórico de deriva
+    # do prazo passa de SIMULATION_MAX_DRIFT_CENTS (ver finance.precision_check)
+    simulation_precision = PrecisionPolicy(
+        os.getenv('SIMULATION_PRECISION', 'fast'),
+        max_drift_cents=int(os.getenv('SIMULATION_MAX_DRIFT_CENTS', '100'))
+    )
+    
+    simulation_cache = SimulationCache(
+        max_entries=int(os.getenv('SIMULATION_CACHE_SIZE', '512')),
+        ttl=float(os.getenv('SIMULATION_CACHE_TTL', '3600')),
+        directory=os.getenv('SIMULATION_CACHE_DIR') or None
+    )
     
     # ==================== FUNÇÕES AUXILIARES ====================
     
+    def money_param(value):
+        """Valor monetário normalizado ("1000", 1000 e "1000.00" viram "1000.00")."""
+        return str(Money(value).amount)
+    
+    def simulation_output(data):
+        """Formato pedido para a projeção: ("rows" | "columns", um mês a cada ``every``)."""
+        output_format = data.get('format', 'rows')
+        if output_format not in ('rows', 'columns'):
+            raise ValueError('format deve ser "rows" ou "columns"')
+        every = int(data.get('every', 1))
+        if every < 1:
+            raise ValueError('every deve ser positivo')
+        return output_format, every
+    
+    def simulation_mode(data, monthly_rate, months):
+        """Modo pedido no corpo ("exact", "fast" ou "summary") ou o da política da API."""
+        return data.get('mode') or simulation_precision.resolve(monthly_rate, months)
+    
+    def precision_for(data, default=None):
+        """Política pedida no corpo ("mode": "exact" ou "fast") ou a padrão."""
+        if data.get('mode'):
+            return PrecisionPolicy(data['mode'])
+        return default or simulation_precision
+    
+    def serialize_simulation(result, output_format, every):
+        if output_format == 'columns':
+            return result.to_columns(every)
+        return result.to_dict(every)
+    
     def parse_date(date_str, end_of_day=False):
         """Parsear string de data no formato YYYY-MM-DD."""
         if not date_str:
@@ -95,6 +167,40 @@ def create_app():
         
         return filtered
     
+    def conditional_get(view):
+        """
+        GET condicional com ETag fraco derivado da versão dos dados do usuário.
+        
+        A ETag combina rota, parâmetros da query, usuário e versão das
+        transações. Se o cliente envia ``If-None-Match`` com a ETag atual, a
+        resposta é ``304`` sem carregar nem serializar nada. Deve ficar abaixo
+        de ``@jwt_required()``.
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()
+            version = transaction_repository.version(user_id)
+            if version is None:
+                return view(*args, **kwargs)
+            
+            query = urlencode(sorted(request.args.items(multi=True)))
+            key = f"{request.path}?{query}|{user_id}|{version}"
+            etag = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+            
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag, weak=True)
+            # O navegador guarda a resposta, mas sempre revalida com a ETag
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Authorization')
+            return response
+        return wrapper
+    
     # ==================== ENDPOINTS DE AUTENTICAÇÃO ====================
     
     @app.route('/api/auth/register', methods=['POST'])
@@ -206,8 +312,17 @@ def create_app():
         """Verificar saúde da API."""
         return jsonify({'status': 'ok', 'message': 'API v2 com autenticação está funcionando'}), 200
     
+    @app.route('/api/metrics', methods=['GET'])
+    @jwt_required()
+    def metrics():
+        """Contadores internos (acertos do cache de simulações)."""
+        return jsonify({
+            'simulation_cache': simulation_cache.stats()
+        }), 200
+    
     @app.route('/api/transactions', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def list_transactions():
         """Listar transações do usuário autenticado."""
         try:
@@ -230,6 +345,78 @@ def create_app():
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/api/transactions/export', methods=['GET'])
+    @jwt_required()
+    def export_transactions():
+        """Exportar transações em CSV ou NDJSON, enviadas em partes."""
+        user_id = get_jwt_identity()
+        export_format = request.args.get('format', 'csv')
+        
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': 'format deve ser "csv" ou "ndjson"'
+            }), 400
+        
+        records = export_service.records(
+            user_id,
+            start=parse_date(request.args.get('start_date')),
+            end=parse_date(request.args.get('end_date'), end_of_day=True),
+            type=request.args.get('type'),
+            category=request.args.get('category')
+        )
+        
+        # Sem Content-Length: o servidor envia o corpo com chunked transfer encoding
+        body = stream_with_context(export_service.stream(export_format, records))
+        return Response(body, mimetype=EXPORT_FORMATS[export_format], headers={
+            'Content-Disposition': f'attachment; filename=transacoes.{export_format}'
+        })
+    
+    @app.route('/api/transactions/import', methods=['POST'])
+    @jwt_required()
+    def import_transactions():
+        """Importar extrato CSV ou OFX, com progresso em NDJSON a cada lote."""
+        user_id = get_jwt_identity()
+        upload = request.files.get('file')
+        
+        if upload is None:
+            return jsonify({'success': False, 'error': 'Envie o extrato no campo "file"'}), 400
+        
+        import_format = request.form.get('format')
+        if not import_format:
+            import_format = 'ofx' if (upload.filename or '').lower().endswith('.ofx') else 'csv'
+        
+        try:
+            mapping = json.loads(request.form['mapping']) if request.form.get('mapping') else None
+            batch_size = int(request.form.get('batch_size', import_service.batch_size))
+            if batch_size < 1:
+                raise ValueError('batch_size deve ser positivo')
+            # O Flask fecha os arquivos enviados ao fim da view, antes do corpo
+            # ser transmitido: o importador lê de uma cópia própria (em disco se grande)
+            spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+            shutil.copyfileobj(upload.stream, spool)
+            spool.seek(0)
+            stream = io.TextIOWrapper(spool, encoding='utf-8-sig', newline='')
+            # Lê o cabeçalho já aqui para que colunas ausentes virem 400
+            rows = import_service.read(stream, import_format, mapping)
+            first = next(rows, None)
+        except (ValueError, TypeError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        importer = ImportService(transaction_repository, batch_size=batch_size,
+                                 max_errors=import_service.max_errors)
+        
+        def progress_lines():
+            source = rows if first is None else itertools.chain([first], rows)
+            try:
+                for result in importer.run(user_id, source):
+                    yield json.dumps(result.to_dict()) + '\n'
+                yield json.dumps({'done': True, **result.to_dict()}) + '\n'
+            finally:
+                stream.close()
+        
+        return Response(stream_with_context(progress_lines()), mimetype='application/x-ndjson')
+    
     @app.route('/api/transactions', methods=['POST'])
     @jwt_required()
     def create_transaction():
@@ -341,11 +528,11 @@ def create_app():
     
     @app.route('/api/balance', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def get_balance():
         """Obter o saldo total do usuário."""
         try:
             user_id = get_jwt_identity()
-            transactions = finance_service.list_transactions(user_id=user_id)
             
             # Aplicar filtro de data se fornecido
             start_date_str = request.args.get('start_date')
@@ -354,12 +541,12 @@ def create_app():
             start_dt = parse_date(start_date_str)
             end_dt = parse_date(end_date_str, end_of_day=True)
             
-            transactions = filter_transactions_by_date(transactions, start_dt, end_dt)
-            
-            # Calcular saldo
-            balance = Money(0)
-            for tx in transactions:
-                balance = balance + tx.signed_amount
+            if start_dt or end_dt:
+                # Intervalo de datas: índice de somas prefixadas por dia
+                balance = finance_service.range_totals(user_id, start_dt, end_dt)['balance']
+            else:
+                # Saldo total: contadores mantidos a cada escrita
+                balance = finance_service.balance(user_id)
             
             return jsonify({
                 'success': True,
@@ -373,6 +560,7 @@ def create_app():
     
     @app.route('/api/report', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def get_report():
         """Gerar relatório agrupado por categoria ou mês."""
         try:
@@ -385,8 +573,6 @@ def create_app():
                     'error': 'group_by deve ser "category" ou "month"'
                 }), 400
             
-            transactions = finance_service.list_transactions(user_id=user_id)
-            
             # Aplicar filtro de data se fornecido
             start_date_str = request.args.get('start_date')
             end_date_str = request.args.get('end_date')
@@ -394,22 +580,8 @@ def create_app():
             start_dt = parse_date(start_date_str)
             end_dt = parse_date(end_date_str, end_of_day=True)
             
-            transactions = filter_transactions_by_date(transactions, start_dt, end_dt)
-            
-            # Gerar relatório
-            from collections import defaultdict
-            groups = defaultdict(lambda: Money(0))
-            
-            for tx in transactions:
-                if group_by == 'category':
-                    key = tx.category.name
-                else:  # month
-                    tx_date_aware = tx.occurred_at
-                    if tx_date_aware.tzinfo is None or tx_date_aware.tzinfo.utcoffset(tx_date_aware) is None:
-                        tx_date_aware = tx_date_aware.replace(tzinfo=timezone.utc)
-                    key = tx_date_aware.strftime("%Y-%m")
-                
-                groups[key] = groups[key] + tx.signed_amount
+            # Por mês: índice diário; por categoria: batch colunar
+            groups = finance_service.report(group_by=group_by, user_id=user_id, start=start_dt, end=end_dt)
             
             report_data = {key: str(value.amount) for key, value in groups.items()}
             
@@ -423,12 +595,12 @@ def create_app():
     
     @app.route('/api/categories', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def get_categories():
         """Obter lista de categorias únicas do usuário."""
         try:
             user_id = get_jwt_identity()
-            transactions = finance_service.list_transactions(user_id=user_id)
-            categories = sorted(set(tx.category.name for tx in transactions))
+            categories = sorted(finance_service.batch(user_id).categories)
             return jsonify({
                 'success': True,
                 'data': categories
@@ -440,6 +612,7 @@ def create_app():
     
     @app.route('/api/reports/monthly-by-category', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def monthly_by_category_report():
         """Relatório mensal detalhado por categoria."""
         try:
@@ -468,6 +641,7 @@ def create_app():
     
     @app.route('/api/reports/category-by-month', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def category_by_month_report():
         """Relatório de uma categoria ao longo dos meses."""
         try:
@@ -495,8 +669,96 @@ def create_app():
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/api/reports/pivot', methods=['GET'])
+    @jwt_required()
+    @conditional_get
+    def pivot_report():
+        """Matriz meses × categorias (centavos) para heatmaps e linhas de tendência."""
+        try:
+            user_id = get_jwt_identity()
+            
+            year = request.args.get('year', type=int)
+            top = request.args.get('top', type=int)
+            tx_type = request.args.get('type')
+            
+            if tx_type not in (None, 'income', 'expense'):
+                return jsonify({
+                    'success': False,
+                    'error': 'type deve ser "income" ou "expense"'
+                }), 400
+            if top is not None and top < 1:
+                return jsonify({'success': False, 'error': 'top deve ser positivo'}), 400
+            
+            pivot = report_service.pivot(user_id, year, tx_type, top)
+            
+            return jsonify({
+                'success': True,
+                'data': pivot,
+                'unit': 'cents'
+            }), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
+    @app.route('/api/reports/spending-stats', methods=['GET'])
+    @jwt_required()
+    @conditional_get
+    def spending_stats_report():
+        """Estatísticas das despesas por categoria (média, desvio, extremos e percentis)."""
+        try:
+            user_id = get_jwt_identity()
+            
+            stats = report_service.spending_stats(
+                user_id,
+                start=parse_date(request.args.get('start_date')),
+                end=parse_date(request.args.get('end_date'), end_of_day=True)
+            )
+            
+            # Centavos para string decimal, como no restante da API
+            result = {
+                category: {
+                    key: value if key == 'count' else str(Decimal(value).scaleb(-2))
+                    for key, value in values.items()
+                }
+                for category, values in stats.items()
+            }
+            
+            return jsonify({
+                'success': True,
+                'data': result
+            }), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
+    @app.route('/api/reports/forecast', methods=['GET'])
+    @jwt_required()
+    def forecast_report():
+        """Projeção de receitas, despesas e saldo por categoria nos próximos meses."""
+        # Sem ETag: a projeção também muda com a virada do mês, não só com os dados
+        try:
+            user_id = get_jwt_identity()
+            
+            forecast = forecast_service.forecast(
+                user_id,
+                months=request.args.get('months', 6, type=int),
+                method=request.args.get('method', 'ses'),
+                window=request.args.get('window', 3, type=int),
+                alpha=request.args.get('alpha', 0.5, type=float),
+                history=request.args.get('history', 12, type=int)
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+        
+        return jsonify({
+            'success': True,
+            'data': forecast,
+            'unit': 'cents'
+        }), 200
+    
     @app.route('/api/reports/available-months', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def available_months():
         """Lista de meses disponíveis (com transações)."""
         try:
@@ -512,6 +774,7 @@ def create_app():
     
     @app.route('/api/reports/summary-by-month', methods=['GET'])
     @jwt_required()
+    @conditional_get
     def summary_by_month():
         """Resumo financeiro por mês (receitas, despesas, saldo)."""
         try:
@@ -529,6 +792,33 @@ def create_app():
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/api/reports/balance-series', methods=['GET'])
+    @jwt_required()
+    @conditional_get
+    def balance_series():
+        """Série do saldo acumulado por dia, semana ou mês, em arrays paralelos."""
+        try:
+            user_id = get_jwt_identity()
+            granularity = request.args.get('granularity', 'day')
+            
+            series = finance_service.balance_series(
+                user_id,
+                granularity,
+                start=parse_date(request.args.get('start_date')),
+                end=parse_date(request.args.get('end_date'), end_of_day=True)
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+        
+        # Valores como strings decimais, como no restante da API
+        data = {'granularity': granularity, 'periods': series['periods']}
+        for key in ('income', 'expense', 'balance'):
+            data[key] = [str(Decimal(cents).scaleb(-2)) for cents in series[key]]
+        
+        return jsonify({'success': True, 'data': data}), 200
+    
     # ==================== ENDPOINTS DE INVESTIMENTOS ====================
     
     @app.route('/api/investments', methods=['GET'])
@@ -701,6 +991,58 @@ def create_app():
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/api/investments/<investment_id>/cash-flows', methods=['POST'])
+    @jwt_required()
+    def add_investment_cash_flow(investment_id):
+        """Registrar um aporte (amount positivo) ou resgate (negativo)."""
+        try:
+            user_id = get_jwt_identity()
+            investment = investment_service.get_investment(investment_id)
+            
+            if not investment:
+                return jsonify({
+                    'success': False,
+                    'error': 'Investimento não encontrado'
+                }), 404
+            
+            # Verificar se pertence ao usuário
+            if investment.user_id != user_id:
+                return jsonify({
+                    'success': False,
+                    'error': 'Acesso negado'
+                }), 403
+            
+            data = request.get_json()
+            if not data or 'amount' not in data:
+                return jsonify({
+                    'success': False,
+                    'error': 'Campo obrigatório: amount'
+                }), 400
+            
+            date = None
+            if data.get('date'):
+                try:
+                    date = datetime.fromisoformat(data['date'])
+                except ValueError:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Data inválida. Use formato ISO 8601'
+                    }), 400
+                if date.tzinfo is None:
+                    date = date.replace(tzinfo=timezone.utc)
+            
+            updated = investment_service.add_cash_flow(investment_id, data['amount'], date)
+            
+            return jsonify({
+                'success': True,
+                'data': updated.to_dict()
+            }), 201
+        
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
     @app.route('/api/investments/summary', methods=['GET'])
     @jwt_required()
     def investments_summary():
@@ -718,6 +1060,8 @@ def create_app():
                     'total_invested': str(total_invested.amount),
                     'total_current_value': str(total_current.amount),
                     'total_profit': str(total_profit.amount),
+                    # XIRR e TWR da carteira e de cada investimento (em cache até a próxima gravação)
+                    'returns': returns_service.returns(user_id),
                     'currency': 'BRL'
                 }
             }), 200
@@ -740,16 +1084,24 @@ def create_app():
                     'error': f'Campos obrigatórios: {", ".join(required_fields)}'
                 }), 400
             
-            result = SimulationService.simulate_fixed_contribution(
-                initial_amount=data['initial_amount'],
-                monthly_contribution=data['monthly_contribution'],
-                monthly_rate=float(data['monthly_rate']),
-                months=int(data['months'])
+            params = {
+                'initial_amount': money_param(data['initial_amount']),
+                'monthly_contribution': money_param(data['monthly_contribution']),
+                'monthly_rate': float(data['monthly_rate']),
+                'months': int(data['months']),
+                'mode': simulation_mode(data, float(data['monthly_rate']), int(data['months']))
+            }
+            output_format, every = simulation_output(data)
+            result = simulation_cache.get_or_compute(
+                'fixed-contribution', {**params, 'format': output_format, 'every': every},
+                lambda: serialize_simulation(
+                    SimulationService.simulate_fixed_contribution(**params), output_format, every
+                )
             )
             
             return jsonify({
                 'success': True,
-                'data': result.to_dict()
+                'data': result
             }), 200
         
         except ValueError as e:
@@ -757,6 +1109,60 @@ def create_app():
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/api/simulations/fixed-contribution/stream', methods=['POST'])
+    @jwt_required()
+    def stream_fixed_contribution():
+        """Projeção com aporte fixo em NDJSON, um mês por linha, à medida que é calculada."""
+        try:
+            data = request.get_json()
+            
+            required_fields = ['initial_amount', 'monthly_contribution', 'monthly_rate', 'months']
+            if not data or not all(field in data for field in required_fields):
+                return jsonify({
+                    'success': False,
+                    'error': f'Campos obrigatórios: {", ".join(required_fields)}'
+                }), 400
+            
+            initial = Money(data['initial_amount'])
+            contribution = Money(data['monthly_contribution'])
+            monthly_rate = float(data['monthly_rate'])
+            months = int(data['months'])
+            # Valida já aqui: depois que o corpo começa a ser enviado não há como responder 400
+            rows = SimulationService.iter_fixed_contribution(
+                initial_amount=initial.amount,
+                monthly_contribution=contribution.amount,
+                monthly_rate=monthly_rate,
+                months=months,
+                mode=simulation_mode(data, monthly_rate, months),
+                every=int(data.get('every', 1))
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        def lines():
+            yield json.dumps({
+                'initial_amount': initial.cents,
+                'monthly_rate': monthly_rate,
+                'total_months': months,
+                'unit': 'cents'
+            }) + '\n'
+            balance, profit = initial.cents, 0
+            for month, month_contribution, balance, profit in rows:
+                yield json.dumps({
+                    'month': month,
+                    'contribution': month_contribution,
+                    'accumulated_balance': balance,
+                    'profit': profit
+                }) + '\n'
+            yield json.dumps({
+                'done': True,
+                'total_contributed': balance - profit,
+                'final_balance': balance,
+                'total_profit': profit
+            }) + '\n'
+        
+        return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+    
     @app.route('/api/simulations/variable-contribution', methods=['POST'])
     @jwt_required()
     def simulate_variable_contribution():
@@ -777,15 +1183,21 @@ def create_app():
                     'error': 'monthly_contributions deve ser uma lista'
                 }), 400
             
-            result = SimulationService.simulate_variable_contribution(
-                initial_amount=data['initial_amount'],
-                monthly_contributions=data['monthly_contributions'],
-                monthly_rate=float(data['monthly_rate'])
-            )
+            params = {
+                'initial_amount': money_param(data['initial_amount']),
+                'monthly_contributions': [money_param(value) for value in data['monthly_contributions']],
+                'monthly_rate': float(data['monthly_rate'])
+            }
+            output_format, every = simulation_output(data)
+            precision = precision_for(data)
+            key = {**params, 'format': output_format, 'every': every, 'precision': precision.to_key()}
+            result = simulation_cache.get_or_compute('variable-contribution', key, lambda: serialize_simulation(
+                SimulationService.simulate_variable_contribution(**params, precision=precision), output_format, every
+            ))
             
             return jsonify({
                 'success': True,
-                'data': result.to_dict()
+                'data': result
             }), 200
         
         except ValueError as e:
@@ -813,18 +1225,22 @@ def create_app():
                     'error': 'monthly_contributions deve ser uma lista'
                 }), 400
             
-            scenarios = SimulationService.compare_scenarios(
-                initial_amount=data['initial_amount'],
-                monthly_contributions=data['monthly_contributions'],
-                monthly_rate=float(data['monthly_rate']),
-                months=int(data['months'])
-            )
+            params = {
+                'initial_amount': money_param(data['initial_amount']),
+                'monthly_contributions': [money_param(value) for value in data['monthly_contributions']],
+                'monthly_rate': float(data['monthly_rate']),
+                'months': int(data['months']),
+                'mode': simulation_mode(data, float(data['monthly_rate']), int(data['months']))
+            }
+            
+            output_format, every = simulation_output(data)
             
             # Converter resultados para dict
-            result = {
-                scenario: simulation.to_dict()
-                for scenario, simulation in scenarios.items()
-            }
+            key = {**params, 'format': output_format, 'every': every}
+            result = simulation_cache.get_or_compute('compare-scenarios', key, lambda: {
+                scenario: serialize_simulation(simulation, output_format, every)
+                for scenario, simulation in SimulationService.compare_scenarios(**params).items()
+            })
             
             return jsonify({
                 'success': True,
@@ -836,6 +1252,209 @@ def create_app():
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/api/simulations/goal-seek', methods=['POST'])
+    @jwt_required()
+    def goal_seek():
+        """Encontrar o aporte, a taxa ou o prazo necessário para atingir uma meta."""
+        try:
+            data = request.get_json()
+            
+            required_fields = ['target', 'solve_for']
+            if not data or not all(field in data for field in required_fields):
+                return jsonify({
+                    'success': False,
+                    'error': f'Campos obrigatórios: {", ".join(required_fields)}'
+                }), 400
+            
+            contribution = data.get('monthly_contribution')
+            rate = data.get('monthly_rate')
+            months = data.get('months')
+            params = {
+                'target': money_param(data['target']),
+                'solve_for': data['solve_for'],
+                'initial_amount': money_param(data.get('initial_amount', 0)),
+                'monthly_contribution': money_param(contribution) if contribution is not None else None,
+                'monthly_rate': float(rate) if rate is not None else None,
+                'months': int(months) if months is not None else None
+            }
+            result = simulation_cache.get_or_compute(
+                'goal-seek', params, lambda: SimulationService.goal_seek(**params)
+            )
+            
+            return jsonify({
+                'success': True,
+                'data': result
+            }), 200
+        
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
+    @app.route('/api/simulations/grid', methods=['POST'])
+    @jwt_required()
+    def simulate_grid():
+        """Simular aporte fixo para todas as combinações de parâmetros."""
+        try:
+            data = request.get_json()
+            
+            required_fields = ['initial_amounts', 'monthly_contributions', 'monthly_rates', 'months']
+            if not data or not all(field in data for field in required_fields):
+                return jsonify({
+                    'success': False,
+                    'error': f'Campos obrigatórios: {", ".join(required_fields)}'
+                }), 400
+            
+            axes = [data[field] for field in required_fields]
+            if not all(isinstance(axis, list) for axis in axes):
+                return jsonify({
+                    'success': False,
+                    'error': 'Cada eixo da grade deve ser uma lista'
+                }), 400
+            
+            params = {
+                'initial_amounts': [money_param(value) for value in data['initial_amounts']],
+                'monthly_contributions': [money_param(value) for value in data['monthly_contributions']],
+                'monthly_rates': [float(rate) for rate in data['monthly_rates']],
+                'months': [int(n) for n in data['months']],
+                'curves': [[int(index) for index in cell] for cell in data.get('curves') or []]
+            }
+            # A grade é vetorizada: rápida por padrão, salvo "mode": "exact" no corpo
+            precision = precision_for(data, FAST)
+            grid = simulation_cache.get_or_compute(
+                'grid', {**params, 'precision': precision.to_key()},
+                lambda: SimulationService.simulate_grid(**params, precision=precision)
+            )
+            
+            return jsonify({
+                'success': True,
+                'data': grid,
+                'unit': 'cents'
+            }), 200
+        
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
+    @app.route('/api/simulations/monte-carlo', methods=['POST'])
+    @jwt_required()
+    def simulate_monte_carlo():
+        """Simular aporte fixo com rendimentos mensais aleatórios."""
+        try:
+            data = request.get_json()
+            
+            required_fields = ['initial_amount', 'monthly_contribution', 'months', 'distribution']
+            if not data or not all(field in data for field in required_fields):
+                return jsonify({
+                    'success': False,
+                    'error': f'Campos obrigatórios: {", ".join(required_fields)}'
+                }), 400
+            
+            distribution = data['distribution']
+            if not isinstance(distribution, dict):
+                return jsonify({
+                    'success': False,
+                    'error': 'distribution deve ser um objeto'
+                }), 400
+            
+            kind = distribution.get('type', 'normal')
+            returns = distribution.get('returns') or []
+            if kind == 'bootstrap' and distribution.get('file'):
+                # Só arquivos do diretório de séries; o nome não pode apontar para fora dele
+                name = os.path.basename(distribution['file'])
+                path = os.path.join(returns_dir, name)
+                if not name or not os.path.isfile(path):
+                    return jsonify({
+                        'success': False,
+                        'error': f'Série de rendimentos não encontrada: {name}'
+                    }), 400
+                returns = load_returns(path)
+            
+            model = ReturnModel(
+                kind=kind,
+                mean=float(distribution.get('mean', 0)),
+                stddev=float(distribution.get('stddev', 0)),
+                returns=[float(r) for r in returns]
+            )
+            seed = data.get('seed')
+            target = data.get('target')
+            params = {
+                'initial_amount': money_param(data['initial_amount']),
+                'monthly_contribution': money_param(data['monthly_contribution']),
+                'months': int(data['months']),
+                'paths': int(data.get('paths', 10_000)),
+                'seed': int(seed) if seed is not None else None,
+                'target': money_param(target) if target is not None else None
+            }
+            
+            def simulate():
+                return SimulationService.simulate_monte_carlo(model=model, workers=monte_carlo_workers, **params)
+            
+            # Sem semente o resultado é aleatório: só entra no cache quando é reprodutível
+            if params['seed'] is None:
+                result = simulate()
+            else:
+                key = {**params, 'distribution': [model.kind, model.mean, model.stddev, model.returns]}
+                result = simulation_cache.get_or_compute('monte-carlo', key, simulate)
+            
+            return jsonify({
+                'success': True,
+                'data': result,
+                'unit': 'cents'
+            }), 200
+        
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
+    @app.route('/api/simulations/portfolio', methods=['POST'])
+    @jwt_required()
+    def simulate_portfolio():
+        """Projetar todos os investimentos do usuário numa única requisição."""
+        try:
+            user_id = get_jwt_identity()
+            data = request.get_json() or {}
+            
+            contributions = data.get('contributions') or {}
+            if not isinstance(contributions, dict):
+                return jsonify({
+                    'success': False,
+                    'error': 'contributions deve ser um objeto {id: aporte}'
+                }), 400
+            
+            # Uma leitura de investments.json para a carteira inteira
+            investments = investment_service.list_user_investments(user_id)
+            months = int(data.get('months', 12))
+            every = int(data.get('every', 1))
+            precision = precision_for(data)
+            contributions = {id: money_param(value) for id, value in contributions.items()}
+            
+            # A chave inclui o estado atual das posições: editar um investimento invalida o resultado
+            key = {
+                'positions': [[inv.id, inv.name, money_param(inv.current_amount.amount), inv.monthly_rate]
+                              for inv in investments],
+                'contributions': contributions,
+                'months': months,
+                'every': every,
+                'precision': precision.to_key()
+            }
+            result = simulation_cache.get_or_compute('portfolio', key, lambda: SimulationService.simulate_portfolio(
+                investments, months=months, contributions=contributions, every=every, precision=precision
+            ))
+            
+            return jsonify({
+                'success': True,
+                'data': result,
+                'unit': 'cents'
+            }), 200
+        
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
     @app.route('/api/simulations/from-investment/<investment_id>', methods=['POST'])
     @jwt_required()
     def simulate_from_investment(investment_id):
@@ -864,16 +1483,24 @@ def create_app():
             months = data.get('months', 12)
             
             # Usar dados do investimento
-            result = SimulationService.simulate_fixed_contribution(
-                initial_amount=str(investment.current_amount.amount),
-                monthly_contribution=monthly_contribution,
-                monthly_rate=investment.monthly_rate,
-                months=int(months)
+            params = {
+                'initial_amount': money_param(investment.current_amount.amount),
+                'monthly_contribution': money_param(monthly_contribution),
+                'monthly_rate': float(investment.monthly_rate),
+                'months': int(months),
+                'mode': simulation_mode(data, float(investment.monthly_rate), int(months))
+            }
+            output_format, every = simulation_output(data)
+            result = simulation_cache.get_or_compute(
+                'fixed-contribution', {**params, 'format': output_format, 'every': every},
+                lambda: serialize_simulation(
+                    SimulationService.simulate_fixed_contribution(**params), output_format, every
+                )
             )
             
             return jsonify({
                 'success': True,
-                'data': result.to_dict(),
+                'data': result,
                 'investment': investment.to_dict()
             }), 200
         
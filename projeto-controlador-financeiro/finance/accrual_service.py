@@ -0,0 +1,174 @@
+"""
+Rendimento periódico dos investimentos (atualização de ``current_amount``).
+
+``AccrualService.accrue_all`` carrega os investimentos de todos os usuários
+de uma vez, monta arrays paralelos de saldo (centavos), taxa mensal e dias
+decorridos desde ``last_accrued_at`` e aplica ``saldo × (1 + taxa)^(dias /
+DAYS_PER_MONTH)`` a todos juntos (NumPy quando disponível, listas caso
+contrário). Os investimentos alterados são gravados numa única escrita do
+repositório.
+
+Só dias inteiros são incorporados e ``last_accrued_at`` avança exatamente
+esses dias, então rodar o job várias vezes no mesmo dia não aplica o
+rendimento em dobro. A gravação relê o arquivo e só altera ``current_amount``
+e ``last_accrued_at`` dos investimentos que não mudaram desde a leitura:
+edições feitas nesse intervalo são preservadas e o investimento fica para a
+próxima execução. O armazenamento JSON não tem trava entre processos, então
+deve haver um único agendador por arquivo.
+
+Registros antigos, sem ``last_accrued_at``: se o valor atual ainda é o inicial,
+o rendimento conta desde ``start_date``; se já foi editado à mão, a primeira
+execução só registra o instante atual como ponto de partida.
+"""
+
+from __future__ import annotations
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence
+from .batch import np
+from .investment_models import Investment
+from .investment_repository import IInvestmentRepository
+from .models import Money
+
+DAYS_PER_MONTH = 365.25 / 12
+_ONE_DAY = timedelta(days=1)
+
+logger = logging.getLogger(__name__)
+
+
+def accrue_cents(
+    cents: Sequence[int],
+    monthly_rates: Sequence[float],
+    days: Sequence[int],
+    use_numpy: bool | None = None,
+) -> List[int]:
+    """
+    Aplica juros compostos a vários saldos de uma vez.
+
+    Args:
+        cents: Saldos em centavos
+        monthly_rates: Taxa mensal (decimal) de cada saldo
+        days: Dias decorridos de cada saldo
+        use_numpy: Força (ou desliga) o caminho NumPy; padrão: usar se instalado
+
+    Returns:
+        Novos saldos em centavos, arredondados (meio centavo para cima)
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is not None:
+        # Perda máxima de 100% ao mês: o saldo não fica negativo
+        growth = np.maximum(1.0 + np.asarray(monthly_rates, dtype=np.float64), 0.0)
+        factor = growth ** (np.asarray(days, dtype=np.float64) / DAYS_PER_MONTH)
+        return np.floor(np.asarray(cents, dtype=np.float64) * factor + 0.5).astype(np.int64).tolist()
+    return [
+        math.floor(c * max(1.0 + r, 0.0) ** (d / DAYS_PER_MONTH) + 0.5)
+        for c, r, d in zip(cents, monthly_rates, days)
+    ]
+
+
+@dataclass(slots=True)
+class AccrualResult:
+    """Resumo de uma execução: investimentos lidos, atualizados e rendimento total (centavos)."""
+    run_at: datetime
+    checked: int
+    accrued: int
+    baselined: int
+    interest_cents: int
+
+    def to_dict(self) -> dict:
+        return {
+            "run_at": self.run_at.isoformat(),
+            "checked": self.checked,
+            "accrued": self.accrued,
+            "baselined": self.baselined,
+            "interest": Money.from_cents(self.interest_cents).to_dict(),
+        }
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+class AccrualService:
+    """Atualiza o valor atual de todos os investimentos pelo rendimento mensal."""
+
+    def __init__(self, repo: IInvestmentRepository, use_numpy: bool | None = None):
+        self.repo = repo
+        self.use_numpy = use_numpy
+
+    def accrue_all(self, now: datetime | None = None) -> AccrualResult:
+        """
+        Incorpora o rendimento desde a última execução a todos os investimentos.
+
+        Args:
+            now: Instante de referência (padrão: agora, em UTC)
+
+        Returns:
+            AccrualResult com as contagens e o rendimento total aplicado
+        """
+        now = _utc(now or datetime.now(timezone.utc))
+        investments = self.repo.list()
+
+        due: List[tuple[Investment, datetime, int]] = []
+        baseline: List[tuple[Investment, Money, datetime]] = []
+        for inv in investments:
+            if inv.last_accrued_at is not None:
+                since = _utc(inv.last_accrued_at)
+            elif inv.current_amount == inv.initial_amount:
+                since = _utc(inv.start_date)
+            else:
+                baseline.append((inv, inv.current_amount, now))
+                continue
+            days = (now - since) // _ONE_DAY
+            if days >= 1:
+                due.append((inv, since, days))
+
+        balances = accrue_cents(
+            [inv.current_amount.cents for inv, _, _ in due],
+            [inv.monthly_rate for inv, _, _ in due],
+            [days for _, _, days in due],
+            self.use_numpy,
+        )
+        changed = [
+            (inv, Money.from_cents(cents), since + days * _ONE_DAY)
+            for (inv, since, days), cents in zip(due, balances)
+        ]
+        applied = self.repo.apply_accruals(changed + baseline) if changed or baseline else set()
+
+        return AccrualResult(
+            run_at=now,
+            checked=len(investments),
+            accrued=sum(inv.id in applied for inv, _, _ in changed),
+            baselined=sum(inv.id in applied for inv, _, _ in baseline),
+            interest_cents=sum(
+                amount.cents - inv.current_amount.cents for inv, amount, _ in changed if inv.id in applied
+            ),
+        )
+
+
+def start_scheduler(service: AccrualService, interval: float) -> threading.Event:
+    """
+    Roda ``accrue_all`` agora e a cada ``interval`` segundos numa thread daemon.
+
+    Returns:
+        Evento que, quando sinalizado, encerra a thread
+    """
+    stop = threading.Event()
+
+    def run() -> None:
+        while True:
+            try:
+                result = service.accrue_all()
+                if result.accrued or result.baselined:
+                    logger.info("Rendimento aplicado: %s", result.to_dict())
+            except Exception:
+                logger.exception("Falha ao aplicar rendimento dos investimentos")
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=run, name="investment-accrual", daemon=True).start()
+    return stop
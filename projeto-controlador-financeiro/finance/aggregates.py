@@ -0,0 +1,334 @@
+"""
+Agregados derivados mantidos junto com as transações.
+
+Cada agregado ocupa uma seção própria do documento de transações e é
+atualizado de forma incremental (delta) a cada escrita do repositório, na
+mesma gravação das transações. Todos podem ser reconstruídos a partir das
+transações brutas, o que serve tanto para migrar arquivos antigos quanto
+para a verificação de consistência.
+"""
+
+from __future__ import annotations
+import math
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+from .batch import to_cents
+from .stats import QuantileSketch, RunningStats
+
+
+class Aggregate(ABC):
+    """Interface de um agregado incremental sobre os dicts de transação."""
+
+    section: str
+
+    @abstractmethod
+    def apply(self, state: dict, record: dict, direction: int) -> None:
+        """Aplica uma transação ao estado (+1 ao incluir, -1 ao remover)."""
+
+    def settle(self, state: dict, records: Iterable[dict], removed: Iterable[dict]) -> None:
+        """
+        Conclui uma escrita que removeu ``removed``, depois de todos os
+        ``apply`` e com ``records`` já atualizadas; para o que não se desfaz
+        por delta (padrão: nada a fazer).
+        """
+
+    def rebuild(self, records: Iterable[dict]) -> dict:
+        """Reconstrói o estado do zero a partir das transações brutas."""
+        state: dict = {}
+        for record in records:
+            self.apply(state, record, 1)
+        return state
+
+    def verify(self, state: dict, records: Iterable[dict]) -> list[str]:
+        """Lista os usuários cujo estado diverge da reconstrução."""
+        expected = self.rebuild(records)
+        users = set(state) | set(expected)
+        return sorted(u for u in users if state.get(u) != expected.get(u))
+
+
+class BalanceCounters(Aggregate):
+    """
+    Contadores por usuário: receitas, despesas (centavos) e quantidade.
+
+    Formato da seção::
+
+        {"<user_id>": {"income": 500000, "expense": 120050, "count": 42}}
+    """
+
+    section = "balances"
+
+    def apply(self, state: dict, record: dict, direction: int) -> None:
+        user_id = record.get("user_id", "default")
+        counters = state.setdefault(user_id, {"income": 0, "expense": 0, "count": 0})
+        counters[record["type"]] += direction * to_cents(record["amount"]["amount"])
+        counters["count"] += direction
+        if counters["count"] == 0:
+            del state[user_id]
+
+    @staticmethod
+    def totals(state: dict, user_id: str | None = None) -> dict[str, int]:
+        """Totais em centavos de um usuário (ou de todos, se ``user_id`` for None)."""
+        if user_id is not None:
+            rows = [state.get(user_id, {})]
+        else:
+            rows = list(state.values())
+        income = sum(r.get("income", 0) for r in rows)
+        expense = sum(r.get("expense", 0) for r in rows)
+        return {
+            "income": income,
+            "expense": expense,
+            "balance": income - expense,
+            "count": sum(r.get("count", 0) for r in rows),
+        }
+
+
+def _utc(occurred_at: str) -> datetime:
+    dt = datetime.fromisoformat(occurred_at)
+    if dt.tzinfo is not None and dt.tzinfo.utcoffset(dt) is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt
+
+
+def month_key(occurred_at: str) -> str:
+    """Mês "YYYY-MM" (calendário UTC) de uma data serializada em ISO 8601."""
+    dt = _utc(occurred_at)
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+
+def day_key(occurred_at: str) -> str:
+    """Dia "YYYY-MM-DD" (calendário UTC) de uma data serializada em ISO 8601."""
+    return _utc(occurred_at).date().isoformat()
+
+
+class MonthlyRollup(Aggregate):
+    """
+    Totais e contagens por usuário, mês, categoria e tipo.
+
+    Formato da seção::
+
+        {"<user_id>": {"2025-01": {"Mercado": {"expense": [45010, 3]}}}}
+
+    Cada célula guarda ``[total em centavos, quantidade]``. Relatórios mensais
+    passam a custar O(meses × categorias), independente do número de transações.
+    """
+
+    section = "rollups"
+
+    def apply(self, state: dict, record: dict, direction: int) -> None:
+        user_id = record.get("user_id", "default")
+        month = month_key(record["occurred_at"])
+        category = record["category"]["name"]
+        type_ = record["type"]
+
+        months = state.setdefault(user_id, {})
+        categories = months.setdefault(month, {})
+        types = categories.setdefault(category, {})
+        cell = types.setdefault(type_, [0, 0])
+        cell[0] += direction * to_cents(record["amount"]["amount"])
+        cell[1] += direction
+
+        # Remove células vazias para o estado continuar igual ao da reconstrução
+        if cell[1] == 0:
+            del types[type_]
+            if not types:
+                del categories[category]
+            if not categories:
+                del months[month]
+            if not months:
+                del state[user_id]
+
+    @staticmethod
+    def cells(user_state: dict) -> Iterator[tuple[str, str, str, int, int]]:
+        """Percorre as células como ``(mês, categoria, tipo, centavos, quantidade)``."""
+        for month, categories in user_state.items():
+            for category, types in categories.items():
+                for type_, (cents, count) in types.items():
+                    yield month, category, type_, cents, count
+
+
+class DailyBuckets(Aggregate):
+    """
+    Receitas, despesas (centavos) e quantidade por usuário e dia UTC.
+
+    Formato da seção::
+
+        {"<user_id>": {"2025-01-05": [300000, 4510, 2]}}
+
+    É a base do ``RangeIndex`` (``finance.range_index``), que responde totais
+    de intervalos de datas em O(log dias).
+    """
+
+    section = "daily"
+
+    def apply(self, state: dict, record: dict, direction: int) -> None:
+        user_id = record.get("user_id", "default")
+        day = day_key(record["occurred_at"])
+
+        days = state.setdefault(user_id, {})
+        bucket = days.setdefault(day, [0, 0, 0])
+        bucket[0 if record["type"] == "income" else 1] += direction * to_cents(record["amount"]["amount"])
+        bucket[2] += direction
+
+        if bucket[2] == 0:
+            del days[day]
+            if not days:
+                del state[user_id]
+
+
+class SpendingStats(Aggregate):
+    """
+    Estatísticas das despesas por usuário, mês e categoria.
+
+    Formato da seção::
+
+        {"<user_id>": {"2025-01": {"Mercado": {"w": [3, 15003.3, 1.2e7, 4510, 30000],
+                                               "q": {"421": 1, "518": 2}}}}}
+
+    ``w`` é o estado de ``RunningStats`` (quantidade, média, M2, mínimo e
+    máximo) e ``q`` os baldes do ``QuantileSketch``, ambos em centavos. Como
+    os dois se mesclam, estatísticas de vários meses saem da soma das células
+    mensais. Mínimo e máximo não se desfazem por delta: ao remover um valor
+    igual a um extremo, a célula é marcada e ``settle`` recalcula os extremos
+    dela a partir das transações daquele usuário, mês e categoria.
+    """
+
+    section = "spending"
+
+    def apply(self, state: dict, record: dict, direction: int) -> None:
+        if record["type"] != "expense":
+            return
+        user_id = record.get("user_id", "default")
+        month = month_key(record["occurred_at"])
+        category = record["category"]["name"]
+        cents = to_cents(record["amount"]["amount"])
+
+        months = state.setdefault(user_id, {})
+        categories = months.setdefault(month, {})
+        cell = categories.setdefault(category, {"w": RunningStats().to_state(), "q": {}})
+        stats = RunningStats.from_state(cell["w"])
+        sketch = QuantileSketch(cell["q"])
+
+        if direction > 0:
+            stats.add(cents)
+            sketch.add(cents)
+        else:
+            stats.remove(cents)
+            sketch.remove(cents)
+            if stats.count and (stats.min is None or stats.max is None):
+                cell["stale"] = True
+
+        if stats.count:
+            cell["w"] = stats.to_state()
+            return
+        del categories[category]
+        if not categories:
+            del months[month]
+        if not months:
+            del state[user_id]
+
+    def settle(self, state: dict, records: Iterable[dict], removed: Iterable[dict]) -> None:
+        stale = set()
+        for record in removed:
+            if record["type"] != "expense":
+                continue
+            key = (record.get("user_id", "default"), month_key(record["occurred_at"]), record["category"]["name"])
+            cell = state.get(key[0], {}).get(key[1], {}).get(key[2])
+            if cell is not None and cell.pop("stale", False):
+                stale.add(key)
+        if not stale:
+            return
+        # Só quando um extremo saiu: uma passada pelas despesas das células marcadas
+        extremes: dict[tuple[str, str, str], tuple[int, int]] = {}
+        for record in records:
+            if record["type"] != "expense":
+                continue
+            key = (record.get("user_id", "default"), month_key(record["occurred_at"]), record["category"]["name"])
+            if key not in stale:
+                continue
+            cents = to_cents(record["amount"]["amount"])
+            low, high = extremes.get(key, (cents, cents))
+            extremes[key] = (min(low, cents), max(high, cents))
+        for (user_id, month, category), (low, high) in extremes.items():
+            cell = state[user_id][month][category]
+            cell["w"] = [*cell["w"][:3], low, high]
+
+    def verify(self, state: dict, records: Iterable[dict]) -> list[str]:
+        # Média e M2 são float (a ordem das operações muda os últimos dígitos): compara com tolerância
+        expected = self.rebuild(records)
+        wrong = []
+        for user_id in set(state) | set(expected):
+            stored, rebuilt = state.get(user_id, {}), expected.get(user_id, {})
+            if not _same_spending(stored, rebuilt):
+                wrong.append(user_id)
+        return sorted(wrong)
+
+    @staticmethod
+    def cells(user_state: dict) -> Iterator[tuple[str, str, RunningStats, QuantileSketch]]:
+        """Percorre as células como ``(mês, categoria, estatísticas, sketch)``."""
+        for month, categories in user_state.items():
+            for category, cell in categories.items():
+                yield month, category, RunningStats.from_state(cell["w"]), QuantileSketch(dict(cell["q"]))
+
+
+def _same_spending(stored: dict, rebuilt: dict) -> bool:
+    if stored.keys() != rebuilt.keys():
+        return False
+    for month, categories in rebuilt.items():
+        if stored[month].keys() != categories.keys():
+            return False
+        for category, cell in categories.items():
+            other = stored[month][category]
+            if other["q"] != cell["q"]:
+                return False
+            (count, mean, m2, low, high), (count2, mean2, m22, low2, high2) = cell["w"], other["w"]
+            if count != count2 or not math.isclose(mean, mean2, rel_tol=1e-9, abs_tol=1e-6):
+                return False
+            if not math.isclose(m2, m22, rel_tol=1e-6, abs_tol=1e-3):
+                return False
+            if (low, high) != (low2, high2):
+                return False
+    return True
+
+
+class DataVersions(Aggregate):
+    """
+    Versão dos dados de cada usuário, incrementada a cada transação gravada.
+
+    Formato da seção::
+
+        {"epoch": "9f1c...", "users": {"<user_id>": 17}}
+
+    A época é sorteada sempre que a seção é (re)construída, então um par
+    ``(época, versão)`` nunca se repete para conteúdos diferentes. Serve de
+    base para ETags e chaves de cache.
+    """
+
+    section = "versions"
+
+    def apply(self, state: dict, record: dict, direction: int) -> None:
+        state.setdefault("epoch", uuid.uuid4().hex)
+        users = state.setdefault("users", {})
+        user_id = record.get("user_id", "default")
+        users[user_id] = users.get(user_id, 0) + 1
+
+    def rebuild(self, records: Iterable[dict]) -> dict:
+        state = super().rebuild(records)
+        state["epoch"] = uuid.uuid4().hex
+        state.setdefault("users", {})
+        return state
+
+    def verify(self, state: dict, records: Iterable[dict]) -> list[str]:
+        # Versões registram o histórico de escritas, não algo derivável das transações
+        return []
+
+    @staticmethod
+    def version(state: dict, user_id: str) -> str:
+        """Versão opaca ``"<época>.<contador>"`` dos dados do usuário."""
+        return f"{state.get('epoch', '')}.{state.get('users', {}).get(user_id, 0)}"
+
+
+def default_aggregates() -> list[Aggregate]:
+    """Agregados mantidos por padrão pelo repositório JSON."""
+    return [BalanceCounters(), MonthlyRollup(), DailyBuckets(), SpendingStats(), DataVersions()]
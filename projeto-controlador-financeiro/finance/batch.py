@@ -0,0 +1,380 @@
+"""
+Estrutura colunar para agregações vetorizadas de transações.
+
+Um ``TransactionBatch`` guarda as transações de um usuário como arrays
+paralelos (centavos, sinal, instante, código de categoria e código de tipo).
+As agregações dos relatórios rodam sobre esses arrays inteiros em vez de
+percorrer listas de ``Transaction`` com objetos ``Money`` por linha.
+
+Usa NumPy quando estiver instalado e ``array`` da biblioteca padrão caso
+contrário; os resultados são idênticos nos dois modos.
+"""
+
+from __future__ import annotations
+from array import array
+from datetime import date, datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from itertools import accumulate, compress
+from typing import Iterable, Sequence
+from .models import Transaction
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+
+TYPE_NAMES = ("income", "expense")
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+GROUP_KEYS = ("category", "type", "month", "day")
+
+DAY_US = 86_400 * 1_000_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_ONE_US = datetime.resolution
+
+
+@lru_cache(maxsize=4096)
+def to_cents(amount: str) -> int:
+    """Converte o valor serializado ("123.45") para centavos inteiros."""
+    value = Decimal(amount) * 100
+    return int(value.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def to_epoch(dt: datetime) -> int:
+    """Converte datetime para microssegundos UTC desde 1970 (naive = UTC)."""
+    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_US
+
+
+def from_epoch(epoch: int) -> datetime:
+    """Converte microssegundos UTC desde 1970 de volta para datetime."""
+    return _EPOCH + epoch * _ONE_US
+
+
+def month_label(code: int) -> str:
+    """Rótulo "YYYY-MM" de um código de mês (meses desde 1970-01)."""
+    return f"{1970 + code // 12:04d}-{code % 12 + 1:02d}"
+
+
+def day_label(code: int) -> str:
+    """Rótulo "YYYY-MM-DD" de um código de dia (dias desde 1970-01-01)."""
+    return date.fromordinal(_EPOCH_ORDINAL + code).isoformat()
+
+
+def month_code(year: int, month: int) -> int:
+    return (year - 1970) * 12 + (month - 1)
+
+
+class TransactionBatch:
+    """
+    Transações em arrays paralelos.
+
+    Colunas:
+        cents: valor absoluto em centavos (int64)
+        sign: +1 para receita, -1 para despesa (int8)
+        epoch: instante em microssegundos UTC desde 1970 (int64)
+        category: código da categoria, índice em ``categories`` (int32)
+        type: código do tipo, índice em ``TYPE_NAMES`` (int8)
+
+    O batch é imutável: ``filter`` e ``select`` devolvem novos batches que
+    compartilham a tabela de categorias.
+    """
+
+    __slots__ = ("cents", "sign", "epoch", "category", "type", "categories", "_numpy", "_months")
+
+    def __init__(
+        self,
+        cents: Sequence[int],
+        sign: Sequence[int],
+        epoch: Sequence[int],
+        category: Sequence[int],
+        type: Sequence[int],
+        categories: Sequence[str],
+        *,
+        use_numpy: bool | None = None,
+    ):
+        self._numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        if self._numpy:
+            self.cents = np.asarray(cents, dtype=np.int64)
+            self.sign = np.asarray(sign, dtype=np.int8)
+            self.epoch = np.asarray(epoch, dtype=np.int64)
+            self.category = np.asarray(category, dtype=np.int32)
+            self.type = np.asarray(type, dtype=np.int8)
+        else:
+            self.cents = array("q", cents)
+            self.sign = array("b", sign)
+            self.epoch = array("q", epoch)
+            self.category = array("i", category)
+            self.type = array("b", type)
+        self.categories = list(categories)
+        self._months = None
+
+    # ------------------------------------------------------------------ #
+    # Construção
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def empty(cls, *, use_numpy: bool | None = None) -> "TransactionBatch":
+        return cls([], [], [], [], [], [], use_numpy=use_numpy)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], *, use_numpy: bool | None = None) -> "TransactionBatch":
+        """Monta o batch direto dos dicts persistidos, sem hidratar ``Transaction``."""
+        cents: list[int] = []
+        sign: list[int] = []
+        epoch: list[int] = []
+        category: list[int] = []
+        type_: list[int] = []
+        codes: dict[str, int] = {}
+
+        for d in records:
+            type_code = TYPE_CODES[d["type"]]
+            name = d["category"]["name"]
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = len(codes)
+
+            cents.append(to_cents(d["amount"]["amount"]))
+            sign.append(1 if type_code == 0 else -1)
+            epoch.append(to_epoch(datetime.fromisoformat(d["occurred_at"])))
+            category.append(code)
+            type_.append(type_code)
+
+        return cls(cents, sign, epoch, category, type_, list(codes), use_numpy=use_numpy)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction], *, use_numpy: bool | None = None) -> "TransactionBatch":
+        """Monta o batch a partir de objetos ``Transaction`` já hidratados."""
+        cents: list[int] = []
+        sign: list[int] = []
+        epoch: list[int] = []
+        category: list[int] = []
+        type_: list[int] = []
+        codes: dict[str, int] = {}
+
+        for tx in transactions:
+            type_code = TYPE_CODES[tx.type]
+            code = codes.get(tx.category.name)
+            if code is None:
+                code = codes[tx.category.name] = len(codes)
+
+            cents.append(tx.amount.cents)
+            sign.append(1 if type_code == 0 else -1)
+            epoch.append(to_epoch(tx.occurred_at))
+            category.append(code)
+            type_.append(type_code)
+
+        return cls(cents, sign, epoch, category, type_, list(codes), use_numpy=use_numpy)
+
+    # ------------------------------------------------------------------ #
+    # Propriedades básicas
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    @property
+    def uses_numpy(self) -> bool:
+        return self._numpy
+
+    def _columns(self) -> tuple:
+        return (self.cents, self.sign, self.epoch, self.category, self.type)
+
+    def _derive(self, columns) -> "TransactionBatch":
+        return TransactionBatch(*columns, self.categories, use_numpy=self._numpy)
+
+    def signed_cents(self):
+        """Valores com sinal (receita positiva, despesa negativa)."""
+        if self._numpy:
+            return self.cents * self.sign
+        return array("q", [c * s for c, s in zip(self.cents, self.sign)])
+
+    def _values(self, signed: bool):
+        return self.signed_cents() if signed else self.cents
+
+    def month_codes(self):
+        """Código do mês (UTC) de cada linha: meses desde 1970-01."""
+        if self._months is None:
+            if self._numpy:
+                self._months = (
+                    self.epoch.astype("datetime64[us]").astype("datetime64[M]").astype(np.int64)
+                )
+            else:
+                by_day: dict[int, int] = {}
+                months = array("i")
+                for e in self.epoch:
+                    day = e // DAY_US
+                    code = by_day.get(day)
+                    if code is None:
+                        d = date.fromordinal(_EPOCH_ORDINAL + day)
+                        code = by_day[day] = month_code(d.year, d.month)
+                    months.append(code)
+                self._months = months
+        return self._months
+
+    def day_codes(self):
+        """Código do dia (UTC) de cada linha: dias desde 1970-01-01."""
+        if self._numpy:
+            return self.epoch // DAY_US
+        return array("q", [e // DAY_US for e in self.epoch])
+
+    def _key(self, key: str):
+        if key == "category":
+            categories = self.categories
+            return self.category, categories.__getitem__
+        if key == "type":
+            return self.type, TYPE_NAMES.__getitem__
+        if key == "month":
+            return self.month_codes(), month_label
+        if key == "day":
+            return self.day_codes(), day_label
+        raise ValueError(f"Agrupamento inválido: {key!r} (use {', '.join(GROUP_KEYS)})")
+
+    # ------------------------------------------------------------------ #
+    # Operações vetorizadas
+    # ------------------------------------------------------------------ #
+
+    def sum(self, signed: bool = True) -> int:
+        """Soma em centavos (com sinal por padrão)."""
+        values = self._values(signed)
+        if self._numpy:
+            return int(values.sum())
+        return sum(values)
+
+    def cumsum(self, signed: bool = True):
+        """Soma acumulada em centavos, na ordem atual das linhas."""
+        values = self._values(signed)
+        if self._numpy:
+            return np.cumsum(values)
+        return array("q", accumulate(values))
+
+    def group_by(self, *keys: str, signed: bool = True) -> dict:
+        """
+        Soma em centavos agrupada por uma ou mais chaves.
+
+        Args:
+            keys: "category", "type", "month" e/ou "day"
+            signed: usar valores com sinal (padrão) ou absolutos
+
+        Returns:
+            Dicionário ordenado pelos rótulos. Com uma chave, os rótulos são
+            strings; com várias, tuplas de strings.
+        """
+        return self._aggregate(keys, self._values(signed))
+
+    def count_by(self, *keys: str) -> dict:
+        """Quantidade de linhas agrupada por uma ou mais chaves."""
+        ones = np.ones(len(self), dtype=np.int64) if self._numpy else array("q", [1]) * len(self)
+        return self._aggregate(keys, ones)
+
+    def _aggregate(self, keys: Sequence[str], values) -> dict:
+        if not keys:
+            raise ValueError("Informe ao menos uma chave de agrupamento")
+        resolved = [self._key(k) for k in keys]
+        labelers = [labeler for _, labeler in resolved]
+
+        if self._numpy:
+            if not len(self):
+                return {}
+            stacked = np.stack([codes.astype(np.int64) for codes, _ in resolved], axis=1)
+            unique, inverse = np.unique(stacked, axis=0, return_inverse=True)
+            totals = np.zeros(len(unique), dtype=np.int64)
+            np.add.at(totals, inverse.ravel(), values)
+            rows = zip(unique.tolist(), totals.tolist())
+        else:
+            acc: dict[tuple, int] = {}
+            for combo, value in zip(zip(*(codes for codes, _ in resolved)), values):
+                acc[combo] = acc.get(combo, 0) + value
+            rows = acc.items()
+
+        if len(labelers) == 1:
+            labeler = labelers[0]
+            labeled = {labeler(combo[0]): total for combo, total in rows}
+        else:
+            labeled = {
+                tuple(labeler(code) for labeler, code in zip(labelers, combo)): total
+                for combo, total in rows
+            }
+        return dict(sorted(labeled.items()))
+
+    def filter(self, mask) -> "TransactionBatch":
+        """Novo batch só com as linhas em que ``mask`` é verdadeira."""
+        if self._numpy:
+            m = np.asarray(mask, dtype=bool)
+            return self._derive(col[m] for col in self._columns())
+        m = list(mask)
+        return self._derive(array(col.typecode, compress(col, m)) for col in self._columns())
+
+    def mask(
+        self,
+        *,
+        type: str | None = None,
+        category: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        year: int | None = None,
+        month: int | None = None,
+    ):
+        """
+        Máscara booleana combinando os critérios informados (todos opcionais).
+
+        ``start``/``end`` são inclusivos; ``year``/``month`` usam o calendário UTC.
+        """
+        if self._numpy:
+            m = np.ones(len(self), dtype=bool)
+            if type is not None:
+                m &= self.type == TYPE_CODES[type]
+            if category is not None:
+                code = self.categories.index(category) if category in self.categories else -1
+                m &= self.category == code
+            if start is not None:
+                m &= self.epoch >= to_epoch(start)
+            if end is not None:
+                m &= self.epoch <= to_epoch(end)
+            if year is not None or month is not None:
+                months = self.month_codes()
+                if year is not None:
+                    m &= (months // 12) == year - 1970
+                if month is not None:
+                    m &= (months % 12) == month - 1
+            return m
+
+        checks = []
+        if type is not None:
+            type_code = TYPE_CODES[type]
+            checks.append((self.type, lambda v: v == type_code))
+        if category is not None:
+            code = self.categories.index(category) if category in self.categories else -1
+            checks.append((self.category, lambda v: v == code))
+        if start is not None:
+            lo = to_epoch(start)
+            checks.append((self.epoch, lambda v: v >= lo))
+        if end is not None:
+            hi = to_epoch(end)
+            checks.append((self.epoch, lambda v: v <= hi))
+        if year is not None:
+            checks.append((self.month_codes(), lambda v: v // 12 == year - 1970))
+        if month is not None:
+            checks.append((self.month_codes(), lambda v: v % 12 == month - 1))
+
+        m = [True] * len(self)
+        for column, check in checks:
+            m = [ok and check(v) for ok, v in zip(m, column)]
+        return m
+
+    def select(self, **criteria) -> "TransactionBatch":
+        """Atalho para ``filter(mask(**criteria))``."""
+        if not any(v is not None for v in criteria.values()):
+            return self
+        return self.filter(self.mask(**criteria))
+
+    def sorted_by_time(self) -> "TransactionBatch":
+        """Novo batch ordenado por instante (ordenação estável)."""
+        if self._numpy:
+            order = np.argsort(self.epoch, kind="stable")
+            return self._derive(col[order] for col in self._columns())
+        order = sorted(range(len(self)), key=self.epoch.__getitem__)
+        return self._derive(array(col.typecode, [col[i] for i in order]) for col in self._columns())
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import argparse
+import os
 from typing import Optional
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 
 from .repository import JSONTransactionRepository
 from .services import FinanceService
+from .import_service import ImportService, ImportResult
 from .models import Transaction, Money
+from .storage import JSONStorage
+from .investment_repository import JSONInvestmentRepository
+from .accrual_service import AccrualService
+from . import precision_check
 
 
 def fmt_money(d) -> str:
@@ -194,6 +200,31 @@ def interactive_loop() -> None:
             print("⚠️  Opção inválida. Tente novamente.\n")
 
 
+def verify_simulations(samples: int, horizons: list[int], kind: str, seed: int) -> None:
+    """Imprime a deriva medida por prazo e o benchmark; sai com código 1 se algum limite for violado."""
+    failures = []
+    for k in precision_check.KINDS if kind == "all" else (kind,):
+        reports = precision_check.measure_drift(samples=samples, horizons=horizons, kind=k, seed=seed)
+        print(f"Aporte {'fixo' if k == 'fixed' else 'variável'} ({samples} cenários):")
+        print("  Meses | Deriva máx. | Deriva média |     Limite")
+        for r in reports:
+            print(f"  {r.months:5d} | {r.max_drift_cents:11d} | {r.mean_drift_cents:12.2f} | {r.bound_cents:10.2f}")
+        failures += precision_check.check_drift(reports)
+
+    timings = precision_check.benchmark()
+    print(
+        f"Tempo por simulação de 360 meses: exato {timings['exact']:.3f} ms | "
+        f"rápido {timings['fast']:.3f} ms | resumo {timings['summary']:.3f} ms "
+        f"({timings['speedup']:.1f}x)"
+    )
+
+    for failure in failures:
+        print(f"- {failure}")
+    if failures:
+        raise SystemExit(1)
+    print("Deriva dentro dos limites.")
+
+
 def main(argv: Optional[list[str]] = None) -> None:
     parser = argparse.ArgumentParser(prog="finance-cli", description="Controle financeiro - OOP/CLI")
     sub = parser.add_subparsers(dest="cmd")
@@ -214,12 +245,48 @@ def main(argv: Optional[list[str]] = None) -> None:
     p_remove = sub.add_parser("remove", help="Remover transação (por ID)")
     p_remove.add_argument("--id", required=True)
 
+    p_check = sub.add_parser("check", help="Verificar contadores de saldo contra o histórico")
+    p_check.add_argument("--repair", action="store_true", help="Reconstruir contadores divergentes")
+
+    p_import = sub.add_parser("import", help="Importar extrato CSV ou OFX")
+    p_import.add_argument("file")
+    p_import.add_argument("--user", default="default", help="Dono das transações importadas")
+    p_import.add_argument("--format", choices=["csv", "ofx"], help="Padrão: extensão do arquivo")
+    p_import.add_argument("--batch-size", type=int, default=25_000)
+
+    p_accrue = sub.add_parser("accrue", help="Aplicar o rendimento mensal a todos os investimentos")
+    p_accrue.add_argument(
+        "--file",
+        default=os.getenv("INVESTMENTS_DB_PATH", os.path.expanduser("~/.finance_app/investments.json")),
+        help="Arquivo de investimentos (padrão: o mesmo da API)",
+    )
+
+    p_verify = sub.add_parser("verify-simulations", help="Medir a deriva do modo rápido das simulações")
+    p_verify.add_argument("--samples", type=int, default=200)
+    p_verify.add_argument("--horizons", type=int, nargs="+", default=list(precision_check.DEFAULT_HORIZONS))
+    p_verify.add_argument("--kind", choices=["fixed", "variable", "all"], default="all")
+    p_verify.add_argument("--seed", type=int, default=0)
+
     args = parser.parse_args(argv)
     if args.cmd is None:
         interactive_loop()
         return
 
-    svc = FinanceService(JSONTransactionRepository())
+    if args.cmd == "accrue":
+        result = AccrualService(JSONInvestmentRepository(JSONStorage(args.file))).accrue_all()
+        print(
+            f"Investimentos: {result.checked} | Atualizados: {result.accrued} | "
+            f"Sem data de referência (marcados agora): {result.baselined} | "
+            f"Rendimento: {fmt_money(Money.from_cents(result.interest_cents))}"
+        )
+        return
+
+    if args.cmd == "verify-simulations":
+        verify_simulations(args.samples, args.horizons, args.kind, args.seed)
+        return
+
+    repo = JSONTransactionRepository()
+    svc = FinanceService(repo)
 
     if args.cmd == "add":
         tx = svc.add_transaction(type=args.type, amount=args.amount, description=args.desc, category=args.category)
@@ -249,6 +316,27 @@ def main(argv: Optional[list[str]] = None) -> None:
         ok = svc.remove(args.id)
         print("Removido." if ok else "ID não encontrado.")
 
+    elif args.cmd == "check":
+        problems = repo.verify(repair=args.repair)
+        if not problems:
+            print("Contadores consistentes.")
+        for section, users in problems.items():
+            status = "reconstruída" if args.repair else "divergente"
+            print(f"Seção '{section}' {status} para: {', '.join(users)}")
+
+    elif args.cmd == "import":
+        fmt = args.format or ("ofx" if args.file.lower().endswith(".ofx") else "csv")
+        importer = ImportService(repo, batch_size=args.batch_size)
+
+        def progress(result: ImportResult) -> None:
+            print(f"... {result.processed} lidas, {result.imported} importadas, {result.duplicates} duplicadas")
+
+        with open(args.file, encoding="utf-8-sig", newline="") as f:
+            result = importer.import_file(args.user, f, fmt, on_progress=progress)
+        print(f"Importadas: {result.imported} | Duplicadas: {result.duplicates} | Com erro: {result.failed}")
+        for error in result.errors:
+            print(f"- {error}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,105 @@
+"""
+Exportação de transações em CSV ou NDJSON, linha a linha.
+
+As linhas saem de um gerador sobre os dicts brutos do repositório: nenhuma
+``Transaction`` é hidratada e o corpo da resposta nunca é montado inteiro em
+memória, o que permite enviá-lo em partes (chunked) pela API.
+"""
+
+from __future__ import annotations
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+from .repository import ITransactionRepository
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+CSV_COLUMNS = ["id", "occurred_at", "type", "category", "description", "amount"]
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class ExportService:
+    """Gera exportações de transações filtradas, em blocos de texto."""
+
+    def __init__(self, repo: ITransactionRepository, chunk_rows: int = 500):
+        self.repo = repo
+        self.chunk_rows = chunk_rows
+
+    def records(
+        self,
+        user_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        type: str | None = None,
+        category: str | None = None,
+    ) -> Iterator[dict]:
+        """Dicts brutos do usuário que passam pelos filtros, na ordem de gravação."""
+        start = _utc(start) if start else None
+        end = _utc(end) if end else None
+        for record in self.repo.iter_records(user_id):
+            if type and record["type"] != type:
+                continue
+            if category and record["category"]["name"] != category:
+                continue
+            if start or end:
+                occurred_at = _utc(datetime.fromisoformat(record["occurred_at"]))
+                if (start and occurred_at < start) or (end and occurred_at > end):
+                    continue
+            yield record
+
+    def stream(self, format: str, records: Iterable[dict]) -> Iterator[str]:
+        """
+        Serializa os registros no formato pedido.
+
+        Args:
+            format: "csv" ou "ndjson"
+            records: dicts de transação (ver ``records``)
+
+        Returns:
+            Gerador de blocos de texto com até ``chunk_rows`` linhas cada
+        """
+        if format not in FORMATS:
+            raise ValueError('Formato deve ser "csv" ou "ndjson"')
+        rows = self._csv_rows(records) if format == "csv" else self._ndjson_rows(records)
+
+        chunk: list[str] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                yield "".join(chunk)
+                chunk.clear()
+        if chunk:
+            yield "".join(chunk)
+
+    def _csv_rows(self, records: Iterable[dict]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def line(values: list) -> str:
+            writer.writerow(values)
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return text
+
+        yield line(CSV_COLUMNS)
+        for record in records:
+            yield line([
+                record["id"],
+                record["occurred_at"],
+                record["type"],
+                record["category"]["name"],
+                record["description"],
+                record["amount"]["amount"],
+            ])
+
+    @staticmethod
+    def _ndjson_rows(records: Iterable[dict]) -> Iterator[str]:
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False) + "\n"
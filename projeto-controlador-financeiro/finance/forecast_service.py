@@ -0,0 +1,179 @@
+"""
+Projeção de receitas, despesas e saldo para os próximos meses.
+
+Parte das séries mensais por categoria do ``ReportService`` (matriz densa
+meses × categorias, vinda da tabela mensal mantida pelo repositório) e aplica
+média móvel ou suavização exponencial simples a todas as séries de uma vez:
+com NumPy, cada passo é uma operação sobre a matriz inteira; sem NumPy, o
+mesmo cálculo roda em listas.
+
+Os resultados ficam em memória por usuário e só são recalculados quando a
+versão dos dados do usuário (``ITransactionRepository.version``) muda; cada
+chamada recebe a sua cópia.
+"""
+
+from __future__ import annotations
+import copy
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List
+from .batch import np
+from .report_service import ReportService, month_span
+
+METHODS = ("sma", "ses")
+
+
+def _shift_month(key: str, months: int) -> str:
+    index = int(key[:4]) * 12 + int(key[5:7]) - 1 + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class ForecastService:
+    """Projeções de fluxo de caixa por categoria, com cache por versão dos dados."""
+
+    def __init__(self, reports: ReportService, cache_size: int = 128, use_numpy: bool | None = None):
+        self.reports = reports
+        self.cache_size = cache_size
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        self._cache: OrderedDict[tuple, tuple[str, dict]] = OrderedDict()
+
+    def forecast(
+        self,
+        user_id: str,
+        months: int = 6,
+        method: str = "ses",
+        window: int = 3,
+        alpha: float = 0.5,
+        history: int = 12,
+        now: datetime | None = None,
+    ) -> dict:
+        """
+        Projeta os próximos ``months`` meses a partir do mês corrente.
+
+        O histórico usado são os ``history`` meses completos anteriores ao mês
+        corrente (o mês em andamento ficaria subestimado). Os dois métodos
+        produzem projeções constantes por categoria.
+
+        Args:
+            user_id: ID do usuário
+            months: Quantidade de meses projetados
+            method: "sma" (média dos últimos ``window`` meses) ou "ses"
+                (suavização exponencial simples com fator ``alpha``)
+            window: Janela da média móvel
+            alpha: Peso do mês mais recente na suavização (0 < alpha <= 1)
+            history: Meses de histórico considerados
+            now: Instante de referência (padrão: agora, em UTC)
+
+        Returns:
+            ``{"months", "categories", "income", "expense", "balance",
+            "cumulative", "by_category"}`` em centavos. ``by_category`` traz,
+            por categoria, as listas mensais projetadas de receitas e despesas;
+            ``cumulative`` é o saldo acumulado projetado partindo do saldo atual.
+        """
+        if method not in METHODS:
+            raise ValueError('method deve ser "sma" ou "ses"')
+        if months < 1 or window < 1 or history < 1 or not 0 < alpha <= 1:
+            raise ValueError("months, window e history devem ser positivos e alpha entre 0 e 1")
+
+        now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        current = f"{now.year:04d}-{now.month:02d}"
+        key = (user_id, months, method, window, alpha, history, current)
+        version = self.reports.repo.version(user_id)
+        if version is not None:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+
+        result = self._compute(user_id, months, method, window, alpha, history, current)
+
+        if version is not None:
+            self._cache[key] = (version, copy.deepcopy(result))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _compute(self, user_id, months, method, window, alpha, history, current) -> dict:
+        span = month_span(_shift_month(current, -history), _shift_month(current, -1))
+        names, rows = self._series(user_id, span)
+
+        if method == "sma":
+            levels = self._moving_average(rows, window)
+        else:
+            levels = self._smoothing(rows, alpha)
+
+        future = [_shift_month(current, i) for i in range(months)]
+        by_category: Dict[str, Dict[str, List[int]]] = {}
+        income = [0] * months
+        expense = [0] * months
+        for (name, type_), level in zip(names, levels):
+            value = max(0, round(level))
+            if not value:
+                continue
+            by_category.setdefault(name, {"income": [0] * months, "expense": [0] * months})[type_] = [value] * months
+            totals = income if type_ == "income" else expense
+            for i in range(months):
+                totals[i] += value
+
+        balance = [i - e for i, e in zip(income, expense)]
+        cumulative = []
+        running = self.reports.repo.totals(user_id)["balance"]
+        for net in balance:
+            running += net
+            cumulative.append(running)
+
+        return {
+            "months": future,
+            "categories": sorted(by_category),
+            "income": income,
+            "expense": expense,
+            "balance": balance,
+            "cumulative": cumulative,
+            "by_category": {name: by_category[name] for name in sorted(by_category)},
+        }
+
+    def _series(self, user_id: str, span: List[str]) -> tuple[list[tuple[str, str]], list[list[int]]]:
+        """Séries mensais (em centavos, sem sinal) de cada par ``(categoria, tipo)``, alinhadas a ``span``."""
+        names: list[tuple[str, str]] = []
+        rows: list[list[int]] = []
+        for type_ in ("income", "expense"):
+            pivot = self.reports.pivot(user_id, type=type_)
+            positions = {month: i for i, month in enumerate(pivot["months"])}
+            for j, name in enumerate(pivot["categories"]):
+                row = [
+                    abs(pivot["values"][positions[month]][j]) if month in positions else 0
+                    for month in span
+                ]
+                if any(row):
+                    names.append((name, type_))
+                    rows.append(row)
+
+        # Meses anteriores ao primeiro movimento do usuário puxariam as médias para zero
+        first = min((next(i for i, v in enumerate(row) if v) for row in rows), default=0)
+        return names, [row[first:] for row in rows]
+
+    def _moving_average(self, rows: list[list[int]], window: int) -> list[float]:
+        if not rows:
+            return []
+        if self.use_numpy:
+            return np.asarray(rows, dtype=np.float64)[:, -window:].mean(axis=1).tolist()
+        return [sum(row[-window:]) / len(row[-window:]) for row in rows]
+
+    def _smoothing(self, rows: list[list[int]], alpha: float) -> list[float]:
+        if not rows:
+            return []
+        if self.use_numpy:
+            # Uma iteração por mês; cada passo atualiza todas as séries juntas
+            values = np.asarray(rows, dtype=np.float64)
+            level = values[:, 0].copy()
+            for column in values[:, 1:].T:
+                level = alpha * column + (1 - alpha) * level
+            return level.tolist()
+        levels = []
+        for row in rows:
+            level = float(row[0])
+            for value in row[1:]:
+                level = alpha * value + (1 - alpha) * level
+            levels.append(level)
+        return levels
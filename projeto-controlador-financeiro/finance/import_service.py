@@ -0,0 +1,298 @@
+"""
+Importação de extratos bancários (CSV ou OFX) em lotes.
+
+O arquivo é lido de forma incremental: as linhas viram transações uma a uma,
+são comparadas com as já existentes (deduplicação por impressão digital) e
+gravadas no repositório em lotes de ``batch_size``, com uma única escrita do
+arquivo por lote. O progresso é informado ao fim de cada lote.
+"""
+
+from __future__ import annotations
+import csv
+import itertools
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Iterable, Iterator, TextIO
+from .batch import to_cents
+from .models import Category, Money, Transaction
+from .repository import ITransactionRepository
+
+DEFAULT_CATEGORY = "Importado"
+
+# Nomes de coluna reconhecidos automaticamente (minúsculos)
+COLUMN_ALIASES = {
+    "date": ("date", "data", "occurred_at", "data lançamento", "data lancamento"),
+    "amount": ("amount", "valor", "value", "valor (r$)"),
+    "description": ("description", "descrição", "descricao", "histórico", "historico", "memo", "lançamento", "lancamento"),
+    "category": ("category", "categoria"),
+    "type": ("type", "tipo"),
+}
+
+TYPE_ALIASES = {
+    "income": "income", "receita": "income", "credit": "income", "crédito": "income",
+    "credito": "income", "c": "income",
+    "expense": "expense", "despesa": "expense", "debit": "expense", "débito": "expense",
+    "debito": "expense", "d": "expense",
+}
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+@dataclass(slots=True)
+class ImportResult:
+    """Contadores de uma importação (atualizados a cada lote)."""
+    processed: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": list(self.errors),
+        }
+
+
+def parse_amount(value: str) -> Decimal:
+    """
+    Converte valores como "1.234,56", "-12.50", "(30,00)" ou "R$ 10" em Decimal.
+
+    Quando vírgula e ponto aparecem juntos, o último é o separador decimal.
+    """
+    text = str(value).strip().replace("R$", "").replace(" ", "")
+    negative = text.startswith("(") and text.endswith(")")
+    text = text.strip("()")
+    if "," in text and "." in text:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        text = text.replace(",", ".")
+    try:
+        amount = Decimal(text)
+    except InvalidOperation as e:
+        raise ValueError(f"Valor inválido: {value!r}") from e
+    return -amount if negative else amount
+
+
+def parse_date(value: str) -> datetime:
+    """Aceita ISO 8601, "dd/mm/aaaa" e o formato OFX "aaaammdd[hhmmss]"."""
+    text = str(value).strip()
+    try:
+        # Fatiar e converter com int() é bem mais barato que strptime por linha
+        if "/" in text:
+            day, month, year = text[:10].split("/")
+            dt = datetime(int(year), int(month), int(day))
+        elif text[:8].isdigit():
+            # OFX: aaaammdd seguido de hora e fuso opcionais; basta o dia
+            dt = datetime(int(text[:4]), int(text[4:6]), int(text[6:8]))
+        else:
+            dt = datetime.fromisoformat(text)
+    except ValueError as e:
+        raise ValueError(f"Data inválida: {value!r}") from e
+    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def fingerprint(occurred_at: datetime, signed_cents: int, description: str) -> tuple[str, int, str]:
+    """Impressão digital usada na deduplicação: dia UTC, valor com sinal e descrição normalizada."""
+    day = occurred_at.astimezone(timezone.utc).date().isoformat()
+    return day, signed_cents, " ".join(description.lower().split())
+
+
+def _record_fingerprint(record: dict) -> tuple[str, int, str]:
+    cents = to_cents(record["amount"]["amount"])
+    signed = cents if record["type"] == "income" else -cents
+    return fingerprint(parse_date(record["occurred_at"]), signed, record["description"])
+
+
+def read_csv(stream: TextIO, mapping: dict[str, str] | None = None) -> Iterator[dict]:
+    """
+    Lê um CSV linha a linha, devolvendo dicts com as chaves canônicas.
+
+    Args:
+        stream: arquivo texto aberto
+        mapping: ``{"date": "Coluna do arquivo", ...}`` para colunas fora do padrão
+
+    Returns:
+        Gerador de ``{"date", "amount", "description", "category", "type"}``
+        (as duas últimas podem faltar)
+    """
+    header = stream.readline()
+    if not header:
+        return
+    try:
+        dialect = csv.Sniffer().sniff(header, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(itertools.chain([header], stream), dialect)
+    columns = [c.strip().lstrip("\ufeff") for c in next(reader)]
+    lowered = [c.lower() for c in columns]
+
+    positions: dict[str, int] = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        wanted = (mapping or {}).get(key)
+        if wanted is not None:
+            if wanted not in columns:
+                raise ValueError(f"Coluna '{wanted}' não encontrada no arquivo")
+            positions[key] = columns.index(wanted)
+            continue
+        for alias in aliases:
+            if alias in lowered:
+                positions[key] = lowered.index(alias)
+                break
+    missing = [k for k in ("date", "amount", "description") if k not in positions]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        yield {key: row[pos] if pos < len(row) else "" for key, pos in positions.items()}
+
+
+def read_ofx(stream: TextIO) -> Iterator[dict]:
+    """Lê os blocos ``<STMTTRN>`` de um OFX (SGML ou XML) linha a linha."""
+    current: dict[str, str] | None = None
+    for line in stream:
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if not closing:
+                    current = {}
+                elif current is not None:
+                    yield {
+                        "date": current.get("DTPOSTED", ""),
+                        "amount": current.get("TRNAMT", ""),
+                        "description": current.get("MEMO") or current.get("NAME", ""),
+                    }
+                    current = None
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+class ImportService:
+    """Pipeline de importação de extratos sobre o ``ITransactionRepository``."""
+
+    def __init__(self, repo: ITransactionRepository, batch_size: int = 25_000, max_errors: int = 100):
+        self.repo = repo
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    def read(self, stream: TextIO, format: str = "csv", mapping: dict[str, str] | None = None) -> Iterator[dict]:
+        """Linhas canônicas do arquivo, conforme o formato ("csv" ou "ofx")."""
+        if format == "csv":
+            return read_csv(stream, mapping)
+        if format == "ofx":
+            return read_ofx(stream)
+        raise ValueError('Formato deve ser "csv" ou "ofx"')
+
+    def run(
+        self,
+        user_id: str,
+        rows: Iterable[dict],
+        default_category: str = DEFAULT_CATEGORY,
+    ) -> Iterator[ImportResult]:
+        """
+        Converte, deduplica e grava as linhas em lotes.
+
+        Uma linha é duplicada se a mesma impressão digital já existe para o
+        usuário; repetições legítimas dentro do arquivo são preservadas, pois
+        cada ocorrência existente só "absorve" uma linha importada.
+
+        Args:
+            user_id: dono das transações
+            rows: dicts canônicos (ver ``read_csv``/``read_ofx``)
+            default_category: categoria das linhas sem categoria
+
+        Returns:
+            Gerador que produz o mesmo ``ImportResult`` após cada lote gravado;
+            o último valor é o resultado final
+        """
+        existing = Counter(_record_fingerprint(r) for r in self.repo.iter_records(user_id))
+        categories: dict[str, Category] = {}
+        result = ImportResult()
+        batch: list[Transaction] = []
+
+        for line, row in enumerate(rows, start=1):
+            result.processed += 1
+            try:
+                tx = self._to_transaction(user_id, row, categories, default_category)
+            except (KeyError, ValueError) as e:
+                result.failed += 1
+                if len(result.errors) < self.max_errors:
+                    result.errors.append(f"linha {line}: {e}")
+                continue
+
+            key = fingerprint(tx.occurred_at, tx.signed_amount.cents, tx.description)
+            if existing[key] > 0:
+                existing[key] -= 1
+                result.duplicates += 1
+                continue
+
+            batch.append(tx)
+            if len(batch) >= self.batch_size:
+                self._commit(batch, result)
+                yield result
+
+        self._commit(batch, result)
+        yield result
+
+    def import_rows(
+        self,
+        user_id: str,
+        rows: Iterable[dict],
+        on_progress: Callable[[ImportResult], None] | None = None,
+        default_category: str = DEFAULT_CATEGORY,
+    ) -> ImportResult:
+        """Executa ``run`` até o fim, chamando ``on_progress`` após cada lote."""
+        result = ImportResult()
+        for result in self.run(user_id, rows, default_category):
+            if on_progress is not None:
+                on_progress(result)
+        return result
+
+    def import_file(
+        self,
+        user_id: str,
+        stream: TextIO,
+        format: str = "csv",
+        mapping: dict[str, str] | None = None,
+        on_progress: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """Atalho para ``import_rows(user_id, read(stream, format, mapping))``."""
+        return self.import_rows(user_id, self.read(stream, format, mapping), on_progress)
+
+    def _commit(self, batch: list[Transaction], result: ImportResult) -> None:
+        if batch:
+            self.repo.add_many(batch)
+            result.imported += len(batch)
+            batch.clear()
+
+    @staticmethod
+    def _to_transaction(user_id: str, row: dict, categories: dict[str, Category], default_category: str) -> Transaction:
+        amount = parse_amount(row["amount"])
+        type_ = TYPE_ALIASES.get(str(row.get("type") or "").strip().lower())
+        if type_ is None:
+            type_ = "expense" if amount < 0 else "income"
+        description = str(row.get("description") or "").strip() or "Sem descrição"
+
+        # Uma instância de Category por nome durante toda a importação
+        name = str(row.get("category") or "").strip() or default_category
+        category = categories.get(name)
+        if category is None:
+            category = categories[name] = Category(name)
+
+        return Transaction(
+            type=type_, amount=Money(abs(amount)), description=description,
+            category=category, user_id=user_id, occurred_at=parse_date(row["date"]),
+        )
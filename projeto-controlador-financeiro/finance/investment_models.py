@@ -5,7 +5,7 @@ Modelos para gerenciamento de investimentos.
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Literal
+from typing import List, Literal
 import uuid
 from .models import Money
 
@@ -13,6 +13,29 @@ from .models import Money
 InvestmentType = Literal["renda_fixa", "renda_variavel", "fundo", "criptomoeda", "outro"]
 
 
+@dataclass(slots=True)
+class CashFlow:
+    """Aporte (valor positivo) ou resgate (negativo) feito depois da abertura do investimento."""
+    date: datetime
+    amount: Money
+    balance_before: Money  # Valor atual do investimento imediatamente antes do movimento
+    
+    def to_dict(self) -> dict:
+        return {
+            "date": self.date.isoformat(),
+            "amount": self.amount.to_dict(),
+            "balance_before": self.balance_before.to_dict(),
+        }
+    
+    @staticmethod
+    def from_dict(d: dict) -> CashFlow:
+        return CashFlow(
+            date=datetime.fromisoformat(d["date"]),
+            amount=Money.from_dict(d["amount"]),
+            balance_before=Money.from_dict(d["balance_before"]),
+        )
+
+
 @dataclass(slots=True)
 class Investment:
     """Representa um investimento do usuário."""
@@ -25,6 +48,10 @@ class Investment:
     start_date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     id: str = field(default_factory=lambda: uuid.uuid4().hex)
     notes: str = ""
+    # Até quando o rendimento mensal já está incorporado a current_amount
+    last_accrued_at: datetime | None = None
+    # Aportes e resgates posteriores, em ordem cronológica
+    cash_flows: List[CashFlow] = field(default_factory=list)
     
     def __post_init__(self):
         if not self.name or not self.name.strip():
@@ -38,17 +65,26 @@ class Investment:
         if not self.user_id or not self.user_id.strip():
             raise ValueError("ID do usuário obrigatório")
     
+    @property
+    def invested(self) -> Money:
+        """Valor inicial mais aportes, menos resgates."""
+        total = self.initial_amount
+        for flow in self.cash_flows:
+            total = total + flow.amount
+        return total
+    
     @property
     def profit(self) -> Money:
         """Calcula o lucro/prejuízo do investimento."""
-        return self.current_amount - self.initial_amount
+        return self.current_amount - self.invested
     
     @property
     def profit_percentage(self) -> float:
-        """Calcula a porcentagem de lucro/prejuízo."""
-        if self.initial_amount.amount == 0:
+        """Calcula a porcentagem de lucro/prejuízo sobre o valor investido."""
+        invested = self.invested.amount
+        if invested <= 0:
             return 0.0
-        return float((self.profit.amount / self.initial_amount.amount) * 100)
+        return float((self.profit.amount / invested) * 100)
     
     def to_dict(self) -> dict:
         """Serializa investimento para dicionário."""
@@ -62,6 +98,9 @@ class Investment:
             "user_id": self.user_id,
             "start_date": self.start_date.isoformat(),
             "notes": self.notes,
+            "last_accrued_at": self.last_accrued_at.isoformat() if self.last_accrued_at else None,
+            "cash_flows": [flow.to_dict() for flow in self.cash_flows],
+            "invested": self.invested.to_dict(),
             "profit": self.profit.to_dict(),
             "profit_percentage": self.profit_percentage,
         }
@@ -79,5 +118,7 @@ class Investment:
             user_id=d["user_id"],
             start_date=datetime.fromisoformat(d["start_date"]),
             notes=d.get("notes", ""),
+            last_accrued_at=datetime.fromisoformat(d["last_accrued_at"]) if d.get("last_accrued_at") else None,
+            cash_flows=[CashFlow.from_dict(flow) for flow in d.get("cash_flows", [])],
         )
 
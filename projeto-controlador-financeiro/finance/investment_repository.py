@@ -4,8 +4,10 @@ Repositório para gerenciar investimentos.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Iterable, Optional, List, Set, Tuple
 from .investment_models import Investment
+from .models import Money
 from .storage import JSONStorage
 
 
@@ -37,10 +39,28 @@ class IInvestmentRepository(ABC):
         """Atualiza um investimento existente."""
         pass
     
+    @abstractmethod
+    def apply_accruals(self, accruals: Iterable[Tuple[Investment, Money, datetime]]) -> Set[str]:
+        """
+        Grava ``current_amount`` e ``last_accrued_at`` de vários investimentos numa única gravação.
+
+        Cada item é ``(lido, valor_atual, last_accrued_at)``; só é aplicado se o
+        registro gravado ainda tem o valor atual, a ``monthly_rate`` e o
+        ``last_accrued_at`` de ``lido``. Os demais campos não são tocados.
+
+        Returns:
+            IDs dos investimentos atualizados
+        """
+        pass
+    
     @abstractmethod
     def remove(self, investment_id: str) -> bool:
         """Remove um investimento pelo ID."""
         pass
+    
+    def version(self, user_id: str) -> str | None:
+        """Versão opaca dos investimentos do usuário, ou None se o repositório não versiona."""
+        return None
 
 
 class JSONInvestmentRepository(IInvestmentRepository):
@@ -83,6 +103,32 @@ class JSONInvestmentRepository(IInvestmentRepository):
                 return True
         return False
     
+    def apply_accruals(self, accruals: Iterable[Tuple[Investment, Money, datetime]]) -> Set[str]:
+        """Compara e grava sobre o arquivo relido agora, não sobre os objetos lidos antes."""
+        changes = {read.id: (read, amount, accrued_at) for read, amount, accrued_at in accruals}
+        data = self.storage.load()
+        updated = set()
+        for i, item in enumerate(data):
+            change = changes.get(item["id"])
+            if change is None:
+                continue
+            read, amount, accrued_at = change
+            expected = read.to_dict()
+            # Editado depois da leitura (valor, aporte, taxa, reinício): a próxima execução recalcula
+            if (item["current_amount"] != expected["current_amount"]
+                    or item["monthly_rate"] != expected["monthly_rate"]
+                    or item.get("last_accrued_at") != expected["last_accrued_at"]):
+                continue
+            data[i] = {**item, "current_amount": amount.to_dict(), "last_accrued_at": accrued_at.isoformat()}
+            updated.add(item["id"])
+        if updated:
+            self.storage.save(data)
+        return updated
+    
+    def version(self, user_id: str) -> str | None:
+        """Muda a cada gravação do arquivo (de qualquer usuário); custa um ``stat``."""
+        return "{}.{}.{}".format(*self.storage.signature())
+    
     def remove(self, investment_id: str) -> bool:
         """Remove um investimento pelo ID."""
         data = self.storage.load()
@@ -3,9 +3,11 @@ Serviço para gerenciar investimentos.
 """
 
 from __future__ import annotations
-from datetime import datetime, timezone
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-from .investment_models import Investment
+from .accrual_service import accrue_cents
+from .investment_models import CashFlow, Investment
 from .investment_repository import IInvestmentRepository
 from .models import Money
 
@@ -55,7 +57,9 @@ class InvestmentService:
             monthly_rate=monthly_rate,
             user_id=user_id,
             start_date=start_date or datetime.now(timezone.utc),
-            notes=notes.strip()
+            notes=notes.strip(),
+            # O valor atual informado vale a partir de agora
+            last_accrued_at=datetime.now(timezone.utc)
         )
         
         self.repo.add(investment)
@@ -110,10 +114,13 @@ class InvestmentService:
                 monthly_rate=investment.monthly_rate,
                 user_id=investment.user_id,
                 start_date=investment.start_date,
-                notes=investment.notes
+                notes=investment.notes,
+                last_accrued_at=investment.last_accrued_at,
+                cash_flows=investment.cash_flows
             )
         
-        if current_amount is not None:
+        # Só um valor novo (informado à mão) reinicia a contagem do rendimento
+        if current_amount is not None and Money(current_amount) != investment.current_amount:
             investment = Investment(
                 id=investment.id,
                 name=investment.name,
@@ -123,7 +130,9 @@ class InvestmentService:
                 monthly_rate=investment.monthly_rate,
                 user_id=investment.user_id,
                 start_date=investment.start_date,
-                notes=investment.notes
+                notes=investment.notes,
+                last_accrued_at=datetime.now(timezone.utc),
+                cash_flows=investment.cash_flows
             )
         
         if monthly_rate is not None:
@@ -136,7 +145,9 @@ class InvestmentService:
                 monthly_rate=monthly_rate,
                 user_id=investment.user_id,
                 start_date=investment.start_date,
-                notes=investment.notes
+                notes=investment.notes,
+                last_accrued_at=investment.last_accrued_at,
+                cash_flows=investment.cash_flows
             )
         
         if notes is not None:
@@ -149,22 +160,87 @@ class InvestmentService:
                 monthly_rate=investment.monthly_rate,
                 user_id=investment.user_id,
                 start_date=investment.start_date,
-                notes=notes.strip()
+                notes=notes.strip(),
+                last_accrued_at=investment.last_accrued_at,
+                cash_flows=investment.cash_flows
             )
         
         self.repo.update(investment)
         return investment
     
+    def add_cash_flow(
+        self,
+        investment_id: str,
+        amount: float | str,
+        date: datetime | None = None
+    ) -> Optional[Investment]:
+        """
+        Registra um aporte ou resgate e atualiza o valor atual.
+        
+        Antes do movimento, o rendimento pendente desde ``last_accrued_at`` é
+        incorporado, para que o valor anterior ao movimento (usado no retorno
+        ponderado pelo tempo) seja o da data do movimento.
+        
+        Args:
+            investment_id: ID do investimento
+            amount: Valor do aporte (positivo) ou do resgate (negativo)
+            date: Data do movimento (padrão: agora); não pode ser anterior
+                ao último movimento ou à última atualização do valor atual
+        
+        Returns:
+            Investment: Investimento atualizado ou None se não encontrado
+        """
+        investment = self.repo.by_id(investment_id)
+        if not investment:
+            return None
+        
+        value = Money(amount)
+        if value.amount == 0:
+            raise ValueError("Valor do movimento não pode ser zero")
+        now = datetime.now(timezone.utc)
+        date = date or now
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        
+        earliest = max(
+            [investment.start_date, investment.last_accrued_at or investment.start_date]
+            + [flow.date for flow in investment.cash_flows]
+        )
+        if date < earliest or date > now:
+            raise ValueError("Data do movimento deve estar entre a última atualização do investimento e agora")
+        
+        if investment.last_accrued_at is not None:
+            days = (date - investment.last_accrued_at) // timedelta(days=1)
+            if days >= 1:
+                cents = accrue_cents([investment.current_amount.cents], [investment.monthly_rate], [days])[0]
+                investment = replace(
+                    investment,
+                    current_amount=Money.from_cents(cents),
+                    last_accrued_at=investment.last_accrued_at + timedelta(days=days)
+                )
+        
+        balance = investment.current_amount
+        if (balance + value).amount < 0:
+            raise ValueError("Resgate maior que o valor atual")
+        
+        investment = replace(
+            investment,
+            current_amount=balance + value,
+            cash_flows=[*investment.cash_flows, CashFlow(date=date, amount=value, balance_before=balance)]
+        )
+        self.repo.update(investment)
+        return investment
+    
     def delete_investment(self, investment_id: str) -> bool:
         """Remove um investimento."""
         return self.repo.remove(investment_id)
     
     def total_invested(self, user_id: str) -> Money:
-        """Calcula o total investido pelo usuário."""
+        """Calcula o total investido pelo usuário (valores iniciais e aportes, menos resgates)."""
         investments = self.repo.list_by_user(user_id)
         total = Money(0)
         for inv in investments:
-            total = total + inv.initial_amount
+            total = total + inv.invested
         return total
     
     def total_current_value(self, user_id: str) -> Money:
@@ -24,6 +24,18 @@ class Money:
     def amount(self) -> Decimal:
         return self._amount
 
+    @property
+    def cents(self) -> int:
+        """Valor em centavos inteiros."""
+        return int(self._amount.scaleb(2))
+
+    @staticmethod
+    def from_cents(cents: int) -> "Money":
+        # Centavos inteiros já têm exatamente 2 casas: dispensa o quantize do __init__
+        money = object.__new__(Money)
+        money._amount = Decimal(int(cents)).scaleb(-2)
+        return money
+
     def __add__(self, other: "Money") -> "Money":
         return Money(self.amount + other.amount)
 
@@ -0,0 +1,262 @@
+"""
+Simulação de Monte Carlo para aporte fixo com rendimento mensal aleatório.
+
+Cada caminho sorteia um rendimento por mês, de uma distribuição normal ou por
+reamostragem (bootstrap) de uma série histórica de rendimentos mensais, e
+aplica a mesma regra das planilhas: ``Saldo[n] = Saldo[n-1] × (1 + r[n]) +
+Aporte``. Os caminhos são divididos em blocos; cada bloco é simulado de forma
+vetorizada (todos os caminhos do bloco avançam um mês por operação) e os
+blocos podem rodar em paralelo num pool de processos.
+
+O gerador de números aleatórios de cada bloco é derivado da semente pedida
+(``SeedSequence.spawn``), então o resultado para uma mesma semente não depende
+da quantidade de processos. Sem NumPy, os blocos rodam em Python puro com
+``random.Random``, mais devagar e com sequência diferente da do NumPy.
+"""
+
+from __future__ import annotations
+import csv
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import List, Sequence
+from .batch import np
+from .models import Money
+
+DISTRIBUTIONS = ("normal", "bootstrap")
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_CHUNK_SIZE = 5_000
+MAX_PATHS = 200_000
+# Caminhos × meses guardados para as faixas de percentis (float32: ~4 bytes cada)
+MAX_CELLS = 25_000_000
+RETURN_COLUMNS = ("return", "retorno", "rate", "taxa", "rendimento")
+
+
+@dataclass(slots=True)
+class ReturnModel:
+    """Distribuição dos rendimentos mensais (decimais, ex: 0.008 = 0,8%)."""
+    kind: str = "normal"
+    mean: float = 0.0
+    stddev: float = 0.0
+    returns: List[float] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError('Distribuição deve ser "normal" ou "bootstrap"')
+        if self.kind == "normal" and self.stddev < 0:
+            raise ValueError("stddev não pode ser negativo")
+        if self.kind == "bootstrap" and not self.returns:
+            raise ValueError("Bootstrap precisa de ao menos um rendimento histórico")
+
+
+def parse_return(value: str) -> float:
+    """Converte "0.008", "0,8%" ou "-1,2 %" em rendimento decimal."""
+    text = str(value).strip().replace(" ", "")
+    percent = text.endswith("%")
+    text = text.rstrip("%").replace(",", ".")
+    try:
+        rate = Decimal(text)
+    except InvalidOperation as e:
+        raise ValueError(f"Rendimento inválido: {value!r}") from e
+    return float(rate / 100 if percent else rate)
+
+
+def load_returns(path: str) -> List[float]:
+    """
+    Lê uma série de rendimentos mensais de um CSV local.
+
+    Usa a coluna chamada ``return``/``retorno``/``rate``/``taxa``/``rendimento``
+    ou, se não houver, a última coluna. Linhas sem valor numérico (como um
+    cabeçalho) são ignoradas.
+
+    Args:
+        path: Caminho do arquivo CSV
+
+    Returns:
+        Lista de rendimentos decimais, na ordem do arquivo
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        rows = list(csv.reader(f, dialect))
+
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    column = next((header.index(name) for name in RETURN_COLUMNS if name in header), len(header) - 1)
+
+    returns = []
+    for row in rows:
+        if column >= len(row) or not row[column].strip():
+            continue
+        try:
+            returns.append(parse_return(row[column]))
+        except ValueError:
+            continue
+    return returns
+
+
+def _simulate_chunk(task: tuple) -> tuple:
+    """
+    Simula um bloco de caminhos.
+
+    Devolve ``(saldos, alcançou_meta)``: saldos em reais por caminho e mês
+    (meses 0..n) e, por mês, quantos caminhos já tinham atingido a meta.
+    """
+    seed, size, initial, contribution, months, model, target = task
+
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        if model.kind == "normal":
+            draws = rng.normal(model.mean, model.stddev, size=(months, size))
+        else:
+            draws = rng.choice(np.asarray(model.returns, dtype=np.float64), size=(months, size))
+        # Perda máxima de 100% ao mês: o saldo não fica negativo
+        growth = 1.0 + np.maximum(draws, -1.0)
+
+        balances = np.empty((months + 1, size), dtype=np.float32)
+        balance = np.full(size, initial, dtype=np.float64)
+        balances[0] = balance
+        for month in range(months):
+            balance = balance * growth[month] + contribution
+            balances[month + 1] = balance
+
+        hits = None
+        if target is not None:
+            reached = np.maximum.accumulate(balances >= target, axis=0)
+            hits = reached.sum(axis=1).tolist()
+        return balances.T, hits
+
+    rng = random.Random(seed)
+    table = model.returns
+    paths = []
+    hits = [0] * (months + 1) if target is not None else None
+    for _ in range(size):
+        balance = initial
+        path = [balance]
+        reached = target is not None and balance >= target
+        if reached:
+            hits[0] += 1
+        for month in range(1, months + 1):
+            rate = rng.gauss(model.mean, model.stddev) if model.kind == "normal" else rng.choice(table)
+            balance = balance * (1.0 + max(rate, -1.0)) + contribution
+            path.append(balance)
+            if target is not None:
+                reached = reached or balance >= target
+                hits[month] += reached
+        paths.append(path)
+    return paths, hits
+
+
+def _percentile_bands(paths, percentiles: Sequence[float]) -> dict:
+    """Percentis por mês (centavos) de todos os caminhos."""
+    if np is not None:
+        values = np.percentile(paths, percentiles, axis=0).astype(np.float64)
+        return {f"p{p:g}": np.rint(row * 100).astype(np.int64).tolist() for p, row in zip(percentiles, values)}
+
+    columns = [sorted(column) for column in zip(*paths)]
+    bands = {}
+    for p in percentiles:
+        row = []
+        for column in columns:
+            # Interpolação linear, como o padrão do numpy.percentile
+            position = p / 100 * (len(column) - 1)
+            low = math.floor(position)
+            high = min(low + 1, len(column) - 1)
+            value = column[low] + (column[high] - column[low]) * (position - low)
+            row.append(round(value * 100))
+        bands[f"p{p:g}"] = row
+    return bands
+
+
+def run_monte_carlo(
+    initial_amount: float | str,
+    monthly_contribution: float | str,
+    months: int,
+    model: ReturnModel,
+    paths: int = 10_000,
+    seed: int | None = None,
+    target: float | str | None = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = 1,
+) -> dict:
+    """
+    Roda a simulação de Monte Carlo.
+
+    Args:
+        initial_amount: Valor inicial investido
+        monthly_contribution: Aporte mensal fixo
+        months: Número de meses
+        model: Distribuição dos rendimentos mensais
+        paths: Quantidade de caminhos simulados
+        seed: Semente do gerador (None = aleatória)
+        target: Meta de saldo; calcula a probabilidade de atingi-la
+        percentiles: Percentis (0 a 100) das faixas mensais
+        chunk_size: Caminhos por bloco vetorizado
+        workers: Processos do pool (1 = no próprio processo; None = CPUs disponíveis)
+
+    Returns:
+        ``{"months", "paths", "seed", "bands", "mean_final", "target"}``.
+        ``bands`` traz, por percentil, o saldo de cada mês em centavos;
+        ``target`` (quando pedido) traz o valor, a probabilidade de atingi-lo
+        até o fim e a probabilidade acumulada mês a mês.
+    """
+    if months < 1 or paths < 1 or chunk_size < 1:
+        raise ValueError("months, paths e chunk_size devem ser positivos")
+    if paths > MAX_PATHS or paths * (months + 1) > MAX_CELLS:
+        raise ValueError(f"Simulação grande demais (máximo de {MAX_PATHS} caminhos e {MAX_CELLS} caminhos × meses)")
+    if not all(0 <= p <= 100 for p in percentiles):
+        raise ValueError("Percentis devem estar entre 0 e 100")
+
+    initial = float(Money(initial_amount).amount)
+    contribution = float(Money(monthly_contribution).amount)
+    goal = float(Money(target).amount) if target is not None else None
+
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 63)
+    sizes = [min(chunk_size, paths - start) for start in range(0, paths, chunk_size)]
+    if np is not None:
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    else:
+        seeds = [f"{seed}:{index}" for index in range(len(sizes))]
+    tasks = [(s, size, initial, contribution, months, model, goal) for s, size in zip(seeds, sizes)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+    else:
+        results = [_simulate_chunk(task) for task in tasks]
+
+    if np is not None:
+        balances = np.concatenate([chunk for chunk, _ in results])
+        mean_final = float(balances[:, -1].astype(np.float64).mean())
+    else:
+        balances = [path for chunk, _ in results for path in chunk]
+        mean_final = sum(path[-1] for path in balances) / len(balances)
+
+    output = {
+        "months": list(range(months + 1)),
+        "paths": paths,
+        "seed": seed,
+        "bands": _percentile_bands(balances, percentiles),
+        "mean_final": round(mean_final * 100),
+        "target": None,
+    }
+    if goal is not None:
+        by_month = [sum(counts) / paths for counts in zip(*(hits for _, hits in results))]
+        output["target"] = {
+            "amount": round(goal * 100),
+            "probability": by_month[-1],
+            "by_month": by_month,
+        }
+    return output
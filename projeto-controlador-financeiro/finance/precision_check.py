@@ -0,0 +1,162 @@
+"""
+Verificação da deriva do modo rápido das simulações em relação ao exato.
+
+``measure_drift`` sorteia parâmetros (valor inicial, aporte, taxa e, para
+aportes variáveis, um aporte por mês), simula a curva nos dois modos até o
+maior prazo e registra, para cada prazo, a maior diferença em centavos entre
+os saldos mês a mês. ``check_drift`` compara o resultado com o limite teórico
+(``rounding_error_bound``) ou com limites fixos por prazo, e ``benchmark``
+mede o tempo de cada modo lado a lado.
+
+Também disponível pela linha de comando: ``python -m finance.cli verify-simulations``.
+"""
+
+from __future__ import annotations
+import random
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Sequence
+from .simulation_service import EXACT, FAST, SimulationService, rounding_error_bound
+
+DEFAULT_HORIZONS = (12, 60, 120, 240, 360, 480)
+KINDS = ("fixed", "variable")
+
+
+@dataclass(slots=True)
+class DriftReport:
+    """Deriva medida num prazo: máxima e média (centavos) e o pior limite teórico."""
+    kind: str
+    months: int
+    samples: int
+    max_drift_cents: int
+    mean_drift_cents: float
+    bound_cents: float
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "months": self.months,
+            "samples": self.samples,
+            "max_drift_cents": self.max_drift_cents,
+            "mean_drift_cents": self.mean_drift_cents,
+            "bound_cents": self.bound_cents,
+        }
+
+
+def _random_params(rng: random.Random, months: int, kind: str) -> dict:
+    params = {
+        "initial_amount": Decimal(rng.randint(0, 10_000_000)).scaleb(-2),
+        # Taxas realistas (até ~20% ao ano): com 3% ao mês por 40 anos o saldo cresce 10⁶ vezes
+        "monthly_rate": rng.choice([0.0, 0.005, 0.008, 0.01, round(rng.uniform(-0.005, 0.015), 6)]),
+    }
+    if kind == "fixed":
+        params["monthly_contribution"] = Decimal(rng.randint(0, 1_000_000)).scaleb(-2)
+        params["months"] = months
+    else:
+        params["monthly_contributions"] = [Decimal(rng.randint(0, 500_000)).scaleb(-2) for _ in range(months)]
+    return params
+
+
+def _curve(kind: str, params: dict, mode: str) -> List[int]:
+    """Saldos (centavos) dos meses 0..n num modo."""
+    if kind == "fixed":
+        return [row[2] for row in SimulationService.iter_fixed_contribution(mode=mode, **params)]
+    policy = FAST if mode == "fast" else EXACT
+    result = SimulationService.simulate_variable_contribution(precision=policy, **params)
+    return [p.accumulated_balance.cents for p in result.projections]
+
+
+def measure_drift(
+    samples: int = 200,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    kind: str = "fixed",
+    seed: int = 0,
+) -> List[DriftReport]:
+    """
+    Mede a deriva entre os modos rápido e exato em parâmetros aleatórios.
+
+    Args:
+        samples: Quantidade de cenários sorteados
+        horizons: Prazos (meses) em que a deriva é registrada
+        kind: "fixed" (aporte fixo) ou "variable" (aportes variáveis)
+        seed: Semente do sorteio
+
+    Returns:
+        Um ``DriftReport`` por prazo, em ordem crescente de prazo
+    """
+    if kind not in KINDS:
+        raise ValueError('kind deve ser "fixed" ou "variable"')
+    horizons = sorted(set(horizons))
+    longest = horizons[-1]
+    rng = random.Random(seed)
+
+    worst = {n: 0 for n in horizons}
+    totals = {n: 0 for n in horizons}
+    bounds = {n: 0.0 for n in horizons}
+    for _ in range(samples):
+        params = _random_params(rng, longest, kind)
+        exact = _curve(kind, params, "exact")
+        fast = _curve(kind, params, "fast")
+
+        # Maior diferença até cada prazo (os prazos menores são prefixos da curva)
+        drift = 0
+        month = 0
+        for n in horizons:
+            while month <= n:
+                drift = max(drift, abs(exact[month] - fast[month]))
+                month += 1
+            worst[n] = max(worst[n], drift)
+            totals[n] += drift
+            bound = float(rounding_error_bound(params["monthly_rate"], n) * 100)
+            bounds[n] = max(bounds[n], bound)
+
+    return [
+        DriftReport(kind, n, samples, worst[n], totals[n] / samples if samples else 0.0, bounds[n])
+        for n in horizons
+    ]
+
+
+def check_drift(reports: List[DriftReport], limits: Dict[int, int] | None = None) -> List[str]:
+    """
+    Compara a deriva medida com os limites.
+
+    Args:
+        reports: Resultado de ``measure_drift``
+        limits: Deriva máxima aceita (centavos) por prazo; sem limite para um
+            prazo, vale o limite teórico mais 1 centavo de arredondamento
+
+    Returns:
+        Lista de violações (vazia quando tudo está dentro dos limites)
+    """
+    failures = []
+    for report in reports:
+        limit = (limits or {}).get(report.months, report.bound_cents + 1)
+        if report.max_drift_cents > limit:
+            failures.append(
+                f"{report.kind} {report.months} meses: deriva de {report.max_drift_cents} centavos "
+                f"(limite {limit:g})"
+            )
+    return failures
+
+
+def benchmark(months: int = 360, repeat: int = 100) -> Dict[str, float]:
+    """
+    Tempo médio (ms) de uma simulação com aporte fixo em cada modo.
+
+    Args:
+        months: Prazo simulado
+        repeat: Execuções por modo
+
+    Returns:
+        ``{"exact", "fast", "summary", "speedup"}``, em que ``speedup`` é
+        exato ÷ rápido
+    """
+    timings = {}
+    for mode in ("exact", "fast", "summary"):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            SimulationService.simulate_fixed_contribution("10000", "1500", 0.008, months, mode=mode)
+        timings[mode] = (time.perf_counter() - start) / repeat * 1000
+    timings["speedup"] = timings["exact"] / timings["fast"] if timings["fast"] else 0.0
+    return timings
@@ -0,0 +1,175 @@
+"""
+Índice de somas prefixadas sobre os baldes diários de um usuário.
+
+Construído a partir da seção ``daily`` (ver ``finance.aggregates.DailyBuckets``),
+responde totais de qualquer intervalo de datas com duas buscas binárias, em
+O(log dias), e entrega a série diária do saldo acumulado sem recalcular nada.
+"""
+
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator
+
+GRANULARITIES = ("day", "week", "month")
+MAX_SERIES_POINTS = 10_000
+"""Limite de períodos por série (evita respostas gigantes por engano)."""
+
+
+def as_day(value: date | datetime) -> date:
+    """Dia (calendário UTC) de uma data ou datetime (naive = UTC)."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None and value.tzinfo.utcoffset(value) is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+def is_day_aligned(start: datetime | None, end: datetime | None) -> bool:
+    """
+    Indica se o intervalo ``[start, end]`` cobre dias UTC inteiros.
+
+    ``start`` deve cair à meia-noite e ``end`` no último microssegundo do dia,
+    como produzem os filtros da API. Só nesses casos o índice diário é exato.
+    """
+    def utc(value: datetime) -> datetime:
+        if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    if start is not None and utc(start).time() != datetime.min.time():
+        return False
+    if end is not None and utc(end).time() != datetime.max.time():
+        return False
+    return True
+
+
+def period_start(day: date, granularity: str) -> date:
+    """Primeiro dia do período (dia, semana ISO começando na segunda, ou mês) de ``day``."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def _label(start: date, granularity: str) -> str:
+    return f"{start.year:04d}-{start.month:02d}" if granularity == "month" else start.isoformat()
+
+
+class RangeIndex:
+    """Somas prefixadas de receitas, despesas e quantidades por dia."""
+
+    __slots__ = ("days", "_income", "_expense", "_count")
+
+    def __init__(self, daily: dict[str, list[int]]):
+        """
+        Args:
+            daily: ``{"YYYY-MM-DD": [receitas, despesas, quantidade]}`` em centavos
+        """
+        items = sorted(daily.items())
+        self.days = [date.fromisoformat(day).toordinal() for day, _ in items]
+        self._income = [0] * (len(items) + 1)
+        self._expense = [0] * (len(items) + 1)
+        self._count = [0] * (len(items) + 1)
+        for i, (_, (income, expense, count)) in enumerate(items, start=1):
+            self._income[i] = self._income[i - 1] + income
+            self._expense[i] = self._expense[i - 1] + expense
+            self._count[i] = self._count[i - 1] + count
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def _bounds(self, start: date | datetime | None, end: date | datetime | None) -> tuple[int, int]:
+        lo = 0 if start is None else bisect_left(self.days, as_day(start).toordinal())
+        hi = len(self.days) if end is None else bisect_right(self.days, as_day(end).toordinal())
+        return lo, max(lo, hi)
+
+    def _span(self, lo: int, hi: int) -> dict[str, int]:
+        income = self._income[hi] - self._income[lo]
+        expense = self._expense[hi] - self._expense[lo]
+        return {
+            "income": income,
+            "expense": expense,
+            "balance": income - expense,
+            "count": self._count[hi] - self._count[lo],
+        }
+
+    def totals(self, start: date | datetime | None = None, end: date | datetime | None = None) -> dict[str, int]:
+        """
+        Totais em centavos entre ``start`` e ``end`` (dias inclusivos).
+
+        Returns:
+            ``{"income", "expense", "balance", "count"}``
+        """
+        return self._span(*self._bounds(start, end))
+
+    def by_month(self, start: date | datetime | None = None, end: date | datetime | None = None) -> dict[str, dict[str, int]]:
+        """Totais por mês "YYYY-MM" dentro do intervalo, em O(meses × log dias)."""
+        lo, hi = self._bounds(start, end)
+        result: dict[str, dict[str, int]] = {}
+        while lo < hi:
+            first = date.fromordinal(self.days[lo])
+            following = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+            cut = min(hi, bisect_left(self.days, following.toordinal(), lo, hi))
+            result[f"{first.year:04d}-{first.month:02d}"] = self._span(lo, cut)
+            lo = cut
+        return result
+
+    def running_balance(self) -> Iterator[tuple[str, int]]:
+        """Saldo acumulado (centavos) ao fim de cada dia com movimento."""
+        for i, day in enumerate(self.days, start=1):
+            yield date.fromordinal(day).isoformat(), self._income[i] - self._expense[i]
+
+    def series(
+        self,
+        granularity: str = "day",
+        start: date | datetime | None = None,
+        end: date | datetime | None = None,
+    ) -> dict[str, list]:
+        """
+        Série do saldo acumulado em arrays paralelos, um elemento por período.
+
+        Os períodos são contínuos (inclusive os sem movimento) entre ``start``
+        e ``end``; sem limites, vão do primeiro ao último dia com movimento.
+        O saldo de cada período é o acumulado desde o início do histórico até
+        o seu último dia, lido direto das somas prefixadas.
+
+        Args:
+            granularity: "day", "week" (rótulo = segunda-feira) ou "month"
+            start: primeiro dia da série
+            end: último dia da série
+
+        Returns:
+            ``{"periods", "income", "expense", "balance"}``, valores em centavos
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError('granularity deve ser "day", "week" ou "month"')
+        result: dict[str, list] = {"periods": [], "income": [], "expense": [], "balance": []}
+        first = as_day(start) if start is not None else (date.fromordinal(self.days[0]) if self.days else None)
+        last = as_day(end) if end is not None else (date.fromordinal(self.days[-1]) if self.days else None)
+        if first is None or last is None or first > last:
+            return result
+
+        period = period_start(first, granularity)
+        lo = bisect_left(self.days, first.toordinal())
+        stop = last.toordinal() + 1
+        while period <= last:
+            if len(result["periods"]) >= MAX_SERIES_POINTS:
+                raise ValueError(f"Intervalo longo demais: mais de {MAX_SERIES_POINTS} períodos")
+            following = _next_period(period, granularity)
+            hi = bisect_left(self.days, min(following.toordinal(), stop), lo)
+            result["periods"].append(_label(period, granularity))
+            result["income"].append(self._income[hi] - self._income[lo])
+            result["expense"].append(self._expense[hi] - self._expense[lo])
+            result["balance"].append(self._income[hi] - self._expense[hi])
+            lo, period = hi, following
+        return result
@@ -3,24 +3,128 @@ Serviço especializado para geração de relatórios avançados.
 """
 
 from __future__ import annotations
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict, List
-from .models import Transaction, Money
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+from .aggregates import MonthlyRollup, SpendingStats
+from .batch import TransactionBatch
+from .models import Money
 from .repository import ITransactionRepository
+from .stats import QuantileSketch, RunningStats
+
+
+Cell = tuple[str, str, str, int, int]
+
+OTHER_CATEGORY = "Outras"
+"""Coluna que agrupa as categorias cortadas pelo ``top`` do pivot."""
+
+
+def month_span(first: str, last: str) -> List[str]:
+    """Meses "YYYY-MM" de ``first`` a ``last``, inclusive."""
+    year, month = int(first[:4]), int(first[5:7])
+    months = []
+    while True:
+        key = f"{year:04d}-{month:02d}"
+        months.append(key)
+        if key >= last:
+            return months
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+
+
+def _month_window(start: datetime | None, end: datetime | None) -> tuple[str | None, str | None] | None:
+    """
+    Meses "YYYY-MM" cobertos por ``[start, end]``, se o intervalo for de meses inteiros.
+
+    ``start`` precisa cair à meia-noite do dia 1 e ``end`` no último
+    microssegundo de um mês (UTC); ``None`` deixa o lado em aberto. Para
+    outros intervalos devolve ``None``.
+    """
+    def utc(value: datetime) -> datetime:
+        if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    first = last = None
+    if start is not None:
+        start = utc(start)
+        if start.day != 1 or start.time() != datetime.min.time():
+            return None
+        first = f"{start.year:04d}-{start.month:02d}"
+    if end is not None:
+        end = utc(end)
+        if (end + timedelta(microseconds=1)).day != 1 or end.time() != datetime.max.time():
+            return None
+        last = f"{end.year:04d}-{end.month:02d}"
+    return first, last
+
+
+def _describe(stats: RunningStats, sketch: QuantileSketch) -> Dict[str, int]:
+    result = {
+        "count": stats.count,
+        "mean": round(stats.mean),
+        "stddev": round(stats.stddev),
+        "min": stats.min,
+        "max": stats.max,
+    }
+    for name, q in PERCENTILES:
+        # O sketch erra até 1% para cima ou para baixo: limita aos extremos exatos
+        result[name] = min(max(round(sketch.quantile(q)), stats.min), stats.max)
+    return result
 
 
 class ReportService:
-    """Serviço para gerar relatórios financeiros avançados."""
+    """
+    Serviço para gerar relatórios financeiros avançados.
+
+    Sem ``batch``, os relatórios são respondidos pela tabela mensal mantida
+    pelo repositório (``MonthlyRollup``), sem percorrer as transações.
+    """
     
     def __init__(self, repo: ITransactionRepository):
         self.repo = repo
     
+    def _cells(
+        self,
+        user_id: str,
+        batch: TransactionBatch | None = None,
+        year: int | None = None,
+        month: int | None = None,
+        category: str | None = None
+    ) -> Iterator[Cell]:
+        """Células ``(mês, categoria, tipo, centavos, quantidade)`` filtradas."""
+        if batch is not None:
+            keys = ("month", "category", "type")
+            counts = batch.count_by(*keys)
+            cells = (
+                (*key, total, counts[key])
+                for key, total in batch.group_by(*keys, signed=False).items()
+            )
+        else:
+            cells = MonthlyRollup.cells(self.repo.rollup(user_id))
+        
+        prefix = None
+        if year is not None:
+            prefix = f"{year:04d}-{month:02d}" if month is not None else f"{year:04d}-"
+        # Mês sem ano: o mesmo mês em todos os anos
+        suffix = f"-{month:02d}" if year is None and month is not None else None
+        
+        for cell in cells:
+            if prefix is not None and not cell[0].startswith(prefix):
+                continue
+            if suffix is not None and not cell[0].endswith(suffix):
+                continue
+            if category is not None and cell[1] != category:
+                continue
+            yield cell
+    
     def monthly_by_category(
         self, 
         user_id: str, 
         year: int | None = None, 
-        month: int | None = None
+        month: int | None = None,
+        batch: TransactionBatch | None = None
     ) -> Dict[str, Dict[str, Money]]:
         """
         Gera relatório mensal detalhado por categoria.
@@ -29,6 +133,7 @@ class ReportService:
             user_id: ID do usuário
             year: Ano específico (opcional)
             month: Mês específico (opcional, requer year)
+            batch: Transações já carregadas em formato colunar (opcional)
         
         Returns:
             Dicionário no formato:
@@ -41,38 +146,24 @@ class ReportService:
                 "2025-02": {...}
             }
         """
-        transactions = self.repo.list_by_user(user_id)
-        
-        # Estrutura: {month: {category: total}}
-        report: Dict[str, Dict[str, Money]] = defaultdict(lambda: defaultdict(lambda: Money(0)))
-        
-        for tx in transactions:
-            tx_date = tx.occurred_at
-            tx_year = tx_date.year
-            tx_month = tx_date.month
-            
-            # Filtrar por ano/mês se especificado
-            if year is not None and tx_year != year:
-                continue
-            if month is not None and tx_month != month:
-                continue
-            
-            month_key = f"{tx_year:04d}-{tx_month:02d}"
-            category_key = tx.category.name
-            
-            report[month_key][category_key] = report[month_key][category_key] + tx.signed_amount
+        # Estrutura: {month: {category: total}} em centavos com sinal
+        totals: Dict[str, Dict[str, int]] = {}
+        for month_key, category_key, type_, cents, _ in self._cells(user_id, batch, year, month):
+            signed = cents if type_ == "income" else -cents
+            row = totals.setdefault(month_key, {})
+            row[category_key] = row.get(category_key, 0) + signed
         
-        # Converter defaultdict para dict normal
         return {
-            month: dict(categories) 
-            for month, categories in sorted(report.items())
+            month_key: {name: Money.from_cents(total) for name, total in sorted(row.items())}
+            for month_key, row in sorted(totals.items())
         }
     
     def category_by_month(
         self,
         user_id: str,
         category: str,
-        year: int | None = None
+        year: int | None = None,
+        batch: TransactionBatch | None = None
     ) -> Dict[str, Money]:
         """
         Gera relatório de uma categoria específica ao longo dos meses.
@@ -81,6 +172,7 @@ class ReportService:
             user_id: ID do usuário
             category: Nome da categoria
             year: Ano específico (opcional)
+            batch: Transações já carregadas em formato colunar (opcional)
         
         Returns:
             Dicionário no formato:
@@ -90,48 +182,140 @@ class ReportService:
                 ...
             }
         """
-        transactions = self.repo.list_by_user(user_id)
+        totals: Dict[str, int] = {}
+        for month_key, _, type_, cents, _ in self._cells(user_id, batch, year, category=category):
+            signed = cents if type_ == "income" else -cents
+            totals[month_key] = totals.get(month_key, 0) + signed
         
-        report: Dict[str, Money] = defaultdict(lambda: Money(0))
+        return {month_key: Money.from_cents(total) for month_key, total in sorted(totals.items())}
+    
+    def pivot(
+        self,
+        user_id: str,
+        year: int | None = None,
+        type: str | None = None,
+        top: int | None = None,
+        batch: TransactionBatch | None = None
+    ) -> Dict[str, list]:
+        """
+        Matriz densa meses × categorias em centavos com sinal, numa só passada.
         
-        for tx in transactions:
-            if tx.category.name != category:
-                continue
-            
-            tx_date = tx.occurred_at
-            tx_year = tx_date.year
-            tx_month = tx_date.month
-            
-            if year is not None and tx_year != year:
+        As linhas cobrem todos os meses do primeiro ao último com movimento
+        (meses vazios valem zero). Com ``top``, ficam só as ``top`` categorias
+        de maior volume absoluto e as demais são somadas na coluna
+        ``OTHER_CATEGORY``.
+        
+        Args:
+            user_id: ID do usuário
+            year: Ano específico (opcional)
+            type: "income" ou "expense" para considerar só um tipo (opcional)
+            top: Número máximo de categorias (opcional)
+            batch: Transações já carregadas em formato colunar (opcional)
+        
+        Returns:
+            ``{"months": [...], "categories": [...], "values": [[...]], "totals": [...]}``,
+            com ``values[i][j]`` = total do mês ``i`` na categoria ``j``
+        """
+        by_category: Dict[str, Dict[str, int]] = {}
+        volume: Dict[str, int] = {}
+        for month_key, category_key, type_, cents, _ in self._cells(user_id, batch, year):
+            if type is not None and type_ != type:
                 continue
-            
-            month_key = f"{tx_year:04d}-{tx_month:02d}"
-            report[month_key] = report[month_key] + tx.signed_amount
+            column = by_category.setdefault(category_key, {})
+            column[month_key] = column.get(month_key, 0) + (cents if type_ == "income" else -cents)
+            volume[category_key] = volume.get(category_key, 0) + cents
+        
+        if not by_category:
+            return {"months": [], "categories": [], "values": [], "totals": []}
         
-        return dict(sorted(report.items()))
+        months = month_span(min(m for col in by_category.values() for m in col),
+                             max(m for col in by_category.values() for m in col))
+        
+        ranked = sorted(volume, key=lambda name: (-volume[name], name))
+        columns = sorted(ranked[:top]) if top is not None else sorted(ranked)
+        cells = [by_category[name] for name in columns]
+        if top is not None and len(ranked) > top:
+            other: Dict[str, int] = {}
+            for name in ranked[top:]:
+                for month_key, total in by_category[name].items():
+                    other[month_key] = other.get(month_key, 0) + total
+            columns.append(OTHER_CATEGORY)
+            cells.append(other)
+        
+        values = [[column.get(month_key, 0) for column in cells] for month_key in months]
+        return {
+            "months": months,
+            "categories": columns,
+            "values": values,
+            "totals": [sum(column.values()) for column in cells],
+        }
     
-    def available_months(self, user_id: str) -> List[str]:
+    def spending_stats(
+        self,
+        user_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch: TransactionBatch | None = None
+    ) -> Dict[str, Dict[str, int]]:
         """
-        Retorna lista de meses disponíveis (com transações).
+        Estatísticas das despesas por categoria no período.
+        
+        Períodos de meses inteiros (ou sem limites) mesclam as células mensais
+        mantidas por ``SpendingStats``, sem tocar nas transações. Outros
+        períodos, ou um ``batch`` explícito, são resolvidos numa única passada
+        pelas despesas, com os mesmos acumuladores.
+        
+        Args:
+            user_id: ID do usuário
+            start: Início do período (inclusivo, opcional)
+            end: Fim do período (inclusivo, opcional)
+            batch: Transações já carregadas em formato colunar (opcional)
         
         Returns:
-            Lista de strings no formato "YYYY-MM"
+            ``{categoria: {"count", "mean", "stddev", "min", "max", "p50", "p90", "p99"}}``
+            com valores em centavos; percentis com erro relativo de até 1%
         """
-        transactions = self.repo.list_by_user(user_id)
-        months = set()
+        merged: Dict[str, tuple[RunningStats, QuantileSketch]] = {}
+        window = _month_window(start, end) if batch is None else None
         
-        for tx in transactions:
-            tx_date = tx.occurred_at
-            month_key = f"{tx_date.year:04d}-{tx_date.month:02d}"
-            months.add(month_key)
+        if window is not None:
+            first, last = window
+            for month, category, stats, sketch in SpendingStats.cells(self.repo.spending(user_id)):
+                if (first and month < first) or (last and month > last):
+                    continue
+                if category in merged:
+                    merged[category][0].merge(stats)
+                    merged[category][1].merge(sketch)
+                else:
+                    merged[category] = (stats, sketch)
+        else:
+            batch = batch if batch is not None else self.repo.batch_by_user(user_id)
+            rows = batch.select(type="expense", start=start, end=end)
+            for code, cents in zip(rows.category, rows.cents):
+                name = rows.categories[code]
+                if name not in merged:
+                    merged[name] = (RunningStats(), QuantileSketch())
+                stats, sketch = merged[name]
+                stats.add(int(cents))
+                sketch.add(int(cents))
         
-        return sorted(list(months))
+        return {name: _describe(*merged[name]) for name in sorted(merged)}
+    
+    def available_months(self, user_id: str, batch: TransactionBatch | None = None) -> List[str]:
+        """
+        Retorna lista de meses disponíveis (com transações).
+        
+        Returns:
+            Lista de strings no formato "YYYY-MM"
+        """
+        return sorted({cell[0] for cell in self._cells(user_id, batch)})
     
     def summary_by_month(
         self,
         user_id: str,
         year: int | None = None,
-        month: int | None = None
+        month: int | None = None,
+        batch: TransactionBatch | None = None
     ) -> Dict[str, Dict[str, str]]:
         """
         Gera resumo financeiro por mês (receitas, despesas, saldo).
@@ -147,43 +331,18 @@ class ReportService:
                 ...
             }
         """
-        transactions = self.repo.list_by_user(user_id)
+        summary: Dict[str, Dict[str, int]] = {}
+        for month_key, _, type_, cents, _ in self._cells(user_id, batch, year, month):
+            values = summary.setdefault(month_key, {"income": 0, "expense": 0})
+            values[type_] += cents
         
-        summary: Dict[str, Dict[str, Money]] = defaultdict(
-            lambda: {
-                "income": Money(0),
-                "expense": Money(0),
-                "balance": Money(0)
-            }
-        )
-        
-        for tx in transactions:
-            tx_date = tx.occurred_at
-            tx_year = tx_date.year
-            tx_month = tx_date.month
-            
-            if year is not None and tx_year != year:
-                continue
-            if month is not None and tx_month != month:
-                continue
-            
-            month_key = f"{tx_year:04d}-{tx_month:02d}"
-            
-            if tx.type == "income":
-                summary[month_key]["income"] = summary[month_key]["income"] + tx.amount
-            else:
-                summary[month_key]["expense"] = summary[month_key]["expense"] + tx.amount
-            
-            summary[month_key]["balance"] = summary[month_key]["balance"] + tx.signed_amount
-        
-        # Converter Money para string
+        # Converter centavos para string
         result = {}
         for month, values in sorted(summary.items()):
             result[month] = {
-                "income": str(values["income"].amount),
-                "expense": str(values["expense"].amount),
-                "balance": str(values["balance"].amount)
+                "income": str(Money.from_cents(values["income"]).amount),
+                "expense": str(Money.from_cents(values["expense"]).amount),
+                "balance": str(Money.from_cents(values["income"] - values["expense"]).amount)
             }
         
         return result
-
@@ -1,7 +1,13 @@
 from __future__ import annotations
+import copy
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
+from .aggregates import (
+    Aggregate, BalanceCounters, DailyBuckets, DataVersions, MonthlyRollup, SpendingStats, default_aggregates,
+)
+from .batch import TransactionBatch
 from .models import Transaction
+from .range_index import RangeIndex
 from .storage import JSONStorage
 
 
@@ -19,33 +25,270 @@ class ITransactionRepository(ABC):
     @abstractmethod
     def replace_all(self, items: Iterable[Transaction]) -> None: ...
 
+    def add_many(self, txs: Iterable[Transaction]) -> None:
+        """Adiciona várias transações (implementações podem gravar de uma vez)."""
+        for tx in txs:
+            self.add(tx)
+
+    def update(self, tx: Transaction) -> bool:
+        """Substitui uma transação existente (mesmo ID)."""
+        if not self.remove(tx.id):
+            return False
+        self.add(tx)
+        return True
+
+    def iter_records(self, user_id: str) -> Iterator[dict]:
+        """Transações do usuário como dicts serializáveis, uma a uma."""
+        for tx in self.list_by_user(user_id):
+            yield tx.to_dict()
+
+    def batch_by_user(self, user_id: str | None = None) -> TransactionBatch:
+        """Transações (de um usuário ou de todos) em formato colunar."""
+        items = self.list_by_user(user_id) if user_id else self.list()
+        return TransactionBatch.from_transactions(items)
+
+    def totals(self, user_id: str | None = None) -> dict[str, int]:
+        """Receitas, despesas, saldo (centavos) e quantidade de transações."""
+        batch = self.batch_by_user(user_id)
+        income = batch.select(type="income").sum()
+        expense = -batch.select(type="expense").sum()
+        return {"income": income, "expense": expense, "balance": income - expense, "count": len(batch)}
+
+    def rollup(self, user_id: str) -> dict:
+        """Totais mensais do usuário no formato da seção de ``MonthlyRollup``."""
+        records = (tx.to_dict() for tx in self.list_by_user(user_id))
+        return MonthlyRollup().rebuild(records).get(user_id, {})
+
+    def spending(self, user_id: str) -> dict:
+        """Estatísticas mensais de despesas no formato da seção de ``SpendingStats``."""
+        records = (tx.to_dict() for tx in self.list_by_user(user_id))
+        return SpendingStats().rebuild(records).get(user_id, {})
+
+    def range_index(self, user_id: str) -> RangeIndex:
+        """Índice de somas prefixadas sobre os dias com movimento do usuário."""
+        records = (tx.to_dict() for tx in self.list_by_user(user_id))
+        return RangeIndex(DailyBuckets().rebuild(records).get(user_id, {}))
+
+    def version(self, user_id: str) -> str | None:
+        """Versão opaca dos dados do usuário, ou None se o repositório não versiona."""
+        return None
+
 
 class JSONTransactionRepository(ITransactionRepository):
-    def __init__(self, storage: JSONStorage | None = None):
+    """
+    Repositório de transações em JSON.
+
+    Além da lista de transações, o documento guarda as seções dos agregados
+    (ver ``finance.aggregates``), atualizadas por delta na mesma gravação de
+    cada ``add``/``update``/``remove``.
+    """
+
+    def __init__(self, storage: JSONStorage | None = None, aggregates: Iterable[Aggregate] | None = None):
         self.storage = storage or JSONStorage()
+        self.aggregates = list(aggregates) if aggregates is not None else default_aggregates()
+        self._section_cache: dict[str, tuple] = {}
+        self._index_cache: dict[str, tuple] = {}
+        self._doc_cache: tuple | None = None
+
+    # ---- documento e agregados ----
+
+    def _read(self) -> dict:
+        # Documento gravado por este repositório e ainda intacto no disco: sem reler
+        signature = self.storage.signature()
+        if self._doc_cache is not None and self._doc_cache[0] == signature:
+            return self._doc_cache[1]
+        doc = self.storage.load_document()
+        for agg in self.aggregates:
+            if agg.section not in doc:
+                # Arquivo antigo (ou gravado por fora do repositório): reconstruir
+                doc[agg.section] = agg.rebuild(doc["transactions"])
+        return doc
+
+    def _load(self) -> dict:
+        """
+        Cópia do documento para alteração.
+
+        O documento lido pode ser o mesmo já entregue a leitores (cache do
+        repositório ou snapshot da requisição): as seções são copiadas antes de
+        ``_commit`` alterá-las no lugar. Os registros de ``transactions`` nunca
+        são alterados no lugar, só substituídos, então basta copiar a lista.
+        """
+        doc = self._read()
+        writable = dict(doc, transactions=list(doc["transactions"]))
+        for agg in self.aggregates:
+            writable[agg.section] = copy.deepcopy(doc[agg.section])
+        return writable
+
+    def _commit(self, doc: dict, added: Iterable[dict] = (), removed: Iterable[dict] = ()) -> None:
+        added, removed = list(added), list(removed)
+        for agg in self.aggregates:
+            state = doc[agg.section]
+            for record in removed:
+                agg.apply(state, record, -1)
+            for record in added:
+                agg.apply(state, record, 1)
+            if removed:
+                agg.settle(state, doc["transactions"], removed)
+        try:
+            self.storage.save_document(doc)
+        except BaseException:
+            # O documento em memória já tem a alteração que não chegou ao disco
+            self._doc_cache = None
+            self._section_cache = {}
+            raise
+        self._remember(doc)
+
+    def _remember(self, doc: dict) -> None:
+        signature = self.storage.signature()
+        self._doc_cache = (signature, doc)
+        self._section_cache = {agg.section: (signature, doc[agg.section]) for agg in self.aggregates}
+        # Seções podem ter sido alteradas no lugar: índices derivados ficam inválidos
+        self._index_cache = {}
+
+    def _cached_section(self, section: str) -> dict:
+        """Seção de agregado, relida do disco só quando o arquivo muda."""
+        signature = self.storage.signature()
+        cached = self._section_cache.get(section)
+        if cached is None or cached[0] != signature:
+            doc = self._read()
+            self._section_cache = {agg.section: (signature, doc[agg.section]) for agg in self.aggregates}
+            cached = self._section_cache[section]
+        return cached[1]
+
+    def _maintains(self, kind: type) -> bool:
+        return any(isinstance(agg, kind) for agg in self.aggregates)
+
+    def verify(self, repair: bool = False) -> dict[str, list[str]]:
+        """
+        Confere os agregados persistidos contra uma reconstrução completa.
+
+        Args:
+            repair: regravar as seções divergentes com o valor reconstruído
+
+        Returns:
+            ``{seção: [usuários divergentes]}`` apenas para seções com divergência
+        """
+        doc = self._read()
+        # Seções reconstruídas substituem as antigas numa cópia rasa; leitores mantêm as suas
+        repaired = dict(doc)
+        problems: dict[str, list[str]] = {}
+        for agg in self.aggregates:
+            users = agg.verify(doc[agg.section], doc["transactions"])
+            if users:
+                problems[agg.section] = users
+                if repair:
+                    repaired[agg.section] = agg.rebuild(doc["transactions"])
+        if problems and repair:
+            self.storage.save_document(repaired)
+            self._remember(repaired)
+        return problems
+
+    # ---- leitura ----
 
     def list(self) -> list[Transaction]:
         raw = self.storage.get_all()
         return [Transaction.from_dict(d) for d in raw]
-    
+
     def list_by_user(self, user_id: str) -> list[Transaction]:
         """Lista transações de um usuário específico."""
         all_transactions = self.list()
         return [tx for tx in all_transactions if tx.user_id == user_id]
 
+    def iter_records(self, user_id: str) -> Iterator[dict]:
+        """Percorre os dicts do arquivo sem hidratar ``Transaction``."""
+        for record in self.storage.get_all():
+            if record.get("user_id", "default") == user_id:
+                yield record
+
+    def batch_by_user(self, user_id: str | None = None) -> TransactionBatch:
+        """Monta o batch direto dos dicts do arquivo, sem hidratar ``Transaction``."""
+        raw = self.storage.get_all()
+        if user_id:
+            raw = (d for d in raw if d.get("user_id", "default") == user_id)
+        return TransactionBatch.from_records(raw)
+
+    def totals(self, user_id: str | None = None) -> dict[str, int]:
+        """Lê os contadores mantidos por ``BalanceCounters`` (sem varrer o histórico)."""
+        if not self._maintains(BalanceCounters):
+            return super().totals(user_id)
+        return BalanceCounters.totals(self._cached_section(BalanceCounters.section), user_id)
+
+    def rollup(self, user_id: str) -> dict:
+        """Lê os totais mensais mantidos por ``MonthlyRollup``."""
+        if not self._maintains(MonthlyRollup):
+            return super().rollup(user_id)
+        return self._cached_section(MonthlyRollup.section).get(user_id, {})
+
+    def spending(self, user_id: str) -> dict:
+        """Lê as estatísticas mensais mantidas por ``SpendingStats``."""
+        if not self._maintains(SpendingStats):
+            return super().spending(user_id)
+        return self._cached_section(SpendingStats.section).get(user_id, {})
+
+    def range_index(self, user_id: str) -> RangeIndex:
+        """
+        Índice montado a partir da seção ``daily``.
+
+        Fica em memória até o arquivo mudar; a montagem custa O(dias).
+        """
+        if not self._maintains(DailyBuckets):
+            return super().range_index(user_id)
+        daily = self._cached_section(DailyBuckets.section)
+        cached = self._index_cache.get(user_id)
+        if cached is None or cached[0] is not daily:
+            cached = (daily, RangeIndex(daily.get(user_id, {})))
+            self._index_cache[user_id] = cached
+        return cached[1]
+
+    def version(self, user_id: str) -> str | None:
+        """Muda a cada escrita que envolve o usuário; custa um ``stat`` se nada mudou."""
+        if not self._maintains(DataVersions):
+            return None
+        return DataVersions.version(self._cached_section(DataVersions.section), user_id)
+
     def by_id(self, id: str) -> Optional[Transaction]:
         return next((tx for tx in self.list() if tx.id == id), None)
 
+    # ---- escrita ----
+
     def add(self, tx: Transaction) -> None:
-        items = self.list()
-        items.append(tx)
-        self.storage.save_all([t.to_dict() for t in items])
+        doc = self._load()
+        record = tx.to_dict()
+        doc["transactions"].append(record)
+        self._commit(doc, added=[record])
+
+    def add_many(self, txs: Iterable[Transaction]) -> None:
+        """Adiciona todas as transações com uma única gravação do arquivo."""
+        records = [tx.to_dict() for tx in txs]
+        if not records:
+            return
+        doc = self._load()
+        doc["transactions"].extend(records)
+        self._commit(doc, added=records)
+
+    def update(self, tx: Transaction) -> bool:
+        doc = self._load()
+        for i, record in enumerate(doc["transactions"]):
+            if record["id"] == tx.id:
+                new_record = tx.to_dict()
+                doc["transactions"][i] = new_record
+                self._commit(doc, added=[new_record], removed=[record])
+                return True
+        return False
 
     def remove(self, id: str) -> bool:
-        items = self.list()
-        after = [t for t in items if t.id != id]
-        self.storage.save_all([t.to_dict() for t in after])
-        return len(after) != len(items)
+        doc = self._load()
+        removed = [d for d in doc["transactions"] if d["id"] == id]
+        if not removed:
+            return False
+        doc["transactions"] = [d for d in doc["transactions"] if d["id"] != id]
+        self._commit(doc, removed=removed)
+        return True
 
     def replace_all(self, items: Iterable[Transaction]) -> None:
-        self.storage.save_all([t.to_dict() for t in items])
+        records = [t.to_dict() for t in items]
+        doc = {"transactions": records}
+        for agg in self.aggregates:
+            doc[agg.section] = agg.rebuild(records)
+        self.storage.save_document(doc)
+        self._remember(doc)
@@ -0,0 +1,350 @@
+"""
+Rentabilidade dos investimentos a partir dos aportes e resgates registrados.
+
+Para cada investimento e para a carteira do usuário são calculados:
+
+- **XIRR** (retorno ponderado pelo dinheiro): a taxa anual que zera o valor
+  presente dos fluxos — valor inicial e aportes como saídas, resgates e o
+  valor atual (na data da última atualização) como entradas —, somados por
+  dia e com anos de 365 dias, como o XIRR das planilhas. Todas as equações
+  do usuário são resolvidas juntas por Newton vetorizado (NumPy quando
+  disponível); as que não convergem caem numa bissecção com as avaliações
+  do VPL em cache.
+- **TWR** (retorno ponderado pelo tempo): o produto dos retornos de cada
+  subperíodo entre movimentos, ``valor antes do movimento ÷ valor depois do
+  movimento anterior``, o que neutraliza o efeito do tamanho e do momento dos
+  aportes. Na carteira, os subperíodos são os dias em que alguma posição tem
+  registro; o valor de cada posição entre dois registros é interpolado
+  geometricamente e, depois da última atualização, fica constante.
+
+Os resultados ficam em memória por usuário e só são recalculados quando a
+versão dos investimentos (``IInvestmentRepository.version``) ou o dia mudam;
+cada chamada recebe a sua cópia.
+"""
+
+from __future__ import annotations
+import copy
+import math
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Sequence
+from .batch import np
+from .investment_models import Investment
+from .investment_repository import IInvestmentRepository
+
+DAYS_PER_YEAR = 365.0
+_GUESS = 0.1
+_TOLERANCE = 1e-10
+# Resíduo aceito do VPL, relativo ao maior fluxo (evita "convergir" num passo minúsculo longe da raiz)
+_RESIDUAL = 1e-9
+_NEWTON_STEPS = 50
+_BISECTION_STEPS = 200
+# Taxa anual mínima (-100% exclusive) e máxima procuradas
+_MIN_RATE = -0.999999
+_MAX_RATE = 1e3
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _years(start: datetime, end: datetime) -> float:
+    return (end - start).total_seconds() / 86_400 / DAYS_PER_YEAR
+
+
+def _npv(rate: float, times: Sequence[float], amounts: Sequence[float]) -> float:
+    return sum(a * (1.0 + rate) ** -t for t, a in zip(times, amounts))
+
+
+def _solvable(amounts: Sequence[float]) -> bool:
+    # Sem fluxos de sinais opostos não existe taxa que zere o VPL
+    return any(a > 0 for a in amounts) and any(a < 0 for a in amounts)
+
+
+def _newton(problems: List[tuple[list, list]], use_numpy: bool) -> List[float | None]:
+    """Newton em todas as equações ao mesmo tempo; None onde não convergiu."""
+    if use_numpy:
+        width = max(len(t) for t, _ in problems)
+        times = np.zeros((len(problems), width))
+        amounts = np.zeros((len(problems), width))
+        for i, (t, a) in enumerate(problems):
+            times[i, :len(t)] = t
+            amounts[i, :len(a)] = a
+
+        scale = np.abs(amounts).max(axis=1) * _RESIDUAL
+        rates = np.full(len(problems), _GUESS)
+        done = np.zeros(len(problems), dtype=bool)
+        # Cada passo só calcula as equações ainda abertas
+        active = np.arange(len(problems))
+        with np.errstate(all="ignore"):
+            for _ in range(_NEWTON_STEPS):
+                current = rates[active]
+                base = (1.0 + current)[:, None]
+                discount = base ** -times[active]
+                weighted = amounts[active] * discount
+                value = weighted.sum(axis=1)
+                slope = (-times[active] * weighted / base).sum(axis=1)
+                step = value / slope
+                following = current - step
+                # Passo que sairia do domínio (taxa <= -100%): vai até o meio do caminho
+                following = np.where(following <= -1.0, (current - 1.0) / 2, following)
+                converged = (np.abs(step) < _TOLERANCE) & (np.abs(value) <= scale[active])
+                rates[active] = following
+                done[active] = converged
+                active = active[~converged & np.isfinite(following)]
+                if not active.size:
+                    break
+        return [float(r) if ok and math.isfinite(r) else None for r, ok in zip(rates.tolist(), done.tolist())]
+
+    results: List[float | None] = []
+    for times, amounts in problems:
+        scale = max(abs(a) for a in amounts) * _RESIDUAL
+        rate = _GUESS
+        result = None
+        for _ in range(_NEWTON_STEPS):
+            try:
+                value = _npv(rate, times, amounts)
+                slope = sum(-t * a * (1.0 + rate) ** (-t - 1) for t, a in zip(times, amounts))
+                step = value / slope
+            except (OverflowError, ZeroDivisionError):
+                break
+            following = rate - step
+            rate = (rate - 1.0) / 2 if following <= -1.0 else following
+            if abs(step) < _TOLERANCE and abs(value) <= scale:
+                result = rate
+                break
+        results.append(result if result is not None and math.isfinite(result) else None)
+    return results
+
+
+def _bisection(times: Sequence[float], amounts: Sequence[float]) -> float | None:
+    """Bissecção com as avaliações do VPL em cache (a busca do intervalo e a bissecção as reaproveitam)."""
+    horizon = max(times)
+
+    @lru_cache(maxsize=None)
+    def npv(rate: float) -> float:
+        # VPL levado ao último fluxo: mesmo sinal, sem estourar com taxas perto de -100%
+        try:
+            return sum(a * (1.0 + rate) ** (horizon - t) for t, a in zip(times, amounts))
+        except OverflowError:
+            return math.nan
+
+    low, high = _MIN_RATE, 1.0
+    while not npv(low) * npv(high) <= 0:
+        if high >= _MAX_RATE:
+            return None
+        high = min(high * 4, _MAX_RATE)
+    for _ in range(_BISECTION_STEPS):
+        middle = (low + high) / 2
+        if npv(low) * npv(middle) <= 0:
+            high = middle
+        else:
+            low = middle
+        if high - low < _TOLERANCE:
+            break
+    return (low + high) / 2
+
+
+def xirr_many(problems: List[tuple[Sequence[float], Sequence[float]]], use_numpy: bool | None = None) -> List[float | None]:
+    """
+    Resolve várias equações de XIRR de uma vez.
+
+    Args:
+        problems: Pares ``(tempos em anos, valores)``; saídas negativas,
+            entradas positivas
+        use_numpy: Força (ou desliga) o caminho NumPy; padrão: usar se instalado
+
+    Returns:
+        Taxa anual de cada equação, ou None quando não há solução (fluxos sem
+        entradas e saídas, ou sem raiz no intervalo procurado)
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    use_numpy = use_numpy and np is not None
+
+    results: List[float | None] = [None] * len(problems)
+    pending = [i for i, (_, amounts) in enumerate(problems) if _solvable(amounts)]
+    if pending:
+        found = _newton([(list(problems[i][0]), list(problems[i][1])) for i in pending], use_numpy)
+        for i, rate in zip(pending, found):
+            results[i] = rate if rate is not None else _bisection(tuple(problems[i][0]), tuple(problems[i][1]))
+    return results
+
+
+class _Path:
+    """
+    Valores registrados de uma posição, com datas em dias (ordinais).
+
+    O segmento ``k`` vai de ``starts[k]`` (valor ``after[k]``, logo depois do
+    movimento) a ``ends[k]`` (valor ``before[k]``, logo antes do seguinte).
+    """
+
+    __slots__ = ("starts", "ends", "after", "before")
+
+    def __init__(self, investment: Investment, end: datetime):
+        starts = [_utc(investment.start_date).toordinal()]
+        after = [float(investment.initial_amount.cents)]
+        ends, before = [], []
+        for flow in investment.cash_flows:
+            day = _utc(flow.date).toordinal()
+            ends.append(day)
+            before.append(float(flow.balance_before.cents))
+            starts.append(day)
+            after.append(float(flow.balance_before.cents + flow.amount.cents))
+        ends.append(end.toordinal())
+        before.append(float(investment.current_amount.cents))
+        self.starts, self.ends, self.after, self.before = starts, ends, after, before
+
+    def twr(self) -> float | None:
+        """Retorno acumulado da posição: produto dos retornos dos segmentos."""
+        growth = 1.0
+        linked = False
+        for a, b in zip(self.after, self.before):
+            if a > 0:
+                growth *= b / a
+                linked = True
+        return growth - 1.0 if linked else None
+
+    def value(self, day: int, before: bool) -> float:
+        """Valor no dia: antes ou depois dos movimentos do dia; geométrico dentro de cada segmento."""
+        if day < self.starts[0] or (day == self.starts[0] and before):
+            return 0.0
+        if day > self.ends[-1]:
+            return self.before[-1]
+        k = (bisect_left if before else bisect_right)(self.starts, day) - 1
+        start, end, a = self.starts[k], self.ends[k], self.after[k]
+        if a <= 0 or end <= start:
+            return a
+        return a * (self.before[k] / a) ** ((day - start) / (end - start))
+
+    def values(self, days, before: bool):
+        """``value`` para um array de dias de uma vez (NumPy)."""
+        starts = np.asarray(self.starts, dtype=np.float64)
+        ends = np.asarray(self.ends, dtype=np.float64)
+        after = np.asarray(self.after)
+        k = np.searchsorted(starts, days, side="left" if before else "right") - 1
+        index = np.maximum(k, 0)
+        start, end, a = starts[index], ends[index], after[index]
+        with np.errstate(all="ignore"):
+            grown = a * (np.asarray(self.before)[index] / a) ** ((days - start) / (end - start))
+        result = np.where((a <= 0) | (end <= start), a, grown)
+        result = np.where(days > ends[-1], self.before[-1], result)
+        return np.where(k < 0, 0.0, result)
+
+
+def _portfolio_twr(paths: List[_Path], use_numpy: bool) -> float | None:
+    """Retorno acumulado da carteira, encadeando os dias em que alguma posição tem registro."""
+    days = sorted({day for path in paths for day in path.starts + path.ends})
+    if use_numpy:
+        grid = np.asarray(days, dtype=np.float64)
+        invested = sum(path.values(grid, before=False) for path in paths).tolist()
+        reached = sum(path.values(grid, before=True) for path in paths).tolist()
+    else:
+        invested = [sum(path.value(day, before=False) for path in paths) for day in days]
+        reached = [sum(path.value(day, before=True) for path in paths) for day in days]
+
+    growth = 1.0
+    linked = False
+    for a, b in zip(invested, reached[1:]):
+        if a > 0:
+            growth *= b / a
+            linked = True
+    return growth - 1.0 if linked else None
+
+
+class ReturnsService:
+    """XIRR e TWR por investimento e da carteira, com cache por versão dos dados."""
+
+    def __init__(self, repo: IInvestmentRepository, cache_size: int = 256, use_numpy: bool | None = None):
+        self.repo = repo
+        self.cache_size = cache_size
+        self.use_numpy = use_numpy
+        self._cache: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+
+    def returns(self, user_id: str, now: datetime | None = None) -> dict:
+        """
+        Rentabilidade dos investimentos do usuário.
+
+        O valor atual de um investimento vale na data de ``last_accrued_at``
+        (ou do último movimento, se posterior); sem essa data, vale ``now``.
+
+        Args:
+            user_id: ID do usuário
+            now: Instante de referência (padrão: agora, em UTC)
+
+        Returns:
+            ``{"portfolio": {...}, "investments": {id: {...}}}``, cada um com
+            ``xirr`` (taxa anual), ``twr`` (retorno acumulado no período),
+            ``twr_annualized`` (só para períodos de um ano ou mais), ``start``
+            e ``end``; taxas indefinidas vêm como None
+        """
+        now = _utc(now or datetime.now(timezone.utc))
+        version = self.repo.version(user_id)
+        key = (version, now.date())
+        if version is not None:
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[0] == key:
+                self._cache.move_to_end(user_id)
+                return copy.deepcopy(cached[1])
+
+        result = self._compute(self.repo.list_by_user(user_id), now)
+
+        if version is not None:
+            self._cache[user_id] = (key, copy.deepcopy(result))
+            self._cache.move_to_end(user_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _compute(self, investments: List[Investment], now: datetime) -> dict:
+        flows: List[List[tuple[datetime, float]]] = []
+        paths: List[_Path] = []
+        for inv in investments:
+            end = max([_utc(inv.last_accrued_at) if inv.last_accrued_at else now]
+                      + [_utc(flow.date) for flow in inv.cash_flows])
+            events = [(_utc(inv.start_date), -float(inv.initial_amount.cents))]
+            events += [(_utc(flow.date), -float(flow.amount.cents)) for flow in inv.cash_flows]
+            events.append((end, float(inv.current_amount.cents)))
+            flows.append(events)
+            paths.append(_Path(inv, end))
+
+        # Uma equação por investimento e uma para a carteira, resolvidas juntas
+        groups = flows + ([[event for events in flows for event in events]] if flows else [])
+        rates = xirr_many([self._daily(events) for events in groups], self.use_numpy)
+
+        summaries: Dict[str, dict] = {}
+        for inv, events, path, rate in zip(investments, flows, paths, rates):
+            summaries[inv.id] = self._summary(rate, path.twr(), events[0][0], events[-1][0])
+
+        portfolio = self._summary(None, None, None, None)
+        if investments:
+            start = min(events[0][0] for events in flows)
+            end = max(events[-1][0] for events in flows)
+            use_numpy = np is not None if self.use_numpy is None else (self.use_numpy and np is not None)
+            portfolio = self._summary(rates[-1], _portfolio_twr(paths, use_numpy), start, end)
+        return {"portfolio": portfolio, "investments": summaries}
+
+    @staticmethod
+    def _daily(events: List[tuple[datetime, float]]) -> tuple[list, list]:
+        """Fluxos somados por dia, em anos desde o primeiro dia (como o XIRR das planilhas)."""
+        by_day: Dict = {}
+        for t, amount in events:
+            by_day[t.date()] = by_day.get(t.date(), 0.0) + amount
+        origin = min(by_day)
+        return [(day - origin).days / DAYS_PER_YEAR for day in by_day], list(by_day.values())
+
+    @staticmethod
+    def _summary(xirr: float | None, twr: float | None, start: datetime | None, end: datetime | None) -> dict:
+        years = _years(start, end) if start and end else 0.0
+        annualized = None
+        if twr is not None and years >= 1 and twr > -1:
+            annualized = (1.0 + twr) ** (1.0 / years) - 1.0
+        return {
+            "xirr": xirr,
+            "twr": twr,
+            "twr_annualized": annualized,
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+        }
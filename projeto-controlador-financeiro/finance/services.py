@@ -1,7 +1,8 @@
 from __future__ import annotations
-from collections import defaultdict
 from datetime import datetime, timezone
+from .batch import TransactionBatch
 from .models import Transaction, Money, Category
+from .range_index import is_day_aligned
 from .repository import ITransactionRepository
 
 class FinanceService:
@@ -27,17 +28,63 @@ class FinanceService:
     def remove(self, id: str) -> bool:
         return self.repo.remove(id)
 
-    def balance(self, user_id: str | None = None) -> Money:
-        total = Money(0)
-        transactions = self.repo.list_by_user(user_id) if user_id else self.repo.list()
-        for tx in transactions:
-            total = total + tx.signed_amount
-        return total
-
-    def report(self, group_by: str = "category", user_id: str | None = None) -> dict[str, Money]:
-        groups: dict[str, Money] = defaultdict(lambda: Money(0))
-        transactions = self.repo.list_by_user(user_id) if user_id else self.repo.list()
-        for tx in transactions:
-            key = tx.category.name if group_by == "category" else tx.occurred_at.strftime("%Y-%m")
-            groups[key] = groups[key] + tx.signed_amount
-        return dict(groups)
+    def batch(self, user_id: str | None = None) -> TransactionBatch:
+        """Transações em formato colunar para agregações vetorizadas."""
+        return self.repo.batch_by_user(user_id)
+
+    def balance(self, user_id: str | None = None, batch: TransactionBatch | None = None) -> Money:
+        if batch is not None:
+            return Money.from_cents(batch.sum())
+        # Sem filtros: contadores mantidos pelo repositório, O(1)
+        return Money.from_cents(self.repo.totals(user_id)["balance"])
+
+    def totals(self, user_id: str | None = None) -> dict[str, Money]:
+        """Receitas, despesas e saldo a partir dos contadores do repositório."""
+        counters = self.repo.totals(user_id)
+        return {key: Money.from_cents(counters[key]) for key in ("income", "expense", "balance")}
+
+    def range_totals(self, user_id: str, start: datetime | None = None, end: datetime | None = None) -> dict[str, Money]:
+        """
+        Receitas, despesas e saldo entre ``start`` e ``end`` (inclusivos).
+
+        Intervalos de dias inteiros saem do índice diário do repositório em
+        O(log dias); horários quebrados caem no batch colunar.
+        """
+        if is_day_aligned(start, end):
+            counters = self.repo.range_index(user_id).totals(start, end)
+        else:
+            batch = self.batch(user_id).select(start=start, end=end)
+            income = batch.select(type="income").sum()
+            expense = -batch.select(type="expense").sum()
+            counters = {"income": income, "expense": expense, "balance": income - expense}
+        return {key: Money.from_cents(counters[key]) for key in ("income", "expense", "balance")}
+
+    def balance_series(
+        self,
+        user_id: str,
+        granularity: str = "day",
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[str, list]:
+        """
+        Saldo acumulado por dia, semana ou mês (ver ``RangeIndex.series``).
+
+        Sai do índice diário do repositório: uma busca binária por período,
+        sem percorrer as transações.
+        """
+        return self.repo.range_index(user_id).series(granularity, start, end)
+
+    def report(
+        self,
+        group_by: str = "category",
+        user_id: str | None = None,
+        batch: TransactionBatch | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[str, Money]:
+        key = "category" if group_by == "category" else "month"
+        if batch is None and key == "month" and user_id and is_day_aligned(start, end):
+            months = self.repo.range_index(user_id).by_month(start, end)
+            return {name: Money.from_cents(totals["balance"]) for name, totals in months.items()}
+        batch = batch if batch is not None else self.batch(user_id).select(start=start, end=end)
+        return {name: Money.from_cents(total) for name, total in batch.group_by(key).items()}
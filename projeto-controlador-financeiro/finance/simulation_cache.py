@@ -0,0 +1,188 @@
+"""
+Cache de resultados de simulação endereçado por conteúdo.
+
+Simulações são funções puras dos parâmetros: a chave é o SHA-256 do tipo de
+simulação mais os parâmetros normalizados, serializados em JSON canônico.
+Os resultados (já convertidos para dict) ficam num LRU em memória com limite
+de entradas e tempo de vida; opcionalmente também num diretório, um arquivo
+JSON por chave, para sobreviverem a reinícios do processo.
+
+``stats()`` expõe acertos, faltas, remoções e a taxa de acerto.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+# Varre o diretório (expirados e excesso) a cada tantas gravações
+_PRUNE_EVERY = 64
+
+
+def cache_key(kind: str, params: dict) -> str:
+    """Chave do resultado: hash do tipo e dos parâmetros em JSON canônico."""
+    text = json.dumps([kind, params], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SimulationCache:
+    """LRU com TTL em memória e camada opcional em disco."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl: float = 3600,
+        directory: str | os.PathLike | None = None,
+        max_disk_entries: int = 4096,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = Path(directory).absolute() if directory else None
+        self.max_disk_entries = max_disk_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_or_compute(self, kind: str, params: dict, compute: Callable[[], Any]) -> Any:
+        """
+        Devolve o resultado em cache ou calcula, guarda e devolve.
+
+        Args:
+            kind: Tipo da simulação (faz parte da chave)
+            params: Parâmetros já normalizados (valores JSON)
+            compute: Função sem argumentos que produz o resultado serializável
+
+        Returns:
+            O resultado; o mesmo objeto é devolvido a cada acerto, então não
+            deve ser alterado pelo chamador
+        """
+        key = cache_key(kind, params)
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, entry[1]
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self._counters["misses"] += 1
+                return False, None
+            self._counters["disk_hits"] += 1
+            self._store(key, entry)
+        return True, entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        entry = (self.clock() + self.ttl, value)
+        with self._lock:
+            self._store(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Contadores do cache e taxa de acerto (memória + disco)."""
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+        lookups = counters["hits"] + counters["disk_hits"] + counters["misses"]
+        hits = counters["hits"] + counters["disk_hits"]
+        return {
+            **counters,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "disk": str(self.directory) if self.directory else None,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _store(self, key: str, entry: tuple[float, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> tuple[float, Any] | None:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                expires_at, value = json.load(f)
+        except (OSError, ValueError):
+            # Ausente, ilegível ou gravado pela metade: trata como falta
+            return None
+        if expires_at <= now:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._counters["expirations"] += 1
+            return None
+        return expires_at, value
+
+    def _write_disk(self, key: str, entry: tuple[float, Any]) -> None:
+        if not self.directory:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=key, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(list(entry), ensure_ascii=False, separators=(",", ":")))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % _PRUNE_EVERY == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Remove arquivos expirados (pela data de gravação) e os mais antigos além do limite."""
+        files = []
+        oldest_valid = self.clock() - self.ttl
+        for path in self.directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime <= oldest_valid:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((mtime, path))
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_disk_entries)]:
+            path.unlink(missing_ok=True)
@@ -1,16 +1,260 @@
 """
 Serviço para simulação de investimentos.
 Baseado nas planilhas de simulação fornecidas.
+
+A simulação com aporte fixo tem três modos:
+
+- ``exact``: mês a mês com ``Money``/``Decimal``, arredondando o rendimento de
+  cada mês para centavos (o comportamento das planilhas);
+- ``fast``: mesma projeção mês a mês em ponto flutuante (vetorizada com NumPy
+  quando disponível), sem o arredondamento mensal;
+- ``summary``: só os totais, pela fórmula fechada da série de pagamentos
+  (anuidade), em O(1).
+
+``fast`` e ``summary`` diferem de ``exact`` apenas pelo arredondamento mensal
+do rendimento, que no modo exato desloca o saldo em até meio centavo por mês,
+capitalizado nos meses seguintes. A diferença no saldo do mês ``n`` fica
+limitada a ``0,005 × ((1 + taxa)^n − 1) / taxa`` reais (``0,005 × n`` com taxa
+zero), mais o erro de ponto flutuante do modo ``fast`` (relativo, da ordem de
+``n × 1e-16``).
+
+``PrecisionPolicy`` escolhe entre ``exact`` e ``fast`` para os métodos do
+serviço: com ``max_drift_cents``, o modo rápido só é usado quando esse limite
+teórico cabe na tolerância, e o cálculo volta ao exato nos prazos longos.
+``finance.precision_check`` mede a deriva real e compara o tempo dos modos.
 """
 
 from __future__ import annotations
-from typing import List, Dict
+import math
+from typing import Dict, Iterable, Iterator, List, Tuple
 from dataclasses import dataclass
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import repeat
+from .batch import np
+from .investment_models import Investment
 from .models import Money
+from .monte_carlo import ReturnModel, run_monte_carlo
+
+SIMULATION_MODES = ("exact", "fast", "summary")
+GRID_AXES = ("initial_amount", "monthly_contribution", "monthly_rate", "months")
+MAX_GRID_CELLS = 1_000_000
+MAX_GRID_CURVES = 100
+GOAL_SEEK_TARGETS = ("contribution", "rate", "months")
+# Prazo máximo (meses) das simulações; o goal-seek procura prazos até esse limite
+MAX_SIMULATION_MONTHS = 1200
+MAX_GOAL_MONTHS = MAX_SIMULATION_MONTHS
+# Saldos em centavos precisam caber em int64 (NumPy) e ficar finitos em float
+_MAX_BALANCE_CENTS = 2.0 ** 63
+_BALANCE_TOO_LARGE = "Saldo projetado grande demais para simular"
+# Busca da taxa: intervalo inicial, teto da expansão e tolerância da bissecção
+_RATE_BRACKET = (-0.99, 0.01)
+_MAX_RATE = 10.0
+_RATE_TOLERANCE = 1e-12
+
+
+@dataclass(frozen=True, slots=True)
+class PrecisionPolicy:
+    """
+    Política de precisão das simulações.
+
+    ``mode`` é "exact" ou "fast". Com ``max_drift_cents``, o modo rápido só é
+    usado quando ``rounding_error_bound`` do prazo (em centavos) não passa
+    desse valor; caso contrário a simulação roda no modo exato.
+    """
+    mode: str = "exact"
+    max_drift_cents: int | None = None
+
+    def __post_init__(self):
+        if self.mode not in ("exact", "fast"):
+            raise ValueError('A política de precisão deve ser "exact" ou "fast"')
+        if self.max_drift_cents is not None and self.max_drift_cents < 0:
+            raise ValueError("max_drift_cents não pode ser negativo")
+
+    def resolve(self, monthly_rate: float, months: int) -> str:
+        """Modo efetivo ("exact" ou "fast") para uma taxa e um prazo."""
+        if self.mode == "fast" and self.max_drift_cents is not None:
+            try:
+                bound = rounding_error_bound(monthly_rate, months)
+            except ArithmeticError:
+                # (1 + taxa)^meses além do expoente máximo do Decimal: deriva sem limite útil
+                return "exact"
+            if bound * 100 > self.max_drift_cents:
+                return "exact"
+        return self.mode
+
+    def to_key(self) -> list:
+        """Representação JSON, para chaves de cache."""
+        return [self.mode, self.max_drift_cents]
+
+
+EXACT = PrecisionPolicy("exact")
+FAST = PrecisionPolicy("fast")
+
+
+def rounding_error_bound(monthly_rate: float, months: int) -> Decimal:
+    """
+    Diferença máxima, em reais, entre o saldo final exato e o de ``fast``/``summary``.
+
+    Args:
+        monthly_rate: Taxa de rendimento mensal (decimal)
+        months: Número de meses simulados
+
+    Returns:
+        Limite superior da diferença causada pelo arredondamento mensal
+    """
+    rate = Decimal(str(monthly_rate))
+    if rate == 0:
+        return Decimal("0.005") * months
+    return Decimal("0.005") * ((1 + rate) ** months - 1) / rate
+
+
+def _check_projection(initial_cents: int, contribution_cents: int, monthly_rate: float, months: int) -> None:
+    """Rejeita prazos acima do limite e saldos que não cabem em centavos int64."""
+    if months < 0:
+        raise ValueError("months não pode ser negativo")
+    if months > MAX_SIMULATION_MONTHS:
+        raise ValueError(f"months deve ser no máximo {MAX_SIMULATION_MONTHS}")
+    # O saldo é monótono no prazo: basta conferir o final
+    try:
+        final = _closed_form_balance(initial_cents, contribution_cents, monthly_rate, months)
+    except OverflowError:
+        final = math.inf
+    if not abs(final) < _MAX_BALANCE_CENTS:
+        raise ValueError(_BALANCE_TOO_LARGE)
+
+
+def _fast_balances(initial_cents: int, contribution_cents: int, monthly_rate: float, months: int,
+                   use_numpy: bool | None = None) -> List[float]:
+    """Saldos (em centavos, float) dos meses 0..``months`` sem arredondamento mensal."""
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is not None:
+        # Saldo[n] = P·(1+r)^n + A·((1+r)^n − 1)/r, calculado para todos os meses de uma vez
+        growth = np.power(1.0 + monthly_rate, np.arange(months + 1, dtype=np.float64))
+        if monthly_rate:
+            annuity = (growth - 1.0) / monthly_rate
+        else:
+            annuity = np.arange(months + 1, dtype=np.float64)
+        return (initial_cents * growth + contribution_cents * annuity).tolist()
 
+    factor = 1.0 + monthly_rate
+    balance = float(initial_cents)
+    balances = [balance]
+    for _ in range(months):
+        balance = balance * factor + contribution_cents
+        balances.append(balance)
+    return balances
 
-@dataclass
+
+def _exact_balances(initial_cents: int, contributions: Iterable[int], rate: Decimal) -> Iterator[int]:
+    """
+    Saldos (centavos) dos meses 1..n no modo exato, gerados um a um.
+
+    Mesma regra de ``Money``: o rendimento do mês é arredondado para centavos
+    (metade para cima) antes de somar o aporte, só que em inteiros.
+    """
+    balance = initial_cents
+    one = Decimal(1)
+    for contribution in contributions:
+        balance += int((balance * rate).quantize(one, rounding=ROUND_HALF_UP)) + contribution
+        yield balance
+
+
+def _portfolio_balances(initials: List[int], contributions: List[int], rates: List[float], months: int,
+                        use_numpy: bool | None = None) -> List[List[int]]:
+    """Saldos (centavos) dos meses 0..``months`` de cada posição, uma linha por posição."""
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is not None:
+        # Matriz posições × meses: uma taxa por linha, um expoente por coluna
+        p = np.asarray(initials, dtype=np.float64)[:, None]
+        a = np.asarray(contributions, dtype=np.float64)[:, None]
+        r = np.asarray(rates, dtype=np.float64)[:, None]
+        n = np.arange(months + 1, dtype=np.float64)[None, :]
+        growth = np.power(1.0 + r, n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annuity = np.where(r == 0, n, (growth - 1.0) / np.where(r == 0, 1.0, r))
+        return np.rint(p * growth + a * annuity).astype(np.int64).tolist()
+    return [
+        [round(b) for b in _fast_balances(initial, contribution, rate, months, use_numpy=False)]
+        for initial, contribution, rate in zip(initials, contributions, rates)
+    ]
+
+
+def _closed_form_balance(initial: float, contribution: float, rate: float, months: int) -> float:
+    """Saldo final sem arredondamento mensal: P·(1+r)^n + A·((1+r)^n − 1)/r."""
+    if rate == 0:
+        return initial + contribution * months
+    growth = (1.0 + rate) ** months
+    return initial * growth + contribution * (growth - 1.0) / rate
+
+
+def _float_balances(initial_cents: int, contributions: Iterable[int], rate: float) -> Iterator[int]:
+    """Saldos (centavos) dos meses 1..n em ponto flutuante, sem arredondamento mensal."""
+    balance = float(initial_cents)
+    factor = 1.0 + rate
+    for contribution in contributions:
+        balance = balance * factor + contribution
+        yield round(balance)
+
+
+def _exact_final(initial_cents: int, contribution_cents: int, rate: float, months: int) -> int:
+    """Saldo final (centavos) do modo exato."""
+    final = initial_cents
+    for final in _exact_balances(initial_cents, repeat(contribution_cents, months), Decimal(str(rate))):
+        pass
+    return final
+
+
+def _keep(month: int, every: int, last: int) -> bool:
+    """Dizimação: mantém os meses múltiplos de ``every`` e sempre o último."""
+    return month % every == 0 or month == last
+
+
+def _grid_balances(initials: List[int], contributions: List[int], rates: List[float], horizons: List[int],
+                   use_numpy: bool | None = None) -> List[int]:
+    """
+    Saldos finais (centavos) de todas as combinações, em ordem row-major
+    ``initial × contribution × rate × months``.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is not None:
+        # Eixos com broadcasting: (P, 1, 1, 1), (1, A, 1, 1), (1, 1, R, 1) e (1, 1, 1, N)
+        p = np.asarray(initials, dtype=np.float64)[:, None, None, None]
+        a = np.asarray(contributions, dtype=np.float64)[None, :, None, None]
+        r = np.asarray(rates, dtype=np.float64)[None, None, :, None]
+        n = np.asarray(horizons, dtype=np.float64)[None, None, None, :]
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            growth = np.power(1.0 + r, n)
+            annuity = np.where(r == 0, n, (growth - 1.0) / np.where(r == 0, 1.0, r))
+            balances = p * growth + a * annuity
+        # inf/NaN ou além do int64 virariam lixo no astype
+        if not np.all(np.abs(balances) < _MAX_BALANCE_CENTS):
+            raise ValueError(_BALANCE_TOO_LARGE)
+        return np.rint(balances).astype(np.int64).ravel().tolist()
+
+    # Fator de crescimento e de anuidade dependem só de (taxa, prazo)
+    factors = []
+    try:
+        for rate in rates:
+            for months in horizons:
+                growth = (1.0 + rate) ** months
+                factors.append((growth, (growth - 1.0) / rate if rate else float(months)))
+    except OverflowError:
+        raise ValueError(_BALANCE_TOO_LARGE) from None
+    balances = [
+        initial * growth + contribution * annuity
+        for initial in initials
+        for contribution in contributions
+        for growth, annuity in factors
+    ]
+    if not all(abs(balance) < _MAX_BALANCE_CENTS for balance in balances):
+        raise ValueError(_BALANCE_TOO_LARGE)
+    return [round(balance) for balance in balances]
+
+
+@dataclass(slots=True)
 class MonthlyProjection:
     """Representa a projeção de um mês específico."""
     month: int
@@ -19,7 +263,7 @@ class MonthlyProjection:
     profit: Money
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     """Resultado completo de uma simulação."""
     initial_amount: Money
@@ -30,8 +274,10 @@ class SimulationResult:
     final_balance: Money
     total_profit: Money
     
-    def to_dict(self) -> dict:
-        """Serializa resultado da simulação."""
+    def to_dict(self, every: int = 1) -> dict:
+        """Serializa resultado da simulação (``every`` > 1 dizima os meses, como em ``to_columns``)."""
+        if every < 1:
+            raise ValueError("every deve ser positivo")
         return {
             "initial_amount": str(self.initial_amount.amount),
             "monthly_rate": self.monthly_rate,
@@ -44,12 +290,41 @@ class SimulationResult:
                     "profit": str(p.profit.amount)
                 }
                 for p in self.projections
+                if every == 1 or _keep(p.month, every, self.total_months)
             ],
             "total_contributed": str(self.total_contributed.amount),
             "final_balance": str(self.final_balance.amount),
             "total_profit": str(self.total_profit.amount)
         }
 
+    def to_columns(self, every: int = 1) -> dict:
+        """
+        Serializa em colunas: listas paralelas de centavos inteiros, um item por mês.
+
+        Args:
+            every: Mantém só um mês a cada ``every`` (o último mês sempre entra)
+
+        Returns:
+            ``{"initial_amount", "monthly_rate", "total_months", "month",
+            "contribution", "accumulated_balance", "profit",
+            "total_contributed", "final_balance", "total_profit"}``, valores em centavos
+        """
+        if every < 1:
+            raise ValueError("every deve ser positivo")
+        kept = [p for p in self.projections if _keep(p.month, every, self.total_months)]
+        return {
+            "initial_amount": self.initial_amount.cents,
+            "monthly_rate": self.monthly_rate,
+            "total_months": self.total_months,
+            "month": [p.month for p in kept],
+            "contribution": [p.contribution.cents for p in kept],
+            "accumulated_balance": [p.accumulated_balance.cents for p in kept],
+            "profit": [p.profit.cents for p in kept],
+            "total_contributed": self.total_contributed.cents,
+            "final_balance": self.final_balance.cents,
+            "total_profit": self.total_profit.cents
+        }
+
 
 class SimulationService:
     """Serviço para simular investimentos."""
@@ -59,7 +334,9 @@ class SimulationService:
         initial_amount: float | str,
         monthly_contribution: float | str,
         monthly_rate: float,
-        months: int
+        months: int,
+        mode: str | None = None,
+        precision: PrecisionPolicy | None = None
     ) -> SimulationResult:
         """
         Simula investimento com aporte mensal fixo.
@@ -71,61 +348,505 @@ class SimulationService:
             initial_amount: Valor inicial investido
             monthly_contribution: Aporte mensal fixo
             monthly_rate: Taxa de rendimento mensal (decimal, ex: 0.008 = 0.8%)
-            months: Número de meses a simular
+            months: Número de meses a simular (até ``MAX_SIMULATION_MONTHS``)
+            mode: "exact", "fast" ou "summary" (ver o docstring do módulo);
+                em "summary" a lista de projeções vem vazia. Se omitido, vem
+                de ``precision``
+            precision: Política de precisão (padrão: exata)
         
         Returns:
             SimulationResult: Resultado completo da simulação
         """
         initial = Money(initial_amount)
         contribution = Money(monthly_contribution)
-        
+        _check_projection(initial.cents, contribution.cents, monthly_rate, months)
+        if mode is None:
+            mode = (precision or EXACT).resolve(monthly_rate, months)
+        if mode not in SIMULATION_MODES:
+            raise ValueError('mode deve ser "exact", "fast" ou "summary"')
+
+        if mode == "summary":
+            return SimulationService._simulate_summary(initial, contribution, monthly_rate, months)
+
         projections: List[MonthlyProjection] = []
-        current_balance = initial
-        total_contributed = initial
-        
-        # Mês 0 (inicial)
-        projections.append(MonthlyProjection(
-            month=0,
-            contribution=initial,
-            accumulated_balance=current_balance,
-            profit=Money(0)
-        ))
-        
-        # Simular meses seguintes
-        for month in range(1, months + 1):
-            # Aplicar rendimento
-            interest = current_balance * Decimal(str(monthly_rate))
-            current_balance = current_balance + Money(interest.amount)
-            
-            # Adicionar aporte
-            current_balance = current_balance + contribution
-            total_contributed = total_contributed + contribution
-            
-            # Calcular lucro acumulado
-            profit = current_balance - total_contributed
-            
+        for month, _, balance, profit in SimulationService._iter_projection(
+            initial.cents, contribution.cents, monthly_rate, months, mode
+        ):
             projections.append(MonthlyProjection(
                 month=month,
-                contribution=contribution,
-                accumulated_balance=current_balance,
-                profit=profit
+                contribution=contribution if month else initial,
+                accumulated_balance=Money.from_cents(balance),
+                profit=Money.from_cents(profit)
             ))
-        
+
+        final = projections[-1].accumulated_balance
+        total_contributed = Money.from_cents(initial.cents + contribution.cents * months)
         return SimulationResult(
             initial_amount=initial,
             monthly_rate=monthly_rate,
             total_months=months,
             projections=projections,
             total_contributed=total_contributed,
-            final_balance=current_balance,
-            total_profit=current_balance - total_contributed
+            final_balance=final,
+            total_profit=final - total_contributed
+        )
+
+    @staticmethod
+    def iter_fixed_contribution(
+        initial_amount: float | str,
+        monthly_contribution: float | str,
+        monthly_rate: float,
+        months: int,
+        mode: str | None = None,
+        every: int = 1,
+        precision: PrecisionPolicy | None = None
+    ) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Gera a projeção com aporte fixo mês a mês, à medida que é calculada.
+
+        A memória não cresce com o prazo: nenhum ``MonthlyProjection`` ou
+        ``Money`` é criado por mês.
+
+        Args:
+            initial_amount: Valor inicial investido
+            monthly_contribution: Aporte mensal fixo
+            monthly_rate: Taxa de rendimento mensal (decimal)
+            months: Número de meses a simular (até ``MAX_SIMULATION_MONTHS``)
+            mode: "exact" ou "fast" ("summary" não tem meses); se omitido, vem de ``precision``
+            every: Emite só um mês a cada ``every`` (o último mês sempre sai)
+            precision: Política de precisão (padrão: exata)
+
+        Returns:
+            Iterador de ``(mês, aporte, saldo acumulado, lucro)`` em centavos;
+            os valores são idênticos aos de ``simulate_fixed_contribution``
+        """
+        initial, contribution = Money(initial_amount).cents, Money(monthly_contribution).cents
+        _check_projection(initial, contribution, monthly_rate, months)
+        if mode is None:
+            mode = (precision or EXACT).resolve(monthly_rate, months)
+        if mode not in ("exact", "fast"):
+            raise ValueError('mode deve ser "exact" ou "fast" para projeção mês a mês')
+        if every < 1:
+            raise ValueError("every deve ser positivo")
+
+        rows = SimulationService._iter_projection(initial, contribution, monthly_rate, months, mode)
+        return (row for row in rows if _keep(row[0], every, months))
+
+    @staticmethod
+    def _iter_projection(initial: int, contribution: int, monthly_rate: float, months: int,
+                         mode: str) -> Iterator[Tuple[int, int, int, int]]:
+        yield 0, initial, initial, 0
+        if mode == "fast":
+            balances = (round(b) for b in _fast_balances(initial, contribution, monthly_rate, months)[1:])
+        else:
+            balances = _exact_balances(initial, repeat(contribution, months), Decimal(str(monthly_rate)))
+        for month, balance in enumerate(balances, start=1):
+            yield month, contribution, balance, balance - initial - contribution * month
+
+    @staticmethod
+    def _simulate_summary(initial: Money, contribution: Money, monthly_rate: float, months: int) -> SimulationResult:
+        # Saldo[n] = P·(1+r)^n + A·((1+r)^n − 1)/r  (P + A·n com taxa zero)
+        rate = Decimal(str(monthly_rate))
+        if rate == 0:
+            final = initial.amount + contribution.amount * months
+        else:
+            growth = (1 + rate) ** months
+            final = initial.amount * growth + contribution.amount * (growth - 1) / rate
+
+        final_balance = Money(final)
+        total_contributed = Money(initial.amount + contribution.amount * months)
+        return SimulationResult(
+            initial_amount=initial,
+            monthly_rate=monthly_rate,
+            total_months=months,
+            projections=[],
+            total_contributed=total_contributed,
+            final_balance=final_balance,
+            total_profit=final_balance - total_contributed
+        )
+    
+    @staticmethod
+    def simulate_portfolio(
+        investments: List[Investment],
+        months: int,
+        contributions: Dict[str, float | str] | None = None,
+        every: int = 1,
+        use_numpy: bool | None = None,
+        precision: PrecisionPolicy | None = None
+    ) -> dict:
+        """
+        Projeta todas as posições de uma carteira de uma vez.
+
+        Cada investimento parte do valor atual, com a própria taxa mensal e o
+        aporte indicado em ``contributions`` (zero se ausente). As curvas saem
+        da fórmula fechada, como no modo ``fast``, calculadas numa única
+        operação sobre a matriz posições × meses; posições em que ``precision``
+        exige o modo exato são recalculadas mês a mês.
+
+        Args:
+            investments: Investimentos do usuário
+            months: Número de meses a projetar
+            contributions: Aporte mensal por ID de investimento
+            every: Mantém só um mês a cada ``every`` nas curvas (o último sempre entra)
+            use_numpy: Força (ou desativa) o uso do NumPy
+            precision: Política de precisão (padrão: rápida)
+
+        Returns:
+            ``{"months", "positions", "total"}`` em centavos. Cada posição traz
+            ``id``, ``name``, ``monthly_rate``, ``monthly_contribution``,
+            ``balance`` (curva) e os totais; ``total`` soma as curvas e totais
+            de todas as posições.
+        """
+        if months < 0:
+            raise ValueError("months não pode ser negativo")
+        if every < 1:
+            raise ValueError("every deve ser positivo")
+        contributions = contributions or {}
+        unknown = set(contributions) - {inv.id for inv in investments}
+        if unknown:
+            raise ValueError(f"Investimentos não encontrados: {', '.join(sorted(unknown))}")
+
+        initials = [inv.current_amount.cents for inv in investments]
+        steps = [Money(contributions.get(inv.id, 0)).cents for inv in investments]
+        rates = [float(inv.monthly_rate) for inv in investments]
+        curves = _portfolio_balances(initials, steps, rates, months, use_numpy)
+        policy = precision or FAST
+        for index, (initial, step, rate) in enumerate(zip(initials, steps, rates)):
+            if policy.resolve(rate, months) == "exact":
+                curves[index] = [initial, *_exact_balances(initial, repeat(step, months), Decimal(str(rate)))]
+
+        kept = [month for month in range(months + 1) if _keep(month, every, months)]
+        positions = []
+        total_balance = [0] * len(kept)
+        for inv, initial, step, curve in zip(investments, initials, steps, curves):
+            balance = [curve[month] for month in kept]
+            contributed = initial + step * months
+            positions.append({
+                "id": inv.id,
+                "name": inv.name,
+                "monthly_rate": inv.monthly_rate,
+                "monthly_contribution": step,
+                "balance": balance,
+                "total_contributed": contributed,
+                "final_balance": curve[-1],
+                "total_profit": curve[-1] - contributed
+            })
+            total_balance = [t + b for t, b in zip(total_balance, balance)]
+
+        total_contributed = sum(p["total_contributed"] for p in positions)
+        final_balance = sum(p["final_balance"] for p in positions)
+        return {
+            "months": kept,
+            "positions": positions,
+            "total": {
+                "balance": total_balance,
+                "total_contributed": total_contributed,
+                "final_balance": final_balance,
+                "total_profit": final_balance - total_contributed
+            }
+        }
+
+    @staticmethod
+    def goal_seek(
+        target: float | str,
+        solve_for: str,
+        initial_amount: float | str = 0,
+        monthly_contribution: float | str | None = None,
+        monthly_rate: float | None = None,
+        months: int | None = None
+    ) -> dict:
+        """
+        Encontra o aporte, a taxa ou o prazo necessário para atingir uma meta.
+
+        Aporte e prazo saem da fórmula fechada e são ajustados em um centavo
+        (ou um mês) até a simulação exata atingir a meta; a taxa, que não tem
+        fórmula fechada, é encontrada por bissecção sobre o saldo do modo
+        ``fast``.
+
+        Args:
+            target: Saldo desejado ao fim do prazo
+            solve_for: "contribution", "rate" ou "months"
+            initial_amount: Valor inicial investido
+            monthly_contribution: Aporte mensal (exceto para "contribution")
+            monthly_rate: Taxa mensal (exceto para "rate")
+            months: Prazo em meses (exceto para "months")
+
+        Returns:
+            ``{"solve_for", "monthly_contribution", "monthly_rate", "months",
+            "final_balance", "total_contributed", "total_profit"}``, com os
+            totais da simulação exata usando o valor encontrado
+
+        Raises:
+            ValueError: Parâmetros ausentes ou fora dos limites (``months`` acima
+                de ``MAX_GOAL_MONTHS``) ou meta inalcançável
+        """
+        if solve_for not in GOAL_SEEK_TARGETS:
+            raise ValueError('solve_for deve ser "contribution", "rate" ou "months"')
+        known = {
+            "contribution": ("monthly_contribution", monthly_contribution),
+            "rate": ("monthly_rate", monthly_rate),
+            "months": ("months", months),
+        }
+        missing = [field for name, (field, value) in known.items() if name != solve_for and value is None]
+        if missing:
+            raise ValueError(f"Parâmetros obrigatórios para solve_for={solve_for}: {', '.join(missing)}")
+
+        goal = Money(target).cents
+        initial = Money(initial_amount).cents
+        contribution = Money(monthly_contribution).cents if monthly_contribution is not None else 0
+        rate = float(monthly_rate) if monthly_rate is not None else 0.0
+        horizon = int(months) if months is not None else 0
+        if initial < 0 or contribution < 0:
+            raise ValueError("Valores negativos não são suportados")
+        if rate <= -1:
+            raise ValueError("Taxa mensal deve ser maior que -100%")
+        if horizon < 0:
+            raise ValueError("months não pode ser negativo")
+        if horizon > MAX_GOAL_MONTHS:
+            raise ValueError(f"months deve ser no máximo {MAX_GOAL_MONTHS}")
+
+        try:
+            if solve_for == "contribution":
+                contribution = SimulationService._solve_contribution(goal, initial, rate, horizon)
+            elif solve_for == "months":
+                horizon = SimulationService._solve_months(goal, initial, contribution, rate)
+            else:
+                rate = SimulationService._solve_rate(goal, initial, contribution, horizon)
+            final = _exact_final(initial, contribution, rate, horizon)
+        except (OverflowError, InvalidOperation):
+            # (1+r)^n além do maior float (ou da precisão do Decimal): fora do que o solver representa
+            raise ValueError("Parâmetros fora do intervalo suportado pelo solver") from None
+
+        total_contributed = initial + contribution * horizon
+        return {
+            "solve_for": solve_for,
+            "monthly_contribution": str(Money.from_cents(contribution).amount),
+            "monthly_rate": rate,
+            "months": horizon,
+            "final_balance": str(Money.from_cents(final).amount),
+            "total_contributed": str(Money.from_cents(total_contributed).amount),
+            "total_profit": str(Money.from_cents(final - total_contributed).amount)
+        }
+
+    @staticmethod
+    def _solve_contribution(goal: int, initial: int, rate: float, months: int) -> int:
+        if _exact_final(initial, 0, rate, months) >= goal:
+            return 0
+        if months == 0:
+            raise ValueError("Meta inalcançável: prazo zero e valor inicial abaixo da meta")
+
+        # A = (T − P·(1+r)^n) / anuidade, arredondado para cima; a simulação
+        # exata arredonda o rendimento mês a mês, então confere e ajusta
+        annuity = _closed_form_balance(0.0, 1.0, rate, months)
+        if annuity <= 0:
+            raise ValueError("Meta inalcançável com essa taxa")
+        contribution = max(0, math.ceil((goal - _closed_form_balance(initial, 0.0, rate, months)) / annuity))
+        while contribution > 0 and _exact_final(initial, contribution - 1, rate, months) >= goal:
+            contribution -= 1
+        while _exact_final(initial, contribution, rate, months) < goal:
+            contribution += 1
+        return contribution
+
+    @staticmethod
+    def _solve_months(goal: int, initial: int, contribution: int, rate: float) -> int:
+        if initial >= goal:
+            return 0
+
+        # n = log((T + A/r) / (P + A/r)) / log(1 + r)  (ou (T − P)/A com taxa zero)
+        if rate == 0:
+            estimate = (goal - initial) / contribution if contribution else math.inf
+        else:
+            # Com taxa negativa o saldo converge para −A/r: metas além disso dão razão <= 0
+            level = contribution / rate
+            ratio = (goal + level) / (initial + level) if initial + level else 0.0
+            estimate = math.log(ratio) / math.log1p(rate) if ratio > 0 else math.inf
+        if not estimate <= MAX_GOAL_MONTHS:
+            raise ValueError(f"Meta inalcançável em até {MAX_GOAL_MONTHS} meses")
+
+        months = max(1, math.ceil(estimate))
+        while months > 1 and _exact_final(initial, contribution, rate, months - 1) >= goal:
+            months -= 1
+        while _exact_final(initial, contribution, rate, months) < goal:
+            months += 1
+            if months > MAX_GOAL_MONTHS:
+                raise ValueError(f"Meta inalcançável em até {MAX_GOAL_MONTHS} meses")
+        return months
+
+    @staticmethod
+    def _solve_rate(goal: int, initial: int, contribution: int, months: int) -> float:
+        if months == 0:
+            raise ValueError("O prazo deve ser positivo para encontrar a taxa")
+        if initial == 0 and contribution == 0:
+            raise ValueError("Meta inalcançável sem valor inicial nem aportes")
+
+        # Com valores positivos o saldo cresce com a taxa: bissecção num intervalo que contém a meta
+        def gap(rate: float) -> float:
+            try:
+                return _closed_form_balance(initial, contribution, rate, months) - goal
+            except OverflowError:
+                # Saldo maior que o maior float: certamente acima da meta
+                return math.inf
+
+        low, high = _RATE_BRACKET
+        if gap(low) >= 0:
+            return low
+        while gap(high) < 0:
+            low, high = high, high * 2
+            if high > _MAX_RATE:
+                raise ValueError("Meta inalcançável com taxas de até 1000% ao mês")
+        while high - low > _RATE_TOLERANCE:
+            middle = (low + high) / 2
+            if gap(middle) < 0:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    @staticmethod
+    def simulate_grid(
+        initial_amounts: List[float | str],
+        monthly_contributions: List[float | str],
+        monthly_rates: List[float],
+        months: List[int],
+        curves: List[List[int]] | None = None,
+        use_numpy: bool | None = None,
+        precision: PrecisionPolicy | None = None
+    ) -> dict:
+        """
+        Simula aporte fixo para todas as combinações dos parâmetros de uma vez.
+
+        Usa a fórmula fechada (mesmos valores do modo ``summary``) sobre o
+        produto cartesiano ``initial_amounts × monthly_contributions ×
+        monthly_rates × months``, como uma única operação vetorizada. Os pares
+        (taxa, prazo) em que ``precision`` exige o modo exato são recalculados
+        mês a mês, o que custa O(meses) por célula.
+
+        Args:
+            initial_amounts: Valores iniciais
+            monthly_contributions: Aportes mensais
+            monthly_rates: Taxas mensais (decimal)
+            months: Prazos em meses
+            curves: Células (índices ``[i, j, k, l]`` nos quatro eixos) cuja
+                evolução mês a mês deve ser devolvida
+            use_numpy: Força (ou desativa) o uso do NumPy
+            precision: Política de precisão (padrão: rápida)
+
+        Returns:
+            ``{"axes", "shape", "final_balance", "total_contributed",
+            "profit", "curves"}``. Valores em centavos; as matrizes vêm
+            achatadas em ordem row-major segundo ``shape`` (a célula
+            ``[i, j, k, l]`` está na posição ``((i·A + j)·R + k)·N + l``).
+        """
+        axes = (initial_amounts, monthly_contributions, monthly_rates, months)
+        if not all(isinstance(axis, list) and axis for axis in axes):
+            raise ValueError("Cada eixo da grade deve ser uma lista não vazia")
+        shape = [len(axis) for axis in axes]
+        if shape[0] * shape[1] * shape[2] * shape[3] > MAX_GRID_CELLS:
+            raise ValueError(f"A grade pode ter no máximo {MAX_GRID_CELLS} combinações")
+        curves = curves or []
+        if len(curves) > MAX_GRID_CURVES:
+            raise ValueError(f"No máximo {MAX_GRID_CURVES} curvas por grade")
+
+        initials = [Money(value).cents for value in initial_amounts]
+        contributions = [Money(value).cents for value in monthly_contributions]
+        rates = [float(rate) for rate in monthly_rates]
+        horizons = [int(n) for n in months]
+        if any(rate <= -1 for rate in rates):
+            raise ValueError("Taxa mensal deve ser maior que -100%")
+        if any(n < 0 for n in horizons):
+            raise ValueError("months não pode ser negativo")
+        if any(n > MAX_SIMULATION_MONTHS for n in horizons):
+            raise ValueError(f"months deve ser no máximo {MAX_SIMULATION_MONTHS}")
+
+        final_balance = _grid_balances(initials, contributions, rates, horizons, use_numpy)
+        policy = precision or FAST
+        exact_pairs = [
+            (k, l)
+            for k, rate in enumerate(rates)
+            for l, n in enumerate(horizons)
+            if policy.resolve(rate, n) == "exact"
+        ]
+        for k, l in exact_pairs:
+            for i, initial in enumerate(initials):
+                for j, contribution in enumerate(contributions):
+                    position = ((i * shape[1] + j) * shape[2] + k) * shape[3] + l
+                    final_balance[position] = _exact_final(initial, contribution, rates[k], horizons[l])
+
+        # Total aportado não depende da taxa: repete o bloco de prazos para cada taxa
+        total_contributed = [
+            initial + contribution * n
+            for initial in initials
+            for contribution in contributions
+            for _ in rates
+            for n in horizons
+        ]
+
+        selected = []
+        for cell in curves:
+            if len(cell) != 4 or not all(0 <= int(index) < size for index, size in zip(cell, shape)):
+                raise ValueError(f"Célula inválida: {cell}")
+            i, j, k, l = (int(index) for index in cell)
+            if policy.resolve(rates[k], horizons[l]) == "exact":
+                tail = _exact_balances(initials[i], repeat(contributions[j], horizons[l]), Decimal(str(rates[k])))
+                balances = [initials[i], *tail]
+            else:
+                balances = [round(value) for value in
+                            _fast_balances(initials[i], contributions[j], rates[k], horizons[l], use_numpy)]
+            selected.append({"cell": [i, j, k, l], "balance": balances})
+
+        return {
+            "axes": {
+                "initial_amount": [str(Money.from_cents(c).amount) for c in initials],
+                "monthly_contribution": [str(Money.from_cents(c).amount) for c in contributions],
+                "monthly_rate": rates,
+                "months": horizons,
+            },
+            "shape": shape,
+            "final_balance": final_balance,
+            "total_contributed": total_contributed,
+            "profit": [balance - total for balance, total in zip(final_balance, total_contributed)],
+            "curves": selected,
+        }
+    
+    @staticmethod
+    def simulate_monte_carlo(
+        initial_amount: float | str,
+        monthly_contribution: float | str,
+        months: int,
+        model: ReturnModel,
+        paths: int = 10_000,
+        seed: int | None = None,
+        target: float | str | None = None,
+        workers: int | None = 1
+    ) -> dict:
+        """
+        Simula aporte fixo com rendimentos mensais aleatórios (Monte Carlo).
+
+        Args:
+            initial_amount: Valor inicial investido
+            monthly_contribution: Aporte mensal fixo
+            months: Número de meses a simular
+            model: Distribuição dos rendimentos (normal ou bootstrap histórico)
+            paths: Quantidade de caminhos simulados
+            seed: Semente do gerador, para resultados reprodutíveis
+            target: Meta de saldo opcional
+            workers: Processos usados para os blocos de caminhos
+
+        Returns:
+            Faixas de percentis por mês e probabilidade de atingir a meta
+            (ver ``finance.monte_carlo.run_monte_carlo``)
+        """
+        return run_monte_carlo(
+            initial_amount, monthly_contribution, months, model,
+            paths=paths, seed=seed, target=target, workers=workers
         )
     
     @staticmethod
     def simulate_variable_contribution(
         initial_amount: float | str,
         monthly_contributions: List[float | str],
-        monthly_rate: float
+        monthly_rate: float,
+        precision: PrecisionPolicy | None = None
     ) -> SimulationResult:
         """
         Simula investimento com aportes mensais variáveis.
@@ -136,54 +857,48 @@ class SimulationService:
             initial_amount: Valor inicial investido
             monthly_contributions: Lista de aportes mensais (um por mês)
             monthly_rate: Taxa de rendimento mensal (decimal)
+            precision: Política de precisão (padrão: exata)
         
         Returns:
             SimulationResult: Resultado completo da simulação
         """
         initial = Money(initial_amount)
-        
-        projections: List[MonthlyProjection] = []
-        current_balance = initial
-        total_contributed = initial
+        contributions = [Money(value) for value in monthly_contributions]
+        cents = [c.cents for c in contributions]
+        if (precision or EXACT).resolve(monthly_rate, len(contributions)) == "fast":
+            balances = _float_balances(initial.cents, cents, monthly_rate)
+        else:
+            balances = _exact_balances(initial.cents, cents, Decimal(str(monthly_rate)))
         
         # Mês 0 (inicial)
-        projections.append(MonthlyProjection(
+        projections: List[MonthlyProjection] = [MonthlyProjection(
             month=0,
             contribution=initial,
-            accumulated_balance=current_balance,
+            accumulated_balance=initial,
             profit=Money(0)
-        ))
+        )]
         
         # Simular cada mês com aporte variável
-        for month, contribution_value in enumerate(monthly_contributions, start=1):
-            contribution = Money(contribution_value)
-            
-            # Aplicar rendimento
-            interest = current_balance * Decimal(str(monthly_rate))
-            current_balance = current_balance + Money(interest.amount)
-            
-            # Adicionar aporte
-            current_balance = current_balance + contribution
-            total_contributed = total_contributed + contribution
-            
-            # Calcular lucro acumulado
-            profit = current_balance - total_contributed
-            
+        contributed = initial.cents
+        for month, (contribution, balance) in enumerate(zip(contributions, balances), start=1):
+            contributed += contribution.cents
             projections.append(MonthlyProjection(
                 month=month,
                 contribution=contribution,
-                accumulated_balance=current_balance,
-                profit=profit
+                accumulated_balance=Money.from_cents(balance),
+                profit=Money.from_cents(balance - contributed)
             ))
         
+        final = projections[-1].accumulated_balance
+        total_contributed = Money.from_cents(contributed)
         return SimulationResult(
             initial_amount=initial,
             monthly_rate=monthly_rate,
             total_months=len(monthly_contributions),
             projections=projections,
             total_contributed=total_contributed,
-            final_balance=current_balance,
-            total_profit=current_balance - total_contributed
+            final_balance=final,
+            total_profit=final - total_contributed
         )
     
     @staticmethod
@@ -191,7 +906,9 @@ class SimulationService:
         initial_amount: float | str,
         monthly_contributions: List[float | str],
         monthly_rate: float,
-        months: int
+        months: int,
+        mode: str | None = None,
+        precision: PrecisionPolicy | None = None
     ) -> Dict[str, SimulationResult]:
         """
         Compara múltiplos cenários de investimento.
@@ -204,6 +921,8 @@ class SimulationService:
             monthly_contributions: Lista de valores de aporte mensal para comparar
             monthly_rate: Taxa mensal
             months: Número de meses
+            mode: Modo de cada simulação (ver ``simulate_fixed_contribution``)
+            precision: Política de precisão, quando ``mode`` é omitido
         
         Returns:
             Dicionário com resultados de cada cenário
@@ -216,7 +935,9 @@ class SimulationService:
                 initial_amount=initial_amount,
                 monthly_contribution=contribution,
                 monthly_rate=monthly_rate,
-                months=months
+                months=months,
+                mode=mode,
+                precision=precision
             )
         
         return scenarios
@@ -0,0 +1,57 @@
+"""
+Snapshot dos arquivos JSON com escopo de requisição.
+
+Dentro de uma requisição Flask, cada arquivo é lido e decodificado no máximo
+uma vez: as leituras seguintes (de qualquer ``JSONStorage`` apontando para o
+mesmo caminho) recebem o conteúdo guardado em ``flask.g``, e as gravações
+feitas durante a requisição atualizam o snapshot. Fora de uma requisição (CLI,
+testes, scripts) tudo continua indo direto ao disco.
+
+O Flask é opcional: sem ele instalado, as funções abaixo nunca guardam nada.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any
+
+try:
+    from flask import g, has_request_context
+except ImportError:  # pacote usado sem a API
+    g = None
+
+    def has_request_context() -> bool:
+        return False
+
+
+MISSING = object()
+"""Marcador de "arquivo ainda não lido nesta requisição"."""
+
+
+def _snapshots() -> dict[str, Any] | None:
+    if not has_request_context():
+        return None
+    if "finance_snapshots" not in g:
+        g.finance_snapshots = {}
+    return g.finance_snapshots
+
+
+def lookup(path: Path) -> Any:
+    """Conteúdo já lido de ``path`` nesta requisição, ou ``MISSING``."""
+    snapshots = _snapshots()
+    if snapshots is None:
+        return MISSING
+    return snapshots.get(str(path), MISSING)
+
+
+def remember(path: Path, data: Any) -> None:
+    """Guarda o conteúdo lido (ou recém-gravado) de ``path``."""
+    snapshots = _snapshots()
+    if snapshots is not None:
+        snapshots[str(path)] = data
+
+
+def forget(path: Path) -> None:
+    """Descarta o snapshot de ``path`` (a próxima leitura volta ao disco)."""
+    snapshots = _snapshots()
+    if snapshots is not None:
+        snapshots.pop(str(path), None)
@@ -0,0 +1,149 @@
+"""
+Estatísticas incrementais e mescláveis sobre valores em centavos.
+
+``RunningStats`` mantém contagem, média e soma dos quadrados dos desvios pelo
+algoritmo de Welford (estável numericamente) e mescla dois acumuladores pela
+fórmula de Chan. ``QuantileSketch`` é um sketch de quantis no estilo DDSketch:
+cada valor cai num balde logarítmico, o que garante erro relativo limitado
+(``RELATIVE_ACCURACY``) em qualquer percentil e permite somar sketches de
+meses diferentes sem revisitar as transações.
+
+Ambos aceitam remoção de valores, necessária para manter os agregados do
+repositório por delta, e serializam para estruturas JSON simples.
+"""
+
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+@dataclass(slots=True)
+class RunningStats:
+    """Acumulador de Welford: quantidade, média, M2, mínimo e máximo."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: int | None = None
+    max: int | None = None
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def remove(self, value: int) -> None:
+        """
+        Desfaz um ``add(value)``.
+
+        Mínimo e máximo não são reversíveis: se o valor removido era um dos
+        extremos, eles ficam inválidos (``None``) até o chamador restaurá-los.
+        """
+        if self.count <= 1:
+            self.count, self.mean, self.m2, self.min, self.max = 0, 0.0, 0.0, None, None
+            return
+        mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 = max(0.0, self.m2 - (value - self.mean) * (value - mean))
+        self.mean = mean
+        self.count -= 1
+        if value == self.min:
+            self.min = None
+        if value == self.max:
+            self.max = None
+
+    def merge(self, other: "RunningStats") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def stddev(self) -> float:
+        """Desvio padrão amostral (0 com menos de dois valores)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_state(self) -> list:
+        return [self.count, self.mean, self.m2, self.min, self.max]
+
+    @classmethod
+    def from_state(cls, state: list) -> "RunningStats":
+        return cls(*state)
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis com erro relativo limitado, sobre valores positivos.
+
+    O estado é um dict ``{"<índice do balde>": quantidade}`` e pode ser o
+    próprio dict guardado no documento JSON (é alterado no lugar).
+    """
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, buckets: dict[str, int] | None = None):
+        self.buckets = {} if buckets is None else buckets
+
+    @staticmethod
+    def _key(value: float) -> str:
+        return str(math.ceil(math.log(value) / _LOG_GAMMA))
+
+    @staticmethod
+    def _value(key: int) -> float:
+        # Ponto do balde (gamma^(k-1), gamma^k] com erro relativo <= RELATIVE_ACCURACY
+        return 2 * _GAMMA ** key / (_GAMMA + 1)
+
+    @property
+    def count(self) -> int:
+        return sum(self.buckets.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= 0:
+            raise ValueError("O sketch só aceita valores positivos")
+        key = self._key(value)
+        total = self.buckets.get(key, 0) + count
+        if total:
+            self.buckets[key] = total
+        else:
+            del self.buckets[key]
+
+    def remove(self, value: float) -> None:
+        self.add(value, -1)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Valor aproximado no quantil ``q`` (0 a 1), ou None se vazio."""
+        items = sorted((int(key), count) for key, count in self.buckets.items())
+        total = sum(count for _, count in items)
+        if not total:
+            return None
+        rank = round(q * (total - 1))
+        seen = 0
+        for key, count in items:
+            seen += count
+            if seen > rank:
+                return self._value(key)
+        return self._value(items[-1][0])
+
+    def bounds(self) -> tuple[float, float] | None:
+        """Valores aproximados do menor e do maior balde ocupados."""
+        if not self.buckets:
+            return None
+        keys = [int(key) for key in self.buckets]
+        return self._value(min(keys)), self._value(max(keys))
@@ -1,14 +1,20 @@
 from __future__ import annotations
-import json, os
+import json, os, tempfile
 from pathlib import Path
 from typing import Any
+from . import snapshot
 
 
 class JSONStorage:
-    """Persistência simples em arquivo JSON."""
+    """
+    Persistência simples em arquivo JSON.
+
+    Durante uma requisição Flask as leituras passam pelo snapshot de
+    ``finance.snapshot``: cada arquivo é decodificado no máximo uma vez.
+    """
     def __init__(self, file_path: str | os.PathLike | None = None):
         default_path = Path.home() / ".finance_app" / "transactions.json"
-        self.file_path = Path(file_path or default_path)
+        self.file_path = Path(file_path or default_path).absolute()
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         if not self.file_path.exists():
             # Criar arquivo vazio baseado no nome
@@ -16,27 +22,58 @@ class JSONStorage:
                 self._write({"transactions": []})
             else:
                 # Para outros arquivos (users, investments), usar lista vazia
-                with open(self.file_path, "w", encoding="utf-8") as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
+                self._write([])
 
     def _read(self) -> dict[str, Any] | list[dict]:
         """Lê dados do arquivo JSON."""
-        with open(self.file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # Se for lista, retornar como dict com chave genérica para compatibilidade
-            if isinstance(data, list):
-                return {"data": data}
-            return data
+        data = snapshot.lookup(self.file_path)
+        if data is snapshot.MISSING:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            snapshot.remember(self.file_path, data)
+        # Se for lista, retornar como dict com chave genérica para compatibilidade
+        if isinstance(data, list):
+            return {"data": data}
+        return data
+
+    def _write(self, data: dict[str, Any] | list[dict]) -> None:
+        # Grava em arquivo temporário e substitui: leitores nunca veem um JSON pela metade
+        snapshot.forget(self.file_path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.file_path.parent, prefix=self.file_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            try:
+                os.chmod(tmp_path, os.stat(self.file_path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        snapshot.remember(self.file_path, data)
 
-    def _write(self, data: dict[str, Any]) -> None:
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def signature(self) -> tuple[int, int, int]:
+        """Assinatura barata do conteúdo atual (inode, mtime em ns, tamanho)."""
+        st = os.stat(self.file_path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
 
     def get_all(self) -> list[dict]:
         return self._read().get("transactions", [])
 
     def save_all(self, transactions: list[dict]) -> None:
         self._write({"transactions": transactions})
+
+    def load_document(self) -> dict[str, Any]:
+        """Documento completo de transações (lista + seções derivadas)."""
+        data = self._read()
+        if "transactions" not in data:
+            return {"transactions": data.get("data", [])}
+        return data
+
+    def save_document(self, document: dict[str, Any]) -> None:
+        """Grava o documento completo de uma só vez."""
+        self._write(document)
     
     # Métodos genéricos para uso em outros repositórios
     def load(self) -> list[dict]:
@@ -67,5 +104,4 @@ class JSONStorage:
             pass
         
         # Usar formato de lista direta
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write(data)
@@ -0,0 +1,140 @@
+import pytest
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from finance.accrual_service import DAYS_PER_MONTH, AccrualService, accrue_cents
+from finance.batch import np
+from finance.investment_models import Investment
+from finance.investment_repository import JSONInvestmentRepository
+from finance.investment_service import InvestmentService
+from finance.models import Money
+from finance.storage import JSONStorage
+
+BACKENDS = [False] + ([True] if np is not None else [])
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_juros_compostos_por_dias(use_numpy):
+    cents = [100_000, 100_000, 250_000, 50_000]
+    rates = [0.01, 0.01, 0.0, -2.0]
+    days = [0, 365, 90, 30]
+    result = accrue_cents(cents, rates, days, use_numpy=use_numpy)
+    assert result[0] == 100_000
+    assert result[1] == round(100_000 * 1.01 ** (365 / DAYS_PER_MONTH))
+    assert 112_600 < result[1] < 112_700
+    assert result[2] == 250_000
+    assert result[3] == 0
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_job_atualiza_todos_os_usuarios_numa_gravacao(tmp_path, use_numpy):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    for user, amount in [("u1", "1000"), ("u1", "500"), ("u2", "2000")]:
+        repo.add(Investment(name="CDB", type="renda_fixa", initial_amount=Money(amount),
+                            current_amount=Money(amount), monthly_rate=0.01, user_id=user,
+                            start_date=T0, last_accrued_at=T0))
+    saves = []
+    original_save = repo.storage.save
+    repo.storage.save = lambda data: (saves.append(1), original_save(data))
+
+    service = AccrualService(repo, use_numpy=use_numpy)
+    now = T0 + timedelta(days=30, hours=20)
+    result = service.accrue_all(now)
+    assert (result.checked, result.accrued, len(saves)) == (3, 3, 1)
+
+    expected = accrue_cents([100_000], [0.01], [30])[0]
+    first = next(inv for inv in repo.list() if inv.initial_amount == Money("1000"))
+    assert first.current_amount.cents == expected
+    assert first.last_accrued_at == T0 + timedelta(days=30)
+    assert result.interest_cents == sum(inv.profit.cents for inv in repo.list())
+
+    # Mesmo dia: nada a aplicar, nada gravado
+    assert service.accrue_all(now + timedelta(hours=2)).accrued == 0
+    assert len(saves) == 1
+
+
+def test_registros_sem_data_de_referencia(tmp_path):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    untouched = Investment(name="A", type="renda_fixa", initial_amount=Money("1000"),
+                           current_amount=Money("1000"), monthly_rate=0.01, user_id="u1", start_date=T0)
+    edited = Investment(name="B", type="renda_fixa", initial_amount=Money("1000"),
+                        current_amount=Money("1200"), monthly_rate=0.01, user_id="u1", start_date=T0)
+    repo.add(untouched)
+    repo.add(edited)
+
+    now = T0 + timedelta(days=60)
+    result = AccrualService(repo).accrue_all(now)
+    assert (result.accrued, result.baselined) == (1, 1)
+    assert repo.by_id(untouched.id).current_amount.cents == accrue_cents([100_000], [0.01], [60])[0]
+    assert repo.by_id(edited.id).current_amount == Money("1200")
+    assert repo.by_id(edited.id).last_accrued_at == now
+
+
+def test_edicao_manual_reinicia_o_rendimento(tmp_path):
+    service = InvestmentService(JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json")))
+    inv = service.create_investment(name="CDB", type="renda_fixa", initial_amount="1000",
+                                    monthly_rate=0.01, user_id="u1", start_date=T0)
+    assert inv.last_accrued_at > T0
+
+    before = datetime.now(timezone.utc)
+    updated = service.update_investment(inv.id, current_amount="1500")
+    assert updated.last_accrued_at >= before
+    assert service.update_investment(inv.id, notes="x").last_accrued_at == updated.last_accrued_at
+    assert service.update_investment(inv.id, current_amount="1500.00").last_accrued_at == updated.last_accrued_at
+
+
+def test_edicao_entre_leitura_e_gravacao_nao_se_perde(tmp_path):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    service = InvestmentService(repo)
+    ids = []
+    for name in ["A", "B", "C"]:
+        repo.add(Investment(name=name, type="renda_fixa", initial_amount=Money("1000"),
+                            current_amount=Money("1000"), monthly_rate=0.01, user_id="u1",
+                            start_date=T0, last_accrued_at=T0))
+    a, b, c = repo.list()
+    now = T0 + timedelta(days=30)
+
+    original_list = repo.list
+
+    def list_then_edit():
+        investments = original_list()
+        # Outra requisição grava entre a leitura do job e a gravação dele
+        service.update_investment(a.id, notes="editado")
+        service.update_investment(b.id, current_amount="1500")
+        repo.update(replace(repo.by_id(c.id), current_amount=Money("1100")))
+        return investments
+
+    repo.list = list_then_edit
+    result = AccrualService(repo).accrue_all(now)
+    repo.list = original_list
+
+    expected = accrue_cents([100_000], [0.01], [30])[0]
+    assert (result.checked, result.accrued) == (3, 1)
+    assert result.interest_cents == expected - 100_000
+    edited = repo.by_id(a.id)
+    assert (edited.notes, edited.current_amount.cents, edited.last_accrued_at) == ("editado", expected, now)
+    assert repo.by_id(b.id).current_amount == Money("1500")
+    assert repo.by_id(c.id).current_amount == Money("1100")
+    assert repo.by_id(c.id).last_accrued_at == T0
+
+
+def test_taxa_alterada_entre_leitura_e_gravacao_nao_se_perde(tmp_path):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    repo.add(Investment(name="A", type="renda_fixa", initial_amount=Money("1000"),
+                        current_amount=Money("1000"), monthly_rate=0.01, user_id="u1",
+                        start_date=T0, last_accrued_at=T0))
+    inv = repo.list()[0]
+    original_list = repo.list
+
+    def list_then_edit():
+        investments = original_list()
+        repo.update(replace(repo.by_id(inv.id), monthly_rate=0.02))
+        return investments
+
+    repo.list = list_then_edit
+    result = AccrualService(repo).accrue_all(T0 + timedelta(days=30))
+    repo.list = original_list
+
+    assert (result.checked, result.accrued, result.interest_cents) == (1, 0, 0)
+    stored = repo.by_id(inv.id)
+    assert (stored.monthly_rate, stored.current_amount, stored.last_accrued_at) == (0.02, Money("1000"), T0)
@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timezone
+from finance.batch import TransactionBatch, np
+from finance.models import Money
+from finance.report_service import ReportService
+from test_services import MemRepo
+from finance.services import FinanceService
+
+BACKENDS = [False] + ([True] if np is not None else [])
+
+
+def make_records():
+    def rec(type_, amount, category, when):
+        return {
+            "id": f"{category}-{when}",
+            "type": type_,
+            "amount": {"amount": amount},
+            "description": "x",
+            "category": {"name": category},
+            "user_id": "u1",
+            "occurred_at": when,
+        }
+    return [
+        rec("income", "1000.00", "Salário", "2025-01-05T10:00:00+00:00"),
+        rec("expense", "200.10", "Mercado", "2025-01-20T10:00:00+00:00"),
+        rec("expense", "50.05", "Mercado", "2025-02-01T00:00:00+00:00"),
+        rec("income", "1000.00", "Salário", "2025-02-05T10:00:00+00:00"),
+        rec("expense", "30.00", "Transporte", "2025-02-28T23:59:59+00:00"),
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_batch_sum_group_e_cumsum(use_numpy):
+    batch = TransactionBatch.from_records(make_records(), use_numpy=use_numpy)
+    assert len(batch) == 5
+    assert batch.sum() == 171985
+    assert batch.sum(signed=False) == 228015
+    assert batch.group_by("category") == {"Mercado": -25015, "Salário": 200000, "Transporte": -3000}
+    assert batch.group_by("month") == {"2025-01": 79990, "2025-02": 91995}
+    assert batch.group_by("month", "type", signed=False)[("2025-02", "expense")] == 8005
+    assert batch.count_by("day")["2025-02-28"] == 1
+    assert list(batch.sorted_by_time().cumsum()) == [100000, 79990, 74985, 174985, 171985]
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_batch_filtros(use_numpy):
+    batch = TransactionBatch.from_records(make_records(), use_numpy=use_numpy)
+    assert batch.select(type="expense").sum() == -28015
+    assert batch.select(category="Mercado", month=2).sum() == -5005
+    assert len(batch.select(category="Inexistente")) == 0
+    start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 2, 28, 23, 59, 59, tzinfo=timezone.utc)
+    assert batch.select(start=start, end=end).sum() == 91995
+    assert batch.filter([True, False, False, False, True]).sum() == 97000
+
+
+def test_report_service_sobre_batch():
+    svc = FinanceService(MemRepo())
+    svc.add_transaction(type="income", amount=1000, description="salário", category="Trabalho",
+                        user_id="u1", occurred_at=datetime(2025, 1, 5, tzinfo=timezone.utc))
+    svc.add_transaction(type="expense", amount="200.50", description="mercado", category="Alimentação",
+                        user_id="u1", occurred_at=datetime(2025, 2, 5, tzinfo=timezone.utc))
+    reports = ReportService(svc.repo)
+
+    assert reports.available_months("u1") == ["2025-01", "2025-02"]
+    assert reports.monthly_by_category("u1", 2025, 2) == {"2025-02": {"Alimentação": Money("-200.50")}}
+    assert reports.summary_by_month("u1")["2025-02"] == {
+        "income": "0.00", "expense": "200.50", "balance": "-200.50"
+    }
+    assert reports.category_by_month("u1", "Trabalho") == {"2025-01": Money(1000)}
+    assert svc.balance("u1") == Money("799.50")
+
+
+def test_pivot_denso_com_top():
+    records = make_records() + [{
+        "id": "x", "type": "expense", "amount": {"amount": "5.00"}, "description": "x",
+        "category": {"name": "Lazer"}, "user_id": "u1", "occurred_at": "2025-04-02T00:00:00+00:00",
+    }]
+    reports = ReportService(MemRepo())
+    batch = TransactionBatch.from_records(records)
+
+    pivot = reports.pivot("u1", batch=batch)
+    assert pivot["months"] == ["2025-01", "2025-02", "2025-03", "2025-04"]
+    assert pivot["categories"] == ["Lazer", "Mercado", "Salário", "Transporte"]
+    assert pivot["values"][1] == [0, -5005, 100000, -3000]
+    assert pivot["values"][2] == [0, 0, 0, 0]
+
+    top = reports.pivot("u1", type="expense", top=1, batch=batch)
+    assert top["categories"] == ["Mercado", "Outras"]
+    assert top["totals"] == [-25015, -3500]
+    assert reports.pivot("u1", year=2030, batch=batch)["values"] == []
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from finance.services import FinanceService
 from finance.repository import JSONTransactionRepository
 from finance.storage import JSONStorage
+from finance.simulation_service import SimulationService
 
 N = 1000  # aumente para 5000/10000 se quiser um teste mais "pesado"
 
@@ -29,3 +30,11 @@ def test_report_benchmark(benchmark, tmp_path):
     svc = make_service(tmp_path)
     result = benchmark(lambda: svc.report("category"))
     assert isinstance(result, dict)
+
+def test_simulation_exact_benchmark(benchmark):
+    result = benchmark(lambda: SimulationService.simulate_fixed_contribution("10000", "1500", 0.008, 360, mode="exact"))
+    assert len(result.projections) == 361
+
+def test_simulation_fast_benchmark(benchmark):
+    result = benchmark(lambda: SimulationService.simulate_fixed_contribution("10000", "1500", 0.008, 360, mode="fast"))
+    assert len(result.projections) == 361
@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from finance.export_service import ExportService
+from finance.repository import JSONTransactionRepository
+from finance.services import FinanceService
+from finance.storage import JSONStorage
+
+
+def make_export(tmp_path):
+    repo = JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+    svc = FinanceService(repo)
+    for i in range(7):
+        svc.add_transaction(
+            type="expense" if i % 2 else "income", amount=f"{i + 1}.50", description=f"item, {i}",
+            category="Mercado" if i % 3 else "Outros", user_id="u1",
+            occurred_at=datetime(2025, 1, i + 1, tzinfo=timezone.utc),
+        )
+    svc.add_transaction(type="income", amount=1, description="x", category="Outros", user_id="u2")
+    return ExportService(repo, chunk_rows=3)
+
+
+def test_csv_em_blocos_com_filtros(tmp_path):
+    export = make_export(tmp_path)
+    chunks = list(export.stream("csv", export.records("u1", start=datetime(2025, 1, 2), type="expense")))
+    assert len(chunks) == 2  # blocos de até 3 linhas, cabeçalho incluso
+
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [r["occurred_at"][:10] for r in rows] == ["2025-01-02", "2025-01-04", "2025-01-06"]
+    assert rows[0]["description"] == "item, 1"
+
+
+def test_ndjson_uma_transacao_por_linha(tmp_path):
+    export = make_export(tmp_path)
+    lines = "".join(export.stream("ndjson", export.records("u1", category="Outros"))).splitlines()
+    assert [json.loads(line)["amount"]["amount"] for line in lines] == ["1.50", "4.50", "7.50"]
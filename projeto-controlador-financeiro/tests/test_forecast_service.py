@@ -0,0 +1,59 @@
+import pytest
+from datetime import datetime, timezone
+from finance.batch import np
+from finance.forecast_service import ForecastService
+from finance.report_service import ReportService
+from finance.repository import JSONTransactionRepository
+from finance.services import FinanceService
+from finance.storage import JSONStorage
+
+BACKENDS = [False] + ([True] if np is not None else [])
+NOW = datetime(2025, 5, 15, tzinfo=timezone.utc)
+
+
+def make_forecast(tmp_path, use_numpy):
+    repo = JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+    svc = FinanceService(repo)
+    # Fevereiro a abril completos; maio (em andamento) fica fora do histórico
+    for month, rent, food in [(2, 1000, 300), (3, 1000, 500), (4, 1000, 400), (5, 1000, 9000)]:
+        when = datetime(2025, month, 5, tzinfo=timezone.utc)
+        svc.add_transaction(type="income", amount=5000, description="s", category="Salário", user_id="u1", occurred_at=when)
+        svc.add_transaction(type="expense", amount=rent, description="a", category="Aluguel", user_id="u1", occurred_at=when)
+        svc.add_transaction(type="expense", amount=food, description="m", category="Mercado", user_id="u1", occurred_at=when)
+    return svc, ForecastService(ReportService(repo), use_numpy=use_numpy)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_media_movel_e_suavizacao(tmp_path, use_numpy):
+    _, forecast = make_forecast(tmp_path, use_numpy)
+
+    sma = forecast.forecast("u1", months=3, method="sma", window=2, now=NOW)
+    assert sma["months"] == ["2025-05", "2025-06", "2025-07"]
+    assert sma["by_category"]["Mercado"]["expense"] == [45000] * 3
+    assert sma["income"] == [500000] * 3 and sma["expense"] == [145000] * 3
+
+    # Nível: 300 -> 400 -> 400 (alpha 0.5), a partir do primeiro mês com movimento
+    ses = forecast.forecast("u1", months=2, method="ses", alpha=0.5, history=12, now=NOW)
+    assert ses["by_category"]["Mercado"]["expense"] == [40000, 40000]
+    balance = 4 * 500000 - 4 * 100000 - (30000 + 50000 + 40000 + 900000)
+    assert ses["cumulative"] == [balance + 360000, balance + 720000]
+
+
+def test_cache_por_versao_dos_dados(tmp_path):
+    svc, forecast = make_forecast(tmp_path, False)
+    computed = []
+    compute = forecast._compute
+    forecast._compute = lambda *args: (computed.append(args), compute(*args))[1]
+
+    first = forecast.forecast("u1", now=NOW)
+    cached = forecast.forecast("u1", now=NOW)
+    assert cached == first and len(computed) == 1
+
+    # Cada chamada recebe a sua cópia: alterar o resultado não altera o cache
+    cached["balance"][0] = -1
+    cached["by_category"].clear()
+    assert forecast.forecast("u1", now=NOW) == first and len(computed) == 1
+
+    svc.add_transaction(type="expense", amount=10, description="x", category="Mercado",
+                        user_id="u1", occurred_at=datetime(2025, 4, 20, tzinfo=timezone.utc))
+    assert forecast.forecast("u1", now=NOW) != first and len(computed) == 2
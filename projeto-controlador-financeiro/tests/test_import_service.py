@@ -0,0 +1,79 @@
+import io
+from finance.import_service import ImportService, parse_amount
+from finance.repository import JSONTransactionRepository
+from finance.storage import JSONStorage
+
+EXTRATO_CSV = """Data;Histórico;Valor;Categoria
+01/02/2025;Salário;5.000,00;Salário
+03/02/2025;Mercado  Central;-234,56;Mercado
+03/02/2025;Mercado Central;-234,56;Mercado
+04/02/2025;Padaria;(12,00);
+05/02/2025;Linha ruim;abc;
+"""
+
+EXTRATO_OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250210120000[-3:BRT]
+<TRNAMT>-45.90
+<MEMO>Farmácia
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250211
+<TRNAMT>100.00
+<NAME>Pix recebido
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def make_repo(tmp_path):
+    return JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+
+
+def test_parse_amount_formatos_brasileiros():
+    assert str(parse_amount("1.234,56")) == "1234.56"
+    assert str(parse_amount("R$ -10,5")) == "-10.5"
+    assert str(parse_amount("(30,00)")) == "-30.00"
+    assert str(parse_amount("1,234.56")) == "1234.56"
+
+
+def test_csv_em_lotes_e_reimportacao_idempotente(tmp_path):
+    repo = make_repo(tmp_path)
+    calls = []
+    add_many = repo.add_many
+    repo.add_many = lambda txs: (calls.append(len(txs)), add_many(txs))
+
+    importer = ImportService(repo, batch_size=2)
+    progress = []
+    result = importer.import_file("u1", io.StringIO(EXTRATO_CSV), on_progress=lambda r: progress.append(r.imported))
+
+    assert (result.imported, result.duplicates, result.failed) == (4, 0, 1)
+    assert "linha 5" in result.errors[0]
+    assert calls == [2, 2] and progress == [2, 4, 4]
+
+    by_desc = {r["description"]: r for r in repo.iter_records("u1")}
+    assert by_desc["Padaria"]["type"] == "expense"
+    assert by_desc["Padaria"]["category"]["name"] == "Importado"
+    assert by_desc["Salário"]["amount"]["amount"] == "5000.00"
+    assert repo.totals("u1")["expense"] == 48_112
+
+    # As duas linhas iguais do mercado continuam sendo duas transações
+    again = importer.import_file("u1", io.StringIO(EXTRATO_CSV))
+    assert (again.imported, again.duplicates) == (0, 4)
+    assert repo.verify() == {}
+
+
+def test_ofx_sgml(tmp_path):
+    repo = make_repo(tmp_path)
+    result = ImportService(repo).import_file("u1", io.StringIO(EXTRATO_OFX), format="ofx")
+
+    assert result.imported == 2
+    records = sorted(repo.iter_records("u1"), key=lambda r: r["occurred_at"])
+    assert [(r["description"], r["type"], r["amount"]["amount"]) for r in records] == [
+        ("Farmácia", "expense", "45.90"),
+        ("Pix recebido", "income", "100.00"),
+    ]
+    assert records[0]["occurred_at"].startswith("2025-02-10")
@@ -0,0 +1,41 @@
+import pytest
+import finance.monte_carlo as monte_carlo
+from finance.monte_carlo import ReturnModel, load_returns, run_monte_carlo
+from finance.simulation_service import SimulationService
+
+
+def test_sem_volatilidade_igual_simulacao_deterministica():
+    model = ReturnModel("normal", mean=0.008, stddev=0.0)
+    result = SimulationService.simulate_monte_carlo(2000, 1000, 36, model, paths=50, seed=1, target=40000)
+    exact = SimulationService.simulate_fixed_contribution(2000, 1000, 0.008, 36, mode="fast")
+
+    for band in result["bands"].values():
+        assert abs(band[-1] - exact.final_balance.cents) <= 2
+    assert result["target"]["probability"] == 1.0
+    assert result["target"]["by_month"][0] == 0.0
+
+
+def test_semente_reprodutivel_independente_dos_blocos():
+    model = ReturnModel("normal", mean=0.01, stddev=0.05)
+    a = run_monte_carlo(1000, 100, 24, model, paths=3000, seed=7, chunk_size=1000)
+    b = run_monte_carlo(1000, 100, 24, model, paths=3000, seed=7, chunk_size=1000, workers=2)
+    c = run_monte_carlo(1000, 100, 24, model, paths=3000, seed=8, chunk_size=1000)
+    assert a == b and a["bands"] != c["bands"]
+    p = [a["bands"][k][-1] for k in ("p5", "p25", "p50", "p75", "p95")]
+    assert p == sorted(p)
+
+
+def test_bootstrap_de_csv(tmp_path, monkeypatch):
+    path = tmp_path / "retornos.csv"
+    path.write_text("mes;retorno\n2024-01;1,0%\n2024-02;-0,5%\n2024-03;2%\n", encoding="utf-8")
+    returns = load_returns(str(path))
+    assert returns == pytest.approx([0.01, -0.005, 0.02])
+
+    model = ReturnModel("bootstrap", returns=returns)
+    result = run_monte_carlo(1000, 0, 1, model, paths=500, seed=3, percentiles=(0, 100))
+    assert result["bands"]["p0"][-1] == 99500 and result["bands"]["p100"][-1] == 102000
+
+    # Sem NumPy o mesmo cálculo roda em Python puro
+    monkeypatch.setattr(monte_carlo, "np", None)
+    fallback = run_monte_carlo(1000, 0, 1, model, paths=500, seed=3, percentiles=(0, 100))
+    assert fallback["bands"]["p0"][-1] == 99500 and fallback["bands"]["p100"][-1] == 102000
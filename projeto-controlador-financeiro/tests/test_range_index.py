@@ -0,0 +1,62 @@
+import random
+from datetime import datetime, timedelta, timezone
+from finance.models import Money
+from finance.range_index import RangeIndex, is_day_aligned
+from finance.repository import JSONTransactionRepository
+from finance.services import FinanceService
+from finance.storage import JSONStorage
+
+
+def test_totais_por_intervalo_batem_com_o_batch(tmp_path):
+    repo = JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+    svc = FinanceService(repo)
+    rng = random.Random(7)
+    base = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    for i in range(120):
+        svc.add_transaction(
+            type=rng.choice(["income", "expense"]), amount=f"{rng.randint(1, 50000) / 100:.2f}",
+            description="x", category=rng.choice(["A", "B"]), user_id="u1",
+            occurred_at=base + timedelta(days=rng.randint(0, 90), hours=rng.randint(0, 23)),
+        )
+
+    batch = repo.batch_by_user("u1")
+    for _ in range(25):
+        a, b = sorted(rng.sample(range(95), 2))
+        start = base + timedelta(days=a)
+        end = base + timedelta(days=b, hours=23, minutes=59, seconds=59, microseconds=999999)
+        assert is_day_aligned(start, end)
+        expected = Money.from_cents(batch.select(start=start, end=end).sum())
+        assert svc.range_totals("u1", start, end)["balance"] == expected
+
+    months = repo.range_index("u1").by_month(base + timedelta(days=10))
+    assert {k: v["balance"] for k, v in months.items()} == batch.select(start=base + timedelta(days=10)).group_by("month")
+
+
+def test_serie_de_saldo_e_intervalos_vazios():
+    index = RangeIndex({"2025-01-02": [1000, 0, 1], "2025-01-05": [0, 300, 2]})
+    assert list(index.running_balance()) == [("2025-01-02", 1000), ("2025-01-05", 700)]
+    assert index.totals(datetime(2025, 1, 3), datetime(2025, 1, 4))["count"] == 0
+    assert index.totals(datetime(2025, 1, 6), datetime(2025, 1, 1))["balance"] == 0
+    assert index.totals()["count"] == 3
+    assert not is_day_aligned(datetime(2025, 1, 1, 12, tzinfo=timezone.utc), None)
+
+
+def test_serie_por_granularidade_em_arrays_paralelos():
+    index = RangeIndex({"2024-12-30": [500, 0, 1], "2025-01-02": [1000, 0, 1], "2025-01-05": [0, 300, 2], "2025-02-10": [0, 100, 1]})
+
+    months = index.series("month")
+    assert months == {
+        "periods": ["2024-12", "2025-01", "2025-02"],
+        "income": [500, 1000, 0],
+        "expense": [0, 300, 100],
+        "balance": [500, 1200, 1100],
+    }
+
+    # Semanas ISO rotuladas pela segunda-feira; o saldo inclui o que veio antes do início
+    weeks = index.series("week", datetime(2025, 1, 1), datetime(2025, 1, 13))
+    assert weeks["periods"] == ["2024-12-30", "2025-01-06", "2025-01-13"]
+    assert weeks["income"] == [1000, 0, 0] and weeks["balance"] == [1200, 1200, 1200]
+
+    days = index.series("day", datetime(2025, 1, 4), datetime(2025, 1, 6))
+    assert days["balance"] == [1500, 1200, 1200]
+    assert RangeIndex({}).series("day")["periods"] == []
@@ -0,0 +1,147 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from finance.models import Money
+from finance.report_service import ReportService
+from finance.repository import JSONTransactionRepository
+from finance.services import FinanceService
+from finance.storage import JSONStorage
+
+
+def make_service(tmp_path):
+    repo = JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+    return FinanceService(repo), repo
+
+
+def test_contadores_acompanham_escritas(tmp_path):
+    svc, repo = make_service(tmp_path)
+    a = svc.add_transaction(type="income", amount="1000.00", description="salário", category="Trabalho", user_id="u1")
+    b = svc.add_transaction(type="expense", amount="250.40", description="mercado", category="Alimentação", user_id="u1")
+    svc.add_transaction(type="expense", amount=10, description="café", category="Alimentação", user_id="u2")
+
+    assert svc.balance("u1") == Money("749.60")
+    assert svc.totals("u1")["expense"] == Money("250.40")
+    assert svc.balance() == Money("739.60")
+
+    b.amount = Money("50.40")
+    assert repo.update(b)
+    assert svc.balance("u1") == Money("949.60")
+
+    assert svc.remove(a.id)
+    assert repo.totals("u1") == {"income": 0, "expense": 5040, "balance": -5040, "count": 1}
+    assert repo.verify() == {}
+
+
+def test_verificacao_e_migracao_de_arquivo_antigo(tmp_path):
+    svc, repo = make_service(tmp_path)
+    svc.add_transaction(type="income", amount=100, description="x", category="Geral", user_id="u1")
+
+    # Corrompe os contadores persistidos
+    path = tmp_path / "transactions.json"
+    doc = json.loads(path.read_text())
+    doc["balances"]["u1"]["income"] = 1
+    path.write_text(json.dumps(doc))
+    assert repo.verify() == {"balances": ["u1"]}
+    assert repo.verify(repair=True) == {"balances": ["u1"]}
+    assert svc.balance("u1") == Money(100)
+
+    # Arquivo no formato antigo (só a lista de transações) é migrado na leitura
+    path.write_text(json.dumps({"transactions": doc["transactions"]}))
+    assert svc.balance("u1") == Money(100)
+
+
+def test_rollup_mensal_responde_relatorios(tmp_path):
+    svc, repo = make_service(tmp_path)
+    jan = datetime(2025, 1, 10, tzinfo=timezone.utc)
+    fev = datetime(2025, 2, 3, tzinfo=timezone.utc)
+    svc.add_transaction(type="income", amount=3000, description="salário", category="Trabalho", user_id="u1", occurred_at=jan)
+    svc.add_transaction(type="expense", amount="120.50", description="feira", category="Mercado", user_id="u1", occurred_at=jan)
+    extra = svc.add_transaction(type="expense", amount=80, description="feira", category="Mercado", user_id="u1", occurred_at=fev)
+
+    assert repo.rollup("u1")["2025-01"]["Mercado"] == {"expense": [12050, 1]}
+
+    reports = ReportService(repo)
+    batch = repo.batch_by_user("u1")
+    assert reports.available_months("u1") == ["2025-01", "2025-02"]
+    assert reports.monthly_by_category("u1") == reports.monthly_by_category("u1", batch=batch)
+    assert reports.summary_by_month("u1", 2025, 1)["2025-01"]["balance"] == "2879.50"
+    assert reports.category_by_month("u1", "Mercado", 2025) == {
+        "2025-01": Money("-120.50"), "2025-02": Money(-80)
+    }
+
+    # Remoção apaga a célula (e o mês) em vez de deixar zeros
+    svc.remove(extra.id)
+    assert reports.available_months("u1") == ["2025-01"]
+    assert repo.verify() == {}
+
+
+def test_mes_sem_ano_filtra_o_mesmo_mes_de_todos_os_anos(tmp_path):
+    svc, repo = make_service(tmp_path)
+    for when, amount in [(datetime(2024, 1, 5), 100), (datetime(2025, 1, 5), 200), (datetime(2025, 2, 5), 400)]:
+        svc.add_transaction(type="income", amount=amount, description="x", category="Trabalho", user_id="u1",
+                            occurred_at=when.replace(tzinfo=timezone.utc))
+
+    reports = ReportService(repo)
+    for batch in (None, repo.batch_by_user("u1")):
+        assert list(reports.summary_by_month("u1", month=1, batch=batch)) == ["2024-01", "2025-01"]
+        assert list(reports.monthly_by_category("u1", month=2, batch=batch)) == ["2025-02"]
+
+
+def test_snapshot_por_requisicao_le_cada_arquivo_uma_vez(tmp_path):
+    flask = pytest.importorskip("flask")
+    path = tmp_path / "transactions.json"
+    svc, repo = make_service(tmp_path)
+    svc.add_transaction(type="income", amount=10, description="x", category="Geral", user_id="u1")
+
+    with flask.Flask(__name__).test_request_context():
+        assert len(repo.list_by_user("u1")) == 1
+        # Alteração externa não é vista dentro da mesma requisição...
+        path.write_text(json.dumps({"transactions": []}))
+        assert len(JSONStorage(path).get_all()) == 1
+        # ...mas as gravações feitas nela são
+        svc.add_transaction(type="expense", amount=3, description="y", category="Geral", user_id="u1")
+        assert len(repo.list_by_user("u1")) == 2
+
+    # Fora da requisição a leitura volta ao disco
+    assert len(repo.list_by_user("u1")) == 2
+    path.write_text(json.dumps({"transactions": []}))
+    assert repo.list_by_user("u1") == []
+
+
+def test_versao_muda_apenas_com_escritas_do_usuario(tmp_path):
+    svc, repo = make_service(tmp_path)
+    v0 = repo.version("u1")
+    tx = svc.add_transaction(type="income", amount=10, description="x", category="Geral", user_id="u1")
+    v1 = repo.version("u1")
+    assert v1 != v0
+    assert repo.version("u1") == v1
+
+    other = repo.version("u2")
+    svc.remove(tx.id)
+    assert repo.version("u1") != v1
+    assert repo.version("u2") == other
+    assert repo.verify() == {}
+
+
+def test_escrita_nao_altera_secoes_ja_entregues(tmp_path):
+    svc, repo = make_service(tmp_path)
+    jan = datetime(2025, 1, 10, tzinfo=timezone.utc)
+    svc.add_transaction(type="expense", amount=100, description="feira", category="Mercado", user_id="u1", occurred_at=jan)
+
+    held = repo.rollup("u1")
+    before = json.loads(json.dumps(held))
+    totals = repo.totals("u1")
+    spending = json.loads(json.dumps(repo.spending("u1")))
+
+    svc.add_transaction(type="expense", amount=50, description="feira", category="Mercado", user_id="u1", occurred_at=jan)
+    assert held == before
+    assert totals["expense"] == 10000
+    assert repo.spending("u1") != spending
+
+    tx = svc.add_transaction(type="income", amount=10, description="x", category="Geral", user_id="u1", occurred_at=jan)
+    held = repo.rollup("u1")
+    before = json.loads(json.dumps(held))
+    assert svc.remove(tx.id)
+    assert held == before
+    assert repo.rollup("u1") != before
+    assert repo.verify() == {}
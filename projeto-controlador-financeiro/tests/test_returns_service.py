@@ -0,0 +1,115 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from finance.batch import np
+from finance.investment_models import CashFlow, Investment
+from finance.investment_repository import JSONInvestmentRepository
+from finance.investment_service import InvestmentService
+from finance.models import Money
+from finance.returns_service import ReturnsService, xirr_many
+from finance.storage import JSONStorage
+
+BACKENDS = [False] + ([True] if np is not None else [])
+T0 = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def make_investment(initial, flows, current, end, name="CDB"):
+    return Investment(
+        name=name, type="renda_fixa", initial_amount=Money(initial), current_amount=Money(current),
+        monthly_rate=0.0, user_id="u1", start_date=T0, last_accrued_at=end,
+        cash_flows=[CashFlow(date=d, amount=Money(a), balance_before=Money(b)) for d, a, b in flows],
+    )
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_xirr_exemplo_da_planilha(use_numpy):
+    days = [0, 60, 303, 411, 456]
+    problems = [
+        ([d / 365 for d in days], [-10000, 2750, 4250, 3250, 2750]),
+        ([0, 1], [-100, -5]),          # sem entradas: sem solução
+        ([0, 0.5, 1], [-100, -100, 250]),
+    ]
+    rates = xirr_many(problems, use_numpy=use_numpy)
+    assert rates[0] == pytest.approx(0.373362535, abs=1e-8)
+    assert rates[1] is None
+    assert -100 - 100 / (1 + rates[2]) ** 0.5 + 250 / (1 + rates[2]) == pytest.approx(0, abs=1e-7)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_twr_ignora_tamanho_dos_aportes(tmp_path, use_numpy):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    middle, end = T0 + timedelta(days=182), T0 + timedelta(days=365)
+    # 10% no primeiro semestre, 0% no segundo; aporte grande no meio
+    repo.add(make_investment("1000", [(middle, "5000", "1100")], "6100", end))
+
+    result = ReturnsService(repo, use_numpy=use_numpy).returns("u1", now=end)
+    position = next(iter(result["investments"].values()))
+    assert position["twr"] == pytest.approx(0.10)
+    assert position["twr_annualized"] == pytest.approx(0.10)
+    # Ponderado pelo dinheiro: a maior parte do dinheiro só pegou o semestre fraco
+    x = position["xirr"]
+    npv = -1000 - 5000 / (1 + x) ** (182 / 365) + 6100 / (1 + x)
+    assert npv == pytest.approx(0, abs=1e-6)
+    assert 0 < x < 0.05
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_carteira_com_mesmo_rendimento(tmp_path, use_numpy):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    end = T0 + timedelta(days=730)
+    repo.add(make_investment("1000", [], "1210", end, name="A"))
+    repo.add(make_investment("3000", [(T0 + timedelta(days=365), "-1300", "3300")], "2200", end, name="B"))
+
+    portfolio = ReturnsService(repo, use_numpy=use_numpy).returns("u1", now=end)["portfolio"]
+    assert portfolio["twr_annualized"] == pytest.approx(0.10)
+    assert portfolio["xirr"] == pytest.approx(0.10)
+    assert portfolio["start"] == T0.isoformat() and portfolio["end"] == end.isoformat()
+    assert ReturnsService(repo).returns("outro") == {
+        "portfolio": {"xirr": None, "twr": None, "twr_annualized": None, "start": None, "end": None},
+        "investments": {},
+    }
+
+
+def test_resultado_em_cache_ate_a_proxima_gravacao(tmp_path):
+    repo = JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json"))
+    investments = InvestmentService(repo)
+    returns = ReturnsService(repo)
+    inv = investments.create_investment(name="CDB", type="renda_fixa", initial_amount="1000",
+                                        monthly_rate=0.01, user_id="u1",
+                                        start_date=datetime.now(timezone.utc) - timedelta(days=400))
+
+    reads = []
+    list_by_user = repo.list_by_user
+    repo.list_by_user = lambda user_id: (reads.append(user_id), list_by_user(user_id))[1]
+
+    first = returns.returns("u1")
+    cached = returns.returns("u1")
+    assert cached == first and len(reads) == 1
+
+    # Cada chamada recebe a sua cópia: alterar o resultado não altera o cache
+    cached["portfolio"]["xirr"] = 99.0
+    cached["investments"].clear()
+    assert returns.returns("u1") == first and len(reads) == 1
+
+    updated = investments.add_cash_flow(inv.id, "500")
+    assert updated.current_amount == Money("1500") and updated.invested == Money("1500")
+    assert updated.profit == Money("0")
+    second = returns.returns("u1")
+    assert len(reads) == 2
+    assert second["investments"][inv.id]["end"] == updated.cash_flows[0].date.isoformat()
+
+
+def test_validacao_dos_movimentos(tmp_path):
+    investments = InvestmentService(JSONInvestmentRepository(JSONStorage(tmp_path / "investments.json")))
+    inv = investments.create_investment(name="CDB", type="renda_fixa", initial_amount="1000",
+                                        monthly_rate=0.0, user_id="u1")
+    with pytest.raises(ValueError):
+        investments.add_cash_flow(inv.id, "0")
+    with pytest.raises(ValueError):
+        investments.add_cash_flow(inv.id, "-1000.01")
+    with pytest.raises(ValueError):
+        investments.add_cash_flow(inv.id, "10", date=T0)
+    assert investments.add_cash_flow("desconhecido", "10") is None
+
+    updated = investments.add_cash_flow(inv.id, "-400")
+    assert updated.current_amount == Money("600")
+    assert Investment.from_dict(updated.to_dict()).cash_flows == updated.cash_flows
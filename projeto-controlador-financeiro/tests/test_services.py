@@ -11,6 +11,9 @@ class MemRepo(ITransactionRepository):
     def list(self) -> list[Transaction]:
         return list(self.items)
 
+    def list_by_user(self, user_id: str):
+        return [t for t in self.items if t.user_id == user_id]
+
     def by_id(self, id: str) -> Optional[Transaction]:
         return next((t for t in self.items if t.id == id), None)
 
@@ -0,0 +1,48 @@
+from finance.simulation_cache import SimulationCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_ttl_e_metricas():
+    clock = Clock()
+    cache = SimulationCache(max_entries=2, ttl=60, clock=clock)
+    calls = []
+
+    def compute(value):
+        return lambda: calls.append(value) or {"value": value}
+
+    assert cache.get_or_compute("fixed", {"months": 12}, compute(1)) == {"value": 1}
+    assert cache.get_or_compute("fixed", {"months": 12}, compute(2)) == {"value": 1}
+    cache.get_or_compute("fixed", {"months": 24}, compute(3))
+    cache.get_or_compute("grid", {"months": 12}, compute(4))   # tipo faz parte da chave; remove o mais antigo
+    cache.get_or_compute("fixed", {"months": 12}, compute(5))
+    assert calls == [1, 3, 4, 5]
+
+    clock.now += 61
+    cache.get_or_compute("fixed", {"months": 12}, compute(6))
+    assert calls[-1] == 6
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 5, 1)
+    assert stats["evictions"] == 2 and stats["size"] == 2
+    assert stats["hit_rate"] == 1 / 6
+
+
+def test_camada_em_disco_sobrevive_a_reinicio(tmp_path):
+    first = SimulationCache(ttl=60, directory=tmp_path)
+    first.get_or_compute("fixed", {"months": 12}, lambda: {"final_balance": "10.00"})
+
+    restarted = SimulationCache(ttl=60, directory=tmp_path)
+    result = restarted.get_or_compute("fixed", {"months": 12}, lambda: {"final_balance": "errado"})
+    assert result == {"final_balance": "10.00"}
+    assert restarted.stats()["disk_hits"] == 1
+
+    (next(tmp_path.glob("*.json"))).write_text("{corrompido", encoding="utf-8")
+    fresh = SimulationCache(ttl=60, directory=tmp_path)
+    assert fresh.get_or_compute("fixed", {"months": 12}, lambda: {"ok": True}) == {"ok": True}
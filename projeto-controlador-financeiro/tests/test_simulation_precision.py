@@ -0,0 +1,43 @@
+import pytest
+from finance.precision_check import check_drift, measure_drift
+from finance.simulation_service import EXACT, FAST, PrecisionPolicy, SimulationService
+
+
+@pytest.mark.parametrize("kind", ["fixed", "variable"])
+def test_deriva_dentro_do_limite_teorico(kind):
+    reports = measure_drift(samples=40, horizons=(12, 120, 480), kind=kind, seed=1)
+    assert [r.months for r in reports] == [12, 120, 480]
+    assert all(r.max_drift_cents <= r.bound_cents + 1 for r in reports)
+    assert check_drift(reports) == []
+
+
+def test_limites_fixos_por_prazo():
+    reports = measure_drift(samples=5, horizons=(12, 60), seed=2)
+    failures = check_drift(reports, limits={12: -1})
+    assert len(failures) == 1 and failures[0].startswith("fixed 12 meses")
+
+
+def test_politica_volta_ao_exato_em_prazos_longos():
+    policy = PrecisionPolicy("fast", max_drift_cents=100)
+    assert policy.resolve(0.008, 12) == "fast"
+    assert policy.resolve(0.008, 480) == "exact"
+    assert FAST.resolve(0.008, 480) == "fast"
+    assert EXACT.resolve(0.008, 12) == "exact"
+    with pytest.raises(ValueError):
+        PrecisionPolicy("summary")
+    # (1,5)^10.000.000 estoura o Decimal: sem limite útil, volta ao exato
+    assert PrecisionPolicy("fast", 100).resolve(0.5, 10**7) == "exact"
+
+
+def test_politica_nas_simulacoes():
+    exact = SimulationService.simulate_fixed_contribution("1000", "100", 0.01, 480)
+    guarded = SimulationService.simulate_fixed_contribution(
+        "1000", "100", 0.01, 480, precision=PrecisionPolicy("fast", max_drift_cents=100)
+    )
+    assert guarded.to_dict() == exact.to_dict()
+
+    contributions = ["100", "0", "250.55", "80"] * 30
+    fast = SimulationService.simulate_variable_contribution("1000", contributions, 0.01, precision=FAST)
+    exact = SimulationService.simulate_variable_contribution("1000", contributions, 0.01)
+    drift = abs(fast.final_balance.cents - exact.final_balance.cents)
+    assert drift <= 100
@@ -0,0 +1,170 @@
+import pytest
+from decimal import Decimal
+from finance.batch import np
+from finance.simulation_service import SimulationService, _fast_balances, rounding_error_bound
+
+BACKENDS = [False] + ([True] if np is not None else [])
+
+
+def test_modo_exato_mes_a_mes():
+    result = SimulationService.simulate_fixed_contribution(2000, 1000, 0.008, 36)
+    assert [str(p.accumulated_balance.amount) for p in result.projections[:3]] == ["2000.00", "3016.00", "4040.13"]
+    assert str(result.final_balance.amount) == "44193.19"
+    assert str(result.total_profit.amount) == "6193.19"
+
+
+@pytest.mark.parametrize("rate", [0.0, 0.008, 0.035])
+def test_modos_rapidos_dentro_do_limite(rate):
+    exact = SimulationService.simulate_fixed_contribution("1234.56", "789.01", rate, 360)
+    fast = SimulationService.simulate_fixed_contribution("1234.56", "789.01", rate, 360, mode="fast")
+    summary = SimulationService.simulate_fixed_contribution("1234.56", "789.01", rate, 360, mode="summary")
+
+    bound = rounding_error_bound(rate, 360) + Decimal("0.01")
+    for result in (fast, summary):
+        assert abs(result.final_balance.amount - exact.final_balance.amount) <= bound
+        assert result.total_contributed == exact.total_contributed
+    assert len(fast.projections) == 361 and summary.projections == []
+    assert summary.to_dict()["projections"] == []
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_saldos_rapidos_por_backend(use_numpy):
+    balances = _fast_balances(200000, 100000, 0.008, 36, use_numpy=use_numpy)
+    assert len(balances) == 37
+    assert abs(balances[-1] - 4419319) < 10
+
+
+def test_modo_invalido():
+    with pytest.raises(ValueError):
+        SimulationService.simulate_fixed_contribution(1000, 100, 0.01, 12, mode="turbo")
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_grade_igual_ao_modo_summary(use_numpy):
+    initials, contributions, rates, horizons = [0, "2000"], [500, 1000], [0.0, 0.008, 0.01], [12, 36]
+    grid = SimulationService.simulate_grid(initials, contributions, rates, horizons, curves=[[1, 1, 1, 1]],
+                                           use_numpy=use_numpy)
+    assert grid["shape"] == [2, 2, 3, 2]
+
+    position = 0
+    for p in initials:
+        for a in contributions:
+            for r in rates:
+                for n in horizons:
+                    summary = SimulationService.simulate_fixed_contribution(p, a, r, n, mode="summary")
+                    assert abs(grid["final_balance"][position] - summary.final_balance.cents) <= 1
+                    assert grid["total_contributed"][position] == summary.total_contributed.cents
+                    position += 1
+
+    curve = grid["curves"][0]["balance"]
+    assert len(curve) == 37 and curve[0] == 200000 and abs(curve[-1] - 4419319) < 10
+
+
+def test_grade_valida_celulas():
+    with pytest.raises(ValueError):
+        SimulationService.simulate_grid([0], [100], [0.01], [12], curves=[[0, 0, 1, 0]])
+    with pytest.raises(ValueError):
+        SimulationService.simulate_grid([0], [], [0.01], [12])
+
+
+@pytest.mark.parametrize("mode", ["exact", "fast", "summary"])
+def test_aporte_fixo_rejeita_prazo_e_saldo_fora_do_limite(mode):
+    with pytest.raises(ValueError, match="months"):
+        SimulationService.simulate_fixed_contribution("100", "10", 0.01, 2000, mode=mode)
+    with pytest.raises(ValueError, match="grande demais"):
+        SimulationService.simulate_fixed_contribution("100", "10", 1.0, 1200, mode=mode)
+    if mode != "summary":
+        # Validado antes do primeiro mês: o stream ainda pode responder 400
+        with pytest.raises(ValueError, match="grande demais"):
+            SimulationService.iter_fixed_contribution("100", "10", 1.0, 1200, mode=mode)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_grade_rejeita_prazo_e_saldo_fora_do_limite(use_numpy):
+    with pytest.raises(ValueError, match="months"):
+        SimulationService.simulate_grid(["100"], ["10"], [0.01], [2000], use_numpy=use_numpy)
+    # 2^1200 não cabe em float: erro de validação em vez de saldo lixo (int64) ou OverflowError
+    with pytest.raises(ValueError, match="grande demais"):
+        SimulationService.simulate_grid(["100"], ["10"], [1.0], [1200], use_numpy=use_numpy)
+    with pytest.raises(ValueError, match="grande demais"):
+        SimulationService.simulate_grid(["100"], ["10"], [0.5], [100], use_numpy=use_numpy)
+
+
+def test_colunas_dizimadas_e_fluxo_mes_a_mes():
+    result = SimulationService.simulate_fixed_contribution(2000, 1000, 0.008, 36)
+    columns = result.to_columns(every=12)
+    assert columns["month"] == [0, 12, 24, 36]
+    assert columns["accumulated_balance"][-1] == columns["final_balance"] == 4419319
+    assert columns["contribution"] == [200000, 100000, 100000, 100000]
+
+    rows = list(SimulationService.iter_fixed_contribution(2000, 1000, 0.008, 36, every=10))
+    assert [row[0] for row in rows] == [0, 10, 20, 30, 36]
+    assert rows[-1] == (36, 100000, 4419319, 619319)
+    assert [p["month"] for p in result.to_dict(every=10)["projections"]] == [0, 10, 20, 30, 36]
+
+    with pytest.raises(ValueError):
+        SimulationService.iter_fixed_contribution(2000, 1000, 0.008, 36, mode="summary")
+
+
+def test_goal_seek_aporte_prazo_e_taxa():
+    contribution = SimulationService.goal_seek(100000, "contribution", initial_amount=2000, monthly_rate=0.008, months=60)
+    amount = contribution["monthly_contribution"]
+    assert Decimal(contribution["final_balance"]) >= 100000
+    below = SimulationService.simulate_fixed_contribution(2000, Decimal(amount) - Decimal("0.01"), 0.008, 60)
+    assert below.final_balance.amount < 100000
+
+    months = SimulationService.goal_seek(100000, "months", initial_amount=2000, monthly_contribution=1000, monthly_rate=0.008)
+    assert months["months"] == 72
+    assert SimulationService.simulate_fixed_contribution(2000, 1000, 0.008, 71).final_balance.amount < 100000
+
+    rate = SimulationService.goal_seek(100000, "rate", initial_amount=2000, monthly_contribution=1000, months=60)
+    assert abs(Decimal(rate["final_balance"]) - 100000) <= rounding_error_bound(rate["monthly_rate"], 60)
+
+
+def test_goal_seek_meta_inalcancavel():
+    # Taxa negativa: o saldo converge para -aporte/taxa = 10.000
+    with pytest.raises(ValueError):
+        SimulationService.goal_seek(10000, "months", initial_amount=2000, monthly_contribution=100, monthly_rate=-0.01)
+    with pytest.raises(ValueError):
+        SimulationService.goal_seek(10000, "contribution", initial_amount=0, months=12)
+
+
+@pytest.mark.parametrize("solve_for, params", [
+    ("contribution", {"monthly_rate": 0.01, "months": 100000}),
+    ("rate", {"monthly_contribution": 100, "months": 10**6}),
+])
+def test_goal_seek_limita_prazo_informado(solve_for, params):
+    with pytest.raises(ValueError, match="months"):
+        SimulationService.goal_seek(100000, solve_for, initial_amount=1000, **params)
+
+
+def test_goal_seek_estouro_vira_value_error():
+    # 6^1200 não cabe em float: erro de validação, não OverflowError
+    with pytest.raises(ValueError):
+        SimulationService.goal_seek(100000, "contribution", initial_amount=10, monthly_rate=5, months=1200)
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_carteira_igual_a_simulacoes_individuais(use_numpy):
+    from finance.investment_models import Investment
+    from finance.models import Money
+
+    investments = [
+        Investment(name=name, type="renda_fixa", initial_amount=Money(amount), current_amount=Money(amount),
+                   monthly_rate=rate, user_id="u1")
+        for name, amount, rate in [("CDB", "2000", 0.008), ("Tesouro", "500.50", 0.0), ("Fundo", "10000", 0.012)]
+    ]
+    contributions = {investments[0].id: 1000, investments[2].id: "250.75"}
+    portfolio = SimulationService.simulate_portfolio(investments, 36, contributions, every=12, use_numpy=use_numpy)
+    assert portfolio["months"] == [0, 12, 24, 36]
+
+    for inv, position in zip(investments, portfolio["positions"]):
+        single = SimulationService.simulate_fixed_contribution(
+            inv.current_amount.amount, contributions.get(inv.id, 0), inv.monthly_rate, 36, mode="fast"
+        )
+        assert position["final_balance"] == single.final_balance.cents
+        assert position["total_contributed"] == single.total_contributed.cents
+    assert portfolio["total"]["balance"][-1] == sum(p["final_balance"] for p in portfolio["positions"])
+
+    with pytest.raises(ValueError):
+        SimulationService.simulate_portfolio(investments, 12, {"desconhecido": 10})
@@ -0,0 +1,99 @@
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+from finance.report_service import ReportService
+from finance.repository import JSONTransactionRepository
+from finance.services import FinanceService
+from finance.stats import RELATIVE_ACCURACY, QuantileSketch, RunningStats
+from finance.storage import JSONStorage
+
+
+def test_welford_mescla_e_remove():
+    rng = random.Random(3)
+    values = [rng.randint(1, 100_000) for _ in range(500)]
+
+    left, right = RunningStats(), RunningStats()
+    for v in values[:200]:
+        left.add(v)
+    for v in values[200:]:
+        right.add(v)
+    left.merge(right)
+    assert left.count == 500
+    assert abs(left.mean - statistics.fmean(values)) < 1e-6
+    assert abs(left.stddev - statistics.stdev(values)) < 1e-6
+    assert (left.min, left.max) == (min(values), max(values))
+
+    for v in values[:499]:
+        left.remove(v)
+    assert left.count == 1 and abs(left.mean - values[-1]) < 1e-6
+
+
+def test_sketch_percentis_com_erro_relativo():
+    rng = random.Random(5)
+    values = sorted(rng.randint(100, 5_000_000) for _ in range(5000))
+    a, b = QuantileSketch(), QuantileSketch()
+    for i, v in enumerate(values):
+        (a if i % 2 else b).add(v)
+    a.merge(b)
+    for q in (0.5, 0.9, 0.99):
+        exact = values[round(q * (len(values) - 1))]
+        assert abs(a.quantile(q) - exact) <= 2 * RELATIVE_ACCURACY * exact
+
+
+def test_spending_stats_mensal_igual_a_passada_unica(tmp_path):
+    repo = JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+    svc = FinanceService(repo)
+    rng = random.Random(11)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    ids = []
+    for _ in range(200):
+        tx = svc.add_transaction(
+            type=rng.choice(["expense", "expense", "income"]), amount=f"{rng.randint(100, 90_000) / 100:.2f}",
+            description="x", category=rng.choice(["Mercado", "Lazer"]), user_id="u1",
+            occurred_at=base + timedelta(days=rng.randint(0, 89)),
+        )
+        ids.append(tx.id)
+    for id in rng.sample(ids, 40):
+        svc.remove(id)
+    assert repo.verify() == {}
+
+    reports = ReportService(repo)
+    start, end = datetime(2025, 2, 1), datetime(2025, 3, 31, 23, 59, 59, 999999)
+    from_months = reports.spending_stats("u1", start, end)
+    one_pass = reports.spending_stats("u1", start, end, batch=repo.batch_by_user("u1"))
+
+    assert from_months.keys() == one_pass.keys() == {"Lazer", "Mercado"}
+    for name, stats in one_pass.items():
+        assert {k: from_months[name][k] for k in ("count", "mean", "stddev", "min", "max")} == {
+            k: stats[k] for k in ("count", "mean", "stddev", "min", "max")
+        }
+        assert stats["min"] <= stats["p50"] <= stats["p90"] <= stats["p99"] <= stats["max"]
+
+
+def test_remover_o_minimo_recalcula_extremos_exatos(tmp_path):
+    repo = JSONTransactionRepository(JSONStorage(tmp_path / "transactions.json"))
+    svc = FinanceService(repo)
+    when = datetime(2025, 1, 10, tzinfo=timezone.utc)
+
+    def add(amount):
+        return svc.add_transaction(type="expense", amount=amount, description="x", category="Mercado",
+                                   user_id="u1", occurred_at=when)
+
+    low, duplicate = add("10.00"), add("10.00")
+    add("55.55")
+    add("123.45")
+    high = add("9000.00")
+
+    def extremes():
+        stats = ReportService(repo).spending_stats("u1")["Mercado"]
+        return stats["min"], stats["max"]
+
+    # Ainda resta outra despesa de 10,00
+    svc.remove(low.id)
+    assert extremes() == (1000, 900000)
+    svc.remove(duplicate.id)
+    assert extremes() == (5555, 900000)
+    svc.remove(high.id)
+    assert extremes() == (5555, 12345)
+    assert repo.verify() == {}
+    assert "stale" not in repo.spending("u1")["2025-01"]["Mercado"]
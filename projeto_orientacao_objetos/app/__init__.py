@@ -1,3 +1,4 @@
+import click
 from flask import Flask
 from flask_caching import Cache
 from config import config
@@ -23,4 +24,65 @@ def create_app(config_name=None):
 
     app.cache = cache
 
+    if app.config.get('ACCRUAL_INTERVAL', 0) > 0 and not app.testing:
+        from app.repositories import JSONStorage, InvestmentRepository
+        from app.services import AccrualService
+
+        investment_repository = InvestmentRepository(JSONStorage(app.config['INVESTMENTS_DB_PATH']))
+        AccrualService(investment_repository).run_every(app.config['ACCRUAL_INTERVAL'])
+
+    @app.cli.command('verify-totals')
+    @click.option('--repair', is_flag=True, help='Reconstrói os totais divergentes a partir do histórico.')
+    def verify_totals(repair):
+        from app.repositories import JSONStorage, TransactionRepository
+        from app.services import FinanceService
+
+        storage = JSONStorage(app.config['TRANSACTIONS_DB_PATH'])
+        finance_service = FinanceService(TransactionRepository(storage))
+        mismatched = finance_service.verify_totals(repair=repair)
+
+        if not mismatched:
+            click.echo('Totais consistentes.')
+        else:
+            status = 'reconstruídos' if repair else 'divergentes'
+            click.echo(f"Totais {status} para: {', '.join(mismatched)}")
+
+    @app.cli.command('accrue-investments')
+    def accrue_investments():
+        from app.repositories import JSONStorage, InvestmentRepository
+        from app.services import AccrualService
+
+        accrual_service = AccrualService(InvestmentRepository(JSONStorage(app.config['INVESTMENTS_DB_PATH'])))
+        result = accrual_service.accrue_all()
+
+        click.echo(
+            f"Investimentos: {result['checked']} | Atualizados: {result['accrued']} | "
+            f"Sem data de referência (marcados agora): {result['baselined']} | Rendimento: {result['interest']}"
+        )
+
+    @app.cli.command('import-statement')
+    @click.argument('file', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--user', 'user_id', required=True, help='ID do usuário dono das transações.')
+    @click.option('--format', 'format_', type=click.Choice(['csv', 'ofx']), help='Padrão: extensão do arquivo.')
+    @click.option('--batch-size', default=25000, show_default=True, help='Transações gravadas por lote.')
+    def import_statement(file, user_id, format_, batch_size):
+        from app.repositories import JSONStorage, TransactionRepository, CategoryRepository
+        from app.services import CategoryService, ImportService
+
+        transaction_repository = TransactionRepository(JSONStorage(app.config['TRANSACTIONS_DB_PATH']))
+        category_service = CategoryService(CategoryRepository(JSONStorage(app.config['CATEGORIES_DB_PATH'])))
+        import_service = ImportService(transaction_repository, category_service, batch_size=batch_size)
+
+        format_ = format_ or ('ofx' if file.lower().endswith('.ofx') else 'csv')
+
+        def progress(result):
+            click.echo(f"... {result['processed']} lidas, {result['imported']} importadas, {result['duplicates']} duplicadas")
+
+        with open(file, encoding='utf-8-sig', newline='') as f:
+            result = import_service.import_file(user_id, f, format_, on_progress=progress)
+
+        click.echo(f"Importadas: {result['imported']} | Duplicadas: {result['duplicates']} | Com erro: {result['failed']}")
+        for error in result['errors']:
+            click.echo(f'- {error}')
+
     return app
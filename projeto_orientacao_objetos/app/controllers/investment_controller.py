@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash
 from app.repositories import JSONStorage, InvestmentRepository
-from app.services import InvestmentService
+from app.services import InvestmentService, CacheService
 from app.models import Investment
 from config import Config
 from .auth_controller import login_required
@@ -11,6 +11,7 @@ investment_bp = Blueprint('investment', __name__, url_prefix='/investments')
 investments_storage = JSONStorage(Config.INVESTMENTS_DB_PATH)
 investment_repository = InvestmentRepository(investments_storage)
 investment_service = InvestmentService(investment_repository)
+investment_cache = CacheService(investment_repository)
 
 @investment_bp.route('/', methods=['GET'])
 @login_required
@@ -22,9 +23,16 @@ def list_investments():
 
         investments.sort(key=lambda inv: inv.start_date, reverse=True)
 
-        total_invested = investment_service.get_total_invested(user_id)
-        total_current = investment_service.get_total_current_value(user_id)
-        total_profit = investment_service.get_total_profit(user_id)
+        totals = investment_cache.memoize(
+            'investment_totals',
+            user_id,
+            lambda: (
+                investment_service.get_total_invested(user_id),
+                investment_service.get_total_current_value(user_id),
+                investment_service.get_total_profit(user_id)
+            )
+        )
+        total_invested, total_current, total_profit = totals
 
         investment_types = Investment.VALID_TYPES
 
@@ -1,6 +1,6 @@
-from flask import Blueprint, render_template, request, session, flash, redirect, url_for
+from flask import Blueprint, render_template, request, session, flash, redirect, url_for, jsonify
 from app.repositories import JSONStorage, TransactionRepository, CategoryRepository
-from app.services import ReportService, CategoryService
+from app.services import ReportService, CategoryService, DashboardService, CacheService
 from app.models import Category
 from config import Config
 from .auth_controller import login_required
@@ -16,6 +16,10 @@ report_service = ReportService(transaction_repository)
 categories_storage = JSONStorage(Config.CATEGORIES_DB_PATH)
 category_repository = CategoryRepository(categories_storage)
 category_service = CategoryService(category_repository)
+dashboard_service = DashboardService(transaction_repository, category_service)
+
+# Relatórios dependem das transações e das categorias do usuário
+report_cache = CacheService(transaction_repository, category_repository)
 
 @report_bp.route('/', methods=['GET'])
 @login_required
@@ -24,25 +28,51 @@ def index():
 
     try:
 
-        current_month_report = report_service.get_monthly_report(user_id)
+        dashboard = report_cache.memoize(
+            'reports_dashboard',
+            user_id,
+            lambda: dashboard_service.get_reports_dashboard(user_id)
+        )
 
-        top_categories = report_service.get_top_categories(user_id, limit=5)
+        return render_template('reports/index.html', **dashboard)
+
+    except Exception as e:
+        flash(f'Erro ao gerar relatórios: {str(e)}', 'error')
+        return redirect(url_for('transaction.list_transactions'))
 
-        yearly_summary = report_service.get_yearly_summary(user_id)
+@report_bp.route('/api/balance-series', methods=['GET'])
+@login_required
+def balance_series():
+    user_id = session.get('user_id')
+    granularity = request.args.get('granularity', 'day')
 
-        categories = category_service.get_categories_grouped(user_id)
+    try:
+        start_date = None
+        end_date = None
 
-        return render_template(
-            'reports/index.html',
-            current_month_report=current_month_report,
-            top_categories=top_categories,
-            yearly_summary=yearly_summary,
-            categories=categories
+        if request.args.get('start_date'):
+            start_date = datetime.fromisoformat(request.args['start_date'])
+        if request.args.get('end_date'):
+            end_date = datetime.fromisoformat(request.args['end_date'])
+
+        series = report_cache.memoize(
+            'balance_series',
+            user_id,
+            lambda: report_service.get_balance_series(user_id, granularity, start_date, end_date),
+            granularity, start_date, end_date
         )
 
-    except Exception as e:
-        flash(f'Erro ao gerar relatórios: {str(e)}', 'error')
-        return redirect(url_for('transaction.list_transactions'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Arrays paralelos: um rótulo de período e um valor por posição
+    return jsonify({
+        'granularity': series['granularity'],
+        'periods': series['periods'],
+        'income': [str(m.amount) for m in series['income']],
+        'expense': [str(m.amount) for m in series['expense']],
+        'balance': [str(m.amount) for m in series['balance']],
+    })
 
 @report_bp.route('/by-category', methods=['GET', 'POST'])
 @login_required
@@ -81,11 +111,16 @@ def by_category():
                     return redirect(url_for('report.by_category'))
 
             report_type = transaction_type if transaction_type else None
-            report_data = report_service.get_report_by_category(
+            report_data = report_cache.memoize(
+                'report_by_category',
                 user_id,
-                transaction_type=report_type,
-                start_date=start_date,
-                end_date=end_date
+                lambda: report_service.get_report_by_category(
+                    user_id,
+                    transaction_type=report_type,
+                    start_date=start_date,
+                    end_date=end_date
+                ),
+                report_type, start_date, end_date
             )
 
             filters = {
@@ -130,11 +165,16 @@ def monthly():
                 return redirect(url_for('report.monthly'))
 
             report_type = transaction_type if transaction_type else None
-            report_data = report_service.get_monthly_report(
+            report_data = report_cache.memoize(
+                'monthly_report',
                 user_id,
-                year=year,
-                month=month,
-                transaction_type=report_type
+                lambda: report_service.get_monthly_report(
+                    user_id,
+                    year=year,
+                    month=month,
+                    transaction_type=report_type
+                ),
+                year, month, report_type
             )
 
             selected_month = month
@@ -191,11 +231,16 @@ def period():
                 return redirect(url_for('report.period'))
 
             report_type = transaction_type if transaction_type else None
-            report_data = report_service.get_period_report(
+            report_data = report_cache.memoize(
+                'period_report',
                 user_id,
-                start_date=start_date,
-                end_date=end_date,
-                transaction_type=report_type
+                lambda: report_service.get_period_report(
+                    user_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    transaction_type=report_type
+                ),
+                start_date, end_date, report_type
             )
 
             filters = {
@@ -232,7 +277,12 @@ def yearly():
         try:
             year = int(year_str) if year_str else datetime.now(timezone.utc).year
 
-            report_data = report_service.get_yearly_summary(user_id, year=year)
+            report_data = report_cache.memoize(
+                'yearly_summary',
+                user_id,
+                lambda: report_service.get_yearly_summary(user_id, year=year),
+                year
+            )
             selected_year = year
 
         except ValueError:
@@ -275,10 +325,15 @@ def category_trend(category_name):
             except ValueError:
                 months = 12
 
-        trend_data = report_service.get_category_trend(
+        trend_data = report_cache.memoize(
+            'category_trend',
             user_id,
-            category_name,
-            months=months
+            lambda: report_service.get_category_trend(
+                user_id,
+                category_name,
+                months=months
+            ),
+            category_name, months
         )
 
         if not trend_data:
@@ -1,10 +1,12 @@
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, Response, stream_with_context
 from app.repositories import JSONStorage, TransactionRepository, CategoryRepository
-from app.services import FinanceService, CategoryService
+from app.services import FinanceService, CategoryService, DashboardService, CacheService, ExportService, ImportService
 from app.models import Category
 from config import Config
 from .auth_controller import login_required
 from datetime import datetime, timezone
+import io
+import json
 
 transaction_bp = Blueprint('transaction', __name__, url_prefix='/transactions')
 
@@ -15,6 +17,10 @@ finance_service = FinanceService(transaction_repository)
 categories_storage = JSONStorage(Config.CATEGORIES_DB_PATH)
 category_repository = CategoryRepository(categories_storage)
 category_service = CategoryService(category_repository)
+dashboard_service = DashboardService(transaction_repository, category_service)
+dashboard_cache = CacheService(transaction_repository, category_repository)
+export_service = ExportService(transaction_repository)
+import_service = ImportService(transaction_repository, category_service)
 
 @transaction_bp.route('/', methods=['GET'])
 @login_required
@@ -22,26 +28,15 @@ def list_transactions():
     user_id = session.get('user_id')
 
     try:
-        transactions = finance_service.list_transactions(user_id)
-
-        transactions.sort(key=lambda tx: tx.occurred_at, reverse=True)
-
-        balance = finance_service.get_balance(user_id)
-        income_total = finance_service.get_income_total(user_id)
-        expense_total = finance_service.get_expense_total(user_id)
-
-        # Agora as categorias são dinâmicas, não mais estáticas
-        categories = category_service.get_categories_grouped(user_id)
-
-        return render_template(
-            'transactions/list.html',
-            transactions=transactions,
-            balance=balance,
-            income_total=income_total,
-            expense_total=expense_total,
-            categories=categories
+        # Lista, totais e categorias saem de uma única leitura
+        dashboard = dashboard_cache.memoize(
+            'transactions_dashboard',
+            user_id,
+            lambda: dashboard_service.get_transactions_dashboard(user_id)
         )
 
+        return render_template('transactions/list.html', **dashboard)
+
     except Exception as e:
         flash(f'Erro ao listar transações: {str(e)}', 'error')
         return redirect(url_for('auth.logout'))
@@ -67,6 +62,88 @@ def get_categories():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@transaction_bp.route('/export', methods=['GET'])
+@login_required
+def export_transactions():
+    user_id = session.get('user_id')
+    format_ = request.args.get('format', 'csv')
+
+    if format_ not in ExportService.FORMATS:
+        flash('Formato de exportação inválido', 'error')
+        return redirect(url_for('transaction.list_transactions'))
+
+    try:
+        start_date = None
+        end_date = None
+
+        if request.args.get('start_date'):
+            start_date = datetime.fromisoformat(request.args['start_date'])
+            if start_date.tzinfo is None:
+                start_date = start_date.replace(tzinfo=timezone.utc)
+
+        if request.args.get('end_date'):
+            end_date_str = request.args['end_date']
+            end_date = datetime.fromisoformat(end_date_str)
+            if end_date.tzinfo is None:
+                end_date = end_date.replace(tzinfo=timezone.utc)
+            # Data final sem horário inclui o dia inteiro
+            if len(end_date_str) == 10:
+                end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+    except ValueError:
+        flash('Data inválida', 'error')
+        return redirect(url_for('transaction.list_transactions'))
+
+    records = export_service.records(
+        user_id,
+        start_date=start_date,
+        end_date=end_date,
+        type_=request.args.get('type') or None,
+        category=request.args.get('category') or None
+    )
+
+    # Corpo gerado sob demanda e enviado em partes (chunked)
+    return Response(
+        stream_with_context(export_service.stream(format_, records)),
+        mimetype=ExportService.FORMATS[format_],
+        headers={'Content-Disposition': f'attachment; filename=transacoes.{format_}'}
+    )
+
+@transaction_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_transactions():
+    user_id = session.get('user_id')
+
+    if request.method == 'POST':
+        upload = request.files.get('file')
+
+        if not upload or not upload.filename:
+            flash('Selecione um arquivo de extrato', 'error')
+            return redirect(url_for('transaction.import_transactions'))
+
+        format_ = request.form.get('format') or ('ofx' if upload.filename.lower().endswith('.ofx') else 'csv')
+
+        try:
+            mapping = json.loads(request.form['mapping']) if request.form.get('mapping') else None
+            stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+            result = import_service.import_file(user_id, stream, format_, mapping)
+
+        except ValueError as e:
+            flash(f'Erro ao importar extrato: {str(e)}', 'error')
+            return redirect(url_for('transaction.import_transactions'))
+
+        flash(
+            f"Extrato importado: {result['imported']} novas, "
+            f"{result['duplicates']} duplicadas, {result['failed']} com erro",
+            'success' if not result['failed'] else 'warning'
+        )
+        for error in result['errors'][:10]:
+            flash(error, 'error')
+
+        return redirect(url_for('transaction.list_transactions'))
+
+    return render_template('transactions/import.html')
+
 @transaction_bp.route('/create', methods=['GET', 'POST'])
 @login_required
 def create_transaction():
@@ -4,11 +4,11 @@ from .money import Money
 
 class Investment:
 
-    __slots__ = ('_id', '_name', '_type', '_initial_amount', '_current_amount', '_monthly_rate', '_user_id', '_start_date', '_notes')
+    __slots__ = ('_id', '_name', '_type', '_initial_amount', '_current_amount', '_monthly_rate', '_user_id', '_start_date', '_notes', '_last_accrued_at')
 
     VALID_TYPES = ('renda_fixa', 'renda_variavel', 'fundo', 'criptomoeda', 'outro')
 
-    def __init__(self, name, type_, initial_amount, current_amount, monthly_rate, user_id, start_date=None, notes='', id_=None):
+    def __init__(self, name, type_, initial_amount, current_amount, monthly_rate, user_id, start_date=None, notes='', id_=None, last_accrued_at=None):
 
         if not name or not str(name).strip():
             raise ValueError("Nome do investimento obrigatório")
@@ -44,6 +44,12 @@ class Investment:
         if start_date.tzinfo is None:
             start_date = start_date.replace(tzinfo=timezone.utc)
 
+        if isinstance(last_accrued_at, str):
+            last_accrued_at = datetime.fromisoformat(last_accrued_at)
+
+        if last_accrued_at is not None and last_accrued_at.tzinfo is None:
+            last_accrued_at = last_accrued_at.replace(tzinfo=timezone.utc)
+
         self._id = id_ or uuid.uuid4().hex
         self._name = str(name).strip()
         self._type = type_
@@ -53,6 +59,8 @@ class Investment:
         self._user_id = str(user_id).strip()
         self._start_date = start_date
         self._notes = str(notes).strip() if notes else ''
+        # Até quando o rendimento mensal já está incorporado ao valor atual
+        self._last_accrued_at = last_accrued_at
 
     @property
     def id(self):
@@ -90,6 +98,10 @@ class Investment:
     def notes(self):
         return self._notes
 
+    @property
+    def last_accrued_at(self):
+        return self._last_accrued_at
+
     @property
     def profit(self):
         return self._current_amount - self._initial_amount
@@ -100,6 +112,21 @@ class Investment:
             return 0.0
         return float((self.profit.amount / self._initial_amount.amount) * 100)
 
+    def with_accrual(self, current_amount, last_accrued_at):
+        # Cópia com o rendimento incorporado; os demais campos ficam como estão
+        return Investment(
+            name=self._name,
+            type_=self._type,
+            initial_amount=self._initial_amount,
+            current_amount=current_amount,
+            monthly_rate=self._monthly_rate,
+            user_id=self._user_id,
+            start_date=self._start_date,
+            notes=self._notes,
+            id_=self._id,
+            last_accrued_at=last_accrued_at,
+        )
+
     def __repr__(self):
         return f"Investment(name='{self._name}', type='{self._type}', current={self._current_amount})"
 
@@ -114,6 +141,7 @@ class Investment:
             "user_id": self._user_id,
             "start_date": self._start_date.isoformat(),
             "notes": self._notes,
+            "last_accrued_at": self._last_accrued_at.isoformat() if self._last_accrued_at else None,
             "profit": self.profit.to_dict(),
             "profit_percentage": self.profit_percentage,
         }
@@ -130,4 +158,5 @@ class Investment:
             start_date=datetime.fromisoformat(data["start_date"]),
             notes=data.get("notes", ""),
             id_=data["id"],
+            last_accrued_at=data.get("last_accrued_at"),
         )
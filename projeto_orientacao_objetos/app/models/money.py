@@ -16,6 +16,14 @@ class Money:
     def amount(self):
         return self._amount
 
+    @property
+    def cents(self):
+        return int(self._amount.scaleb(2))
+
+    @staticmethod
+    def from_cents(cents):
+        return Money(Decimal(int(cents)).scaleb(-2))
+
     def __add__(self, other):
         if not isinstance(other, Money):
             raise TypeError("Operação com Money requer outro Money")
@@ -1,7 +1,33 @@
+import uuid
 from abc import ABC, abstractmethod
 
 class BaseRepository(ABC):
 
+    # Chave reservada para dados derivados gravados junto com os dados de cada usuário
+    META_KEY = '__meta__'
+
+    @classmethod
+    def _user_items(cls, data):
+        return ((key, items) for key, items in data.items() if key != cls.META_KEY)
+
+    def _bump_version(self, data, user_id):
+        # A época muda quando o arquivo é recriado, então versões antigas nunca se repetem
+        meta = data.setdefault(self.META_KEY, {})
+        meta.setdefault('epoch', uuid.uuid4().hex)
+        versions = meta.setdefault('versions', {})
+        versions[user_id] = versions.get(user_id, 0) + 1
+
+    def get_version(self, user_id):
+        signature = self.storage.signature()
+        cached = getattr(self, '_versions_cache', None)
+
+        if cached is None or cached[0] != signature:
+            meta = self.storage.load().get(self.META_KEY, {})
+            cached = (signature, meta.get('epoch', ''), meta.get('versions', {}))
+            self._versions_cache = cached
+
+        return f"{cached[1]}.{cached[2].get(user_id, 0)}"
+
     @abstractmethod
     def add(self, entity):
         pass
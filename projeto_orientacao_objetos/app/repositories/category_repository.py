@@ -21,6 +21,33 @@ class CategoryRepository(BaseRepository):
                 raise ValueError(f'Categoria "{category.name}" ({category.type}) já existe para este usuário')
 
         data[category.user_id].append(category.to_dict())
+        self._bump_version(data, category.user_id)
+        self.storage.save(data)
+
+    def add_many(self, categories):
+        categories = list(categories)
+        for category in categories:
+            if not isinstance(category, Category):
+                raise ValueError('Objeto deve ser uma instância de Category')
+
+        if not categories:
+            return
+
+        data = self.storage.load()
+        users = set()
+
+        for category in categories:
+            existing = data.setdefault(category.user_id, [])
+            for cat in existing:
+                if cat['name'].lower() == category.name.lower() and cat['type'] == category.type:
+                    raise ValueError(f'Categoria "{category.name}" ({category.type}) já existe para este usuário')
+
+            existing.append(category.to_dict())
+            users.add(category.user_id)
+
+        for user_id in users:
+            self._bump_version(data, user_id)
+
         self.storage.save(data)
 
     def update(self, category):
@@ -49,6 +76,7 @@ class CategoryRepository(BaseRepository):
         if not found:
             raise ValueError('Categoria não encontrada')
 
+        self._bump_version(data, category.user_id)
         self.storage.save(data)
 
     def delete(self, category_id, user_id):
@@ -68,6 +96,7 @@ class CategoryRepository(BaseRepository):
         if not found:
             raise ValueError('Categoria não encontrada')
 
+        self._bump_version(data, user_id)
         self.storage.save(data)
 
     def get_by_id(self, category_id, user_id):
@@ -103,7 +132,7 @@ class CategoryRepository(BaseRepository):
         data = self.storage.load()
         all_categories = []
 
-        for user_id, categories in data.items():
+        for user_id, categories in self._user_items(data):
             for cat_data in categories:
                 all_categories.append(Category.from_dict(cat_data))
 
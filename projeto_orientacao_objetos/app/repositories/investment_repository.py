@@ -16,6 +16,7 @@ class InvestmentRepository(BaseRepository):
             data[investment.user_id] = []
 
         data[investment.user_id].append(investment.to_dict())
+        self._bump_version(data, investment.user_id)
         self.storage.save(data)
 
     def update(self, investment):
@@ -37,8 +38,44 @@ class InvestmentRepository(BaseRepository):
         if not found:
             raise ValueError(f"Investimento com ID '{investment.id}' não encontrado")
 
+        self._bump_version(data, investment.user_id)
         self.storage.save(data)
 
+    def apply_accruals(self, accruals):
+        # Itens (lido, valor_atual, last_accrued_at): relê o arquivo e só grava nos investimentos
+        # cujo valor atual, taxa e data do rendimento não mudaram desde a leitura, alterando apenas
+        # o valor atual e a data do rendimento
+        changes = {}
+        for read, current_amount, last_accrued_at in accruals:
+            if not isinstance(read, Investment):
+                raise TypeError("Argumento deve ser uma instância de Investment")
+            changes.setdefault(read.user_id, {})[read.id] = (read, current_amount, last_accrued_at)
+
+        data = self.storage.load()
+        applied = set()
+
+        for user_id, by_id in changes.items():
+            user_changed = False
+            for i, inv_data in enumerate(data.get(user_id, [])):
+                change = by_id.get(inv_data['id'])
+                if change is None:
+                    continue
+                read, current_amount, last_accrued_at = change
+                stored = Investment.from_dict(inv_data)
+                if (stored.current_amount != read.current_amount
+                        or stored.monthly_rate != read.monthly_rate
+                        or stored.last_accrued_at != read.last_accrued_at):
+                    continue
+                data[user_id][i] = stored.with_accrual(current_amount, last_accrued_at).to_dict()
+                applied.add(stored.id)
+                user_changed = True
+            if user_changed:
+                self._bump_version(data, user_id)
+
+        if applied:
+            self.storage.save(data)
+        return applied
+
     def delete(self, investment_id, user_id):
         data = self.storage.load()
 
@@ -55,6 +92,7 @@ class InvestmentRepository(BaseRepository):
         if not found:
             raise ValueError(f"Investimento com ID '{investment_id}' não encontrado")
 
+        self._bump_version(data, user_id)
         self.storage.save(data)
 
     def get_by_id(self, investment_id, user_id):
@@ -73,7 +111,7 @@ class InvestmentRepository(BaseRepository):
         data = self.storage.load()
         investments = []
 
-        for user_id, user_investments in data.items():
+        for user_id, user_investments in self._user_items(data):
             for inv_data in user_investments:
                 investments.append(Investment.from_dict(inv_data))
 
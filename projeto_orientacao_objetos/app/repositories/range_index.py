@@ -0,0 +1,78 @@
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+
+# Somas prefixadas sobre os dias com movimento de um usuário: qualquer
+# intervalo de dias sai de duas buscas binárias, em O(log dias).
+
+def as_day(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+GRANULARITIES = ('day', 'week', 'month')
+MAX_SERIES_POINTS = 10000
+
+
+def period_start(day, granularity):
+    # Semanas ISO começam na segunda-feira
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period(start, granularity):
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    if granularity == 'month':
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+class RangeIndex:
+
+    def __init__(self, daily):
+        items = sorted(daily.items())
+        self.days = [date.fromisoformat(day).toordinal() for day, _ in items]
+        self._income = [0] * (len(items) + 1)
+        self._expense = [0] * (len(items) + 1)
+
+        for i, (_, (income, expense, _)) in enumerate(items, start=1):
+            self._income[i] = self._income[i - 1] + income
+            self._expense[i] = self._expense[i - 1] + expense
+
+    def series(self, granularity='day', start=None, end=None):
+        if granularity not in GRANULARITIES:
+            raise ValueError('Granularidade deve ser "day", "week" ou "month"')
+
+        result = {'periods': [], 'income': [], 'expense': [], 'balance': []}
+
+        first = as_day(start) if start is not None else (date.fromordinal(self.days[0]) if self.days else None)
+        last = as_day(end) if end is not None else (date.fromordinal(self.days[-1]) if self.days else None)
+        if first is None or last is None or first > last:
+            return result
+
+        # Períodos contínuos; o saldo de cada um é o acumulado desde o início do histórico
+        period = period_start(first, granularity)
+        lo = bisect_left(self.days, first.toordinal())
+        stop = last.toordinal() + 1
+
+        while period <= last:
+            if len(result['periods']) >= MAX_SERIES_POINTS:
+                raise ValueError(f'Intervalo longo demais: mais de {MAX_SERIES_POINTS} períodos')
+
+            following = next_period(period, granularity)
+            hi = bisect_left(self.days, min(following.toordinal(), stop), lo)
+
+            result['periods'].append(period.strftime('%Y-%m') if granularity == 'month' else period.isoformat())
+            result['income'].append(self._income[hi] - self._income[lo])
+            result['expense'].append(self._expense[hi] - self._expense[lo])
+            result['balance'].append(self._income[hi] - self._expense[hi])
+
+            lo, period = hi, following
+
+        return result
@@ -0,0 +1,32 @@
+from flask import g, has_request_context
+
+# Conteúdo dos arquivos JSON já lidos na requisição atual, por caminho.
+# Fora de uma requisição (CLI, scripts) as leituras vão sempre ao disco.
+MISSING = object()
+
+
+def _snapshots():
+    if not has_request_context():
+        return None
+    if 'storage_snapshots' not in g:
+        g.storage_snapshots = {}
+    return g.storage_snapshots
+
+
+def lookup(path):
+    snapshots = _snapshots()
+    if snapshots is None:
+        return MISSING
+    return snapshots.get(str(path), MISSING)
+
+
+def remember(path, data):
+    snapshots = _snapshots()
+    if snapshots is not None:
+        snapshots[str(path)] = data
+
+
+def forget(path):
+    snapshots = _snapshots()
+    if snapshots is not None:
+        snapshots.pop(str(path), None)
@@ -2,11 +2,12 @@ import json
 import os
 from pathlib import Path
 from threading import Lock
+from . import snapshot
 
 class JSONStorage:
 
     def __init__(self, file_path):
-        self.file_path = Path(file_path)
+        self.file_path = Path(file_path).absolute()
         self._lock = Lock()
 
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -15,16 +16,30 @@ class JSONStorage:
             self._write_data({})
 
     def load(self):
+        # Dentro de uma requisição, cada arquivo é lido no máximo uma vez
+        data = snapshot.lookup(self.file_path)
+        if data is not snapshot.MISSING:
+            return data
+
         with self._lock:
             try:
                 with open(self.file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 return {}
 
+        snapshot.remember(self.file_path, data)
+        return data
+
     def save(self, data):
         with self._lock:
+            snapshot.forget(self.file_path)
             self._write_data(data)
+            snapshot.remember(self.file_path, data)
+
+    def signature(self):
+        st = os.stat(self.file_path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
 
     def _write_data(self, data):
 
@@ -1,29 +1,133 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 from .base import BaseRepository
+from .range_index import RangeIndex
 from ..models import Transaction
 
 class TransactionRepository(BaseRepository):
 
     def __init__(self, storage):
         self.storage = storage
+        self._meta_cache = None
+        self._index_cache = {}
+
+    def _load(self):
+        data = self.storage.load()
+        meta = data.setdefault(self.META_KEY, {})
+
+        # Arquivos antigos não têm os agregados: reconstrói a partir do histórico
+        if 'totals' not in meta:
+            meta['totals'] = self._build_totals(data)
+        if 'daily' not in meta:
+            meta['daily'] = self._build_daily(data)
+
+        return data
+
+    def _save(self, data):
+        self.storage.save(data)
+        self._meta_cache = (self.storage.signature(), data[self.META_KEY])
+        self._index_cache = {}
+
+    def _meta(self):
+        signature = self.storage.signature()
+
+        if self._meta_cache is None or self._meta_cache[0] != signature:
+            self._meta_cache = (signature, self._load()[self.META_KEY])
+            self._index_cache = {}
+
+        return self._meta_cache[1]
+
+    def _build_totals(self, data):
+        totals = {}
+        for user_id, user_transactions in self._user_items(data):
+            for tx_data in user_transactions:
+                self._apply_totals(totals, user_id, tx_data, 1)
+        return totals
+
+    def _build_daily(self, data):
+        daily = {}
+        for user_id, user_transactions in self._user_items(data):
+            for tx_data in user_transactions:
+                self._apply_daily(daily, user_id, tx_data, 1)
+        return daily
+
+    def _apply(self, data, user_id, tx_data, direction):
+        meta = data[self.META_KEY]
+        self._apply_totals(meta['totals'], user_id, tx_data, direction)
+        self._apply_daily(meta['daily'], user_id, tx_data, direction)
+
+    @staticmethod
+    def _apply_totals(totals, user_id, tx_data, direction):
+        counters = totals.setdefault(user_id, {'income': 0, 'expense': 0, 'count': 0})
+        cents = int(Decimal(tx_data['amount']['amount']).scaleb(2))
+        counters[tx_data['type']] += direction * cents
+        counters['count'] += direction
+
+        if counters['count'] == 0:
+            del totals[user_id]
+
+    @staticmethod
+    def _apply_daily(daily, user_id, tx_data, direction):
+        occurred_at = datetime.fromisoformat(tx_data['occurred_at'])
+        if occurred_at.tzinfo is not None:
+            occurred_at = occurred_at.astimezone(timezone.utc)
+
+        # Baldes por dia UTC: [receitas, despesas, quantidade] em centavos
+        day = occurred_at.date().isoformat()
+        days = daily.setdefault(user_id, {})
+        bucket = days.setdefault(day, [0, 0, 0])
+        bucket[0 if tx_data['type'] == 'income' else 1] += direction * int(Decimal(tx_data['amount']['amount']).scaleb(2))
+        bucket[2] += direction
+
+        if bucket[2] == 0:
+            del days[day]
+            if not days:
+                del daily[user_id]
 
     def add(self, transaction):
         if not isinstance(transaction, Transaction):
             raise TypeError("Argumento deve ser uma instância de Transaction")
 
-        data = self.storage.load()
+        data = self._load()
 
         if transaction.user_id not in data:
             data[transaction.user_id] = []
 
-        data[transaction.user_id].append(transaction.to_dict())
-        self.storage.save(data)
+        tx_data = transaction.to_dict()
+        data[transaction.user_id].append(tx_data)
+        self._apply(data, transaction.user_id, tx_data, 1)
+        self._bump_version(data, transaction.user_id)
+        self._save(data)
+
+    def add_many(self, transactions):
+        transactions = list(transactions)
+        for transaction in transactions:
+            if not isinstance(transaction, Transaction):
+                raise TypeError("Argumento deve ser uma instância de Transaction")
+
+        if not transactions:
+            return
+
+        # Uma leitura e uma gravação para o lote inteiro
+        data = self._load()
+        users = set()
+
+        for transaction in transactions:
+            tx_data = transaction.to_dict()
+            data.setdefault(transaction.user_id, []).append(tx_data)
+            self._apply(data, transaction.user_id, tx_data, 1)
+            users.add(transaction.user_id)
+
+        for user_id in users:
+            self._bump_version(data, user_id)
+
+        self._save(data)
 
     def update(self, transaction):
         if not isinstance(transaction, Transaction):
             raise TypeError("Argumento deve ser uma instância de Transaction")
 
-        data = self.storage.load()
+        data = self._load()
 
         if transaction.user_id not in data:
             raise ValueError(f"Nenhuma transação encontrada para o usuário '{transaction.user_id}'")
@@ -31,17 +135,21 @@ class TransactionRepository(BaseRepository):
         found = False
         for i, tx_data in enumerate(data[transaction.user_id]):
             if tx_data['id'] == transaction.id:
-                data[transaction.user_id][i] = transaction.to_dict()
+                new_data = transaction.to_dict()
+                data[transaction.user_id][i] = new_data
+                self._apply(data, transaction.user_id, tx_data, -1)
+                self._apply(data, transaction.user_id, new_data, 1)
                 found = True
                 break
 
         if not found:
             raise ValueError(f"Transação com ID '{transaction.id}' não encontrada")
 
-        self.storage.save(data)
+        self._bump_version(data, transaction.user_id)
+        self._save(data)
 
     def delete(self, transaction_id, user_id):
-        data = self.storage.load()
+        data = self._load()
 
         if user_id not in data:
             raise ValueError(f"Nenhuma transação encontrada para o usuário '{user_id}'")
@@ -50,13 +158,52 @@ class TransactionRepository(BaseRepository):
         for i, tx_data in enumerate(data[user_id]):
             if tx_data['id'] == transaction_id:
                 del data[user_id][i]
+                self._apply(data, user_id, tx_data, -1)
                 found = True
                 break
 
         if not found:
             raise ValueError(f"Transação com ID '{transaction_id}' não encontrada")
 
-        self.storage.save(data)
+        self._bump_version(data, user_id)
+        self._save(data)
+
+    def get_totals(self, user_id):
+        counters = self._meta()['totals'].get(user_id, {})
+        return {
+            'income': counters.get('income', 0),
+            'expense': counters.get('expense', 0),
+            'count': counters.get('count', 0),
+        }
+
+    def get_range_index(self, user_id):
+        meta = self._meta()
+
+        if user_id not in self._index_cache:
+            self._index_cache[user_id] = RangeIndex(meta['daily'].get(user_id, {}))
+
+        return self._index_cache[user_id]
+
+    def verify_totals(self, repair=False):
+        data = self._load()
+        meta = data[self.META_KEY]
+        mismatched = set()
+
+        for key, build in (('totals', self._build_totals), ('daily', self._build_daily)):
+            stored = meta[key]
+            expected = build(data)
+            users = set(stored) | set(expected)
+            wrong = {u for u in users if stored.get(u) != expected.get(u)}
+
+            if wrong and repair:
+                meta[key] = expected
+
+            mismatched |= wrong
+
+        if mismatched and repair:
+            self._save(data)
+
+        return sorted(mismatched)
 
     def get_by_id(self, transaction_id, user_id):
         data = self.storage.load()
@@ -74,7 +221,7 @@ class TransactionRepository(BaseRepository):
         data = self.storage.load()
         transactions = []
 
-        for user_id, user_transactions in data.items():
+        for user_id, user_transactions in self._user_items(data):
             for tx_data in user_transactions:
                 transactions.append(Transaction.from_dict(tx_data))
 
@@ -88,6 +235,12 @@ class TransactionRepository(BaseRepository):
 
         return [Transaction.from_dict(tx_data) for tx_data in data[user_id]]
 
+    def iter_by_user(self, user_id):
+        data = self.storage.load()
+
+        for tx_data in data.get(user_id, []):
+            yield tx_data
+
     def list_by_user_and_type(self, user_id, type_):
         transactions = self.list_by_user(user_id)
         return [tx for tx in transactions if tx.type == type_]
@@ -3,5 +3,10 @@ from .finance_service import FinanceService
 from .investment_service import InvestmentService
 from .report_service import ReportService
 from .category_service import CategoryService
+from .dashboard_service import DashboardService
+from .cache_service import CacheService
+from .export_service import ExportService
+from .import_service import ImportService
+from .accrual_service import AccrualService
 
-__all__ = ['AuthService', 'FinanceService', 'InvestmentService', 'ReportService', 'CategoryService']
+__all__ = ['AuthService', 'FinanceService', 'InvestmentService', 'ReportService', 'CategoryService', 'DashboardService', 'CacheService', 'ExportService', 'ImportService', 'AccrualService']
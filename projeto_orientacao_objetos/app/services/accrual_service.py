@@ -0,0 +1,87 @@
+import logging
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+from ..models import Money
+
+logger = logging.getLogger(__name__)
+
+class AccrualService:
+
+    DAYS_PER_MONTH = 365.25 / 12
+    ONE_DAY = timedelta(days=1)
+
+    def __init__(self, investment_repository):
+        self.investment_repository = investment_repository
+
+    @classmethod
+    def accrue_cents(cls, cents, monthly_rates, days):
+        # Colunas paralelas, uma passada; perda máxima de 100% ao mês (o saldo não fica negativo)
+        return [
+            math.floor(c * max(1.0 + r, 0.0) ** (d / cls.DAYS_PER_MONTH) + 0.5)
+            for c, r, d in zip(cents, monthly_rates, days)
+        ]
+
+    def accrue_all(self, now=None):
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+
+        investments = self.investment_repository.list_all()
+
+        due = []
+        baseline = []
+        for inv in investments:
+            if inv.last_accrued_at is not None:
+                since = inv.last_accrued_at
+            elif inv.current_amount == inv.initial_amount:
+                since = inv.start_date
+            else:
+                # Registro antigo já editado à mão: a primeira execução só marca o ponto de partida
+                baseline.append((inv, inv.current_amount, now))
+                continue
+
+            # Só dias inteiros; a data avança exatamente esses dias, então rodar de novo no mesmo dia não duplica
+            days = (now - since) // self.ONE_DAY
+            if days >= 1:
+                due.append((inv, since, days))
+
+        balances = self.accrue_cents(
+            [inv.current_amount.cents for inv, _, _ in due],
+            [inv.monthly_rate for inv, _, _ in due],
+            [days for _, _, days in due],
+        )
+        changed = [
+            (inv, Money.from_cents(cents), since + days * self.ONE_DAY)
+            for (inv, since, days), cents in zip(due, balances)
+        ]
+
+        # Investimentos editados entre a leitura e a gravação ficam para a próxima execução
+        applied = self.investment_repository.apply_accruals(changed + baseline) if changed or baseline else set()
+
+        interest = sum(amount.cents - inv.current_amount.cents for inv, amount, _ in changed if inv.id in applied)
+        return {
+            'run_at': now.isoformat(),
+            'checked': len(investments),
+            'accrued': sum(inv.id in applied for inv, _, _ in changed),
+            'baselined': sum(inv.id in applied for inv, _, _ in baseline),
+            'interest': Money.from_cents(interest),
+        }
+
+    def run_every(self, interval):
+        # Thread daemon: roda agora e a cada `interval` segundos; sinalizar o evento devolvido encerra
+        stop = threading.Event()
+
+        def run():
+            while True:
+                try:
+                    result = self.accrue_all()
+                    if result['accrued'] or result['baselined']:
+                        logger.info("Rendimento aplicado a %s investimentos (%s)", result['accrued'], result['interest'])
+                except Exception:
+                    logger.exception("Falha ao aplicar rendimento dos investimentos")
+                if stop.wait(interval):
+                    return
+
+        threading.Thread(target=run, name='investment-accrual', daemon=True).start()
+        return stop
@@ -0,0 +1,24 @@
+from flask import current_app, has_app_context
+
+class CacheService:
+
+    def __init__(self, *repositories):
+        # Repositórios cujos dados entram no resultado: a versão de cada um compõe a chave
+        self.repositories = repositories
+
+    def memoize(self, name, user_id, producer, *args, timeout=None):
+        cache = getattr(current_app, 'cache', None) if has_app_context() else None
+
+        if cache is None:
+            return producer()
+
+        versions = ':'.join(repo.get_version(user_id) for repo in self.repositories)
+        params = ':'.join(repr(arg) for arg in args)
+        key = f'{name}:{user_id}:{versions}:{params}'
+
+        value = cache.get(key)
+        if value is None:
+            value = producer()
+            cache.set(key, value, timeout=timeout)
+
+        return value
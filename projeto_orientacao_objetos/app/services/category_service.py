@@ -22,6 +22,24 @@ class CategoryService:
         self.category_repository.add(category)
         return category
 
+    def ensure_categories(self, user_id, pairs):
+        # Resolve vários (nome, tipo) de uma vez, criando os que faltam numa única gravação
+        found = {
+            (cat.name.lower(), cat.type): cat
+            for cat in self.category_repository.list_by_user(user_id)
+        }
+
+        missing = []
+        for name, type_ in pairs:
+            key = (str(name).strip().lower(), type_)
+            if key not in found:
+                category = Category(name=name, type_=type_, user_id=user_id)
+                found[key] = category
+                missing.append(category)
+
+        self.category_repository.add_many(missing)
+        return found
+
     def update_category(self, category_id, user_id, name, type_):
 
         category = self.category_repository.get_by_id(category_id, user_id)
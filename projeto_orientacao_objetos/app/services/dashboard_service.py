@@ -0,0 +1,31 @@
+from ..models import Money
+from .report_service import ReportService
+
+class DashboardService:
+
+    def __init__(self, transaction_repository, category_service):
+        self.transaction_repository = transaction_repository
+        self.category_service = category_service
+        self.report_service = ReportService(transaction_repository)
+
+    def get_transactions_dashboard(self, user_id):
+        transactions = self.transaction_repository.list_by_user(user_id)
+
+        totals = {'income': 0, 'expense': 0}
+        for tx in transactions:
+            totals[tx.type] += tx.amount.cents
+
+        transactions.sort(key=lambda tx: tx.occurred_at, reverse=True)
+
+        return {
+            'transactions': transactions,
+            'balance': Money.from_cents(totals['income'] - totals['expense']),
+            'income_total': Money.from_cents(totals['income']),
+            'expense_total': Money.from_cents(totals['expense']),
+            'categories': self.category_service.get_categories_grouped(user_id)
+        }
+
+    def get_reports_dashboard(self, user_id, now=None):
+        dashboard = self.report_service.get_overview(user_id, now)
+        dashboard['categories'] = self.category_service.get_categories_grouped(user_id)
+        return dashboard
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+class ExportService:
+
+    FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+    CSV_COLUMNS = ['id', 'occurred_at', 'type', 'category', 'description', 'amount']
+
+    def __init__(self, transaction_repository, chunk_rows=500):
+        self.transaction_repository = transaction_repository
+        self.chunk_rows = chunk_rows
+
+    def records(self, user_id, start_date=None, end_date=None, type_=None, category=None):
+        # Percorre os dicts do arquivo sem criar objetos Transaction
+        for tx_data in self.transaction_repository.iter_by_user(user_id):
+            if type_ and tx_data['type'] != type_:
+                continue
+
+            if category and tx_data['category']['name'] != category:
+                continue
+
+            if start_date or end_date:
+                occurred_at = datetime.fromisoformat(tx_data['occurred_at'])
+                if occurred_at.tzinfo is None:
+                    occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+
+                if start_date and occurred_at < start_date:
+                    continue
+                if end_date and occurred_at > end_date:
+                    continue
+
+            yield tx_data
+
+    def stream(self, format_, records):
+        if format_ not in self.FORMATS:
+            raise ValueError('Formato deve ser "csv" ou "ndjson"')
+
+        rows = self._csv_rows(records) if format_ == 'csv' else self._ndjson_rows(records)
+
+        # Junta as linhas em blocos para não enviar um pedaço por transação
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                yield ''.join(chunk)
+                chunk = []
+
+        if chunk:
+            yield ''.join(chunk)
+
+    def _csv_rows(self, records):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def line(values):
+            writer.writerow(values)
+            text = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return text
+
+        yield line(self.CSV_COLUMNS)
+
+        for tx_data in records:
+            yield line([
+                tx_data['id'],
+                tx_data['occurred_at'],
+                tx_data['type'],
+                tx_data['category']['name'],
+                tx_data['description'],
+                tx_data['amount']['amount'],
+            ])
+
+    def _ndjson_rows(self, records):
+        for tx_data in records:
+            yield json.dumps(tx_data, ensure_ascii=False) + '\n'
@@ -60,32 +60,25 @@ class FinanceService:
     def list_transactions_by_date_range(self, user_id, start_date=None, end_date=None):
         return self.transaction_repository.list_by_user_and_date_range(user_id, start_date, end_date)
 
-    def get_balance(self, user_id):
-        transactions = self.list_transactions(user_id)
-
-        total = Money(0)
-        for tx in transactions:
-            total = total + tx.signed_amount
+    def get_totals(self, user_id):
+        counters = self.transaction_repository.get_totals(user_id)
+        return {
+            'income': Money.from_cents(counters['income']),
+            'expense': Money.from_cents(counters['expense']),
+            'balance': Money.from_cents(counters['income'] - counters['expense']),
+        }
 
-        return total
+    def get_balance(self, user_id):
+        return self.get_totals(user_id)['balance']
 
     def get_income_total(self, user_id):
-        transactions = self.list_transactions_by_type(user_id, 'income')
-
-        total = Money(0)
-        for tx in transactions:
-            total = total + tx.amount
-
-        return total
+        return self.get_totals(user_id)['income']
 
     def get_expense_total(self, user_id):
-        transactions = self.list_transactions_by_type(user_id, 'expense')
-
-        total = Money(0)
-        for tx in transactions:
-            total = total + tx.amount
+        return self.get_totals(user_id)['expense']
 
-        return total
+    def verify_totals(self, repair=False):
+        return self.transaction_repository.verify_totals(repair=repair)
 
     def get_expenses_by_category(self, user_id):
         expenses = self.list_transactions_by_type(user_id, 'expense')
@@ -0,0 +1,234 @@
+import csv
+import itertools
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from ..models import Money, Transaction
+
+class ImportService:
+
+    FORMATS = ('csv', 'ofx')
+    DEFAULT_CATEGORY = 'Importado'
+
+    # Nomes de coluna reconhecidos automaticamente (minúsculos)
+    COLUMN_ALIASES = {
+        'date': ('date', 'data', 'occurred_at', 'data lançamento', 'data lancamento'),
+        'amount': ('amount', 'valor', 'value', 'valor (r$)'),
+        'description': ('description', 'descrição', 'descricao', 'histórico', 'historico', 'memo', 'lançamento', 'lancamento'),
+        'category': ('category', 'categoria'),
+        'type': ('type', 'tipo'),
+    }
+
+    TYPE_ALIASES = {
+        'income': 'income', 'receita': 'income', 'credit': 'income', 'crédito': 'income',
+        'credito': 'income', 'c': 'income',
+        'expense': 'expense', 'despesa': 'expense', 'debit': 'expense', 'débito': 'expense',
+        'debito': 'expense', 'd': 'expense',
+    }
+
+    OFX_TAG = re.compile(r'<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)')
+
+    def __init__(self, transaction_repository, category_service, batch_size=25000, max_errors=100):
+        self.transaction_repository = transaction_repository
+        self.category_service = category_service
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    def read(self, stream, format_='csv', mapping=None):
+        if format_ == 'csv':
+            return self._read_csv(stream, mapping)
+        if format_ == 'ofx':
+            return self._read_ofx(stream)
+        raise ValueError('Formato deve ser "csv" ou "ofx"')
+
+    def run(self, user_id, rows):
+        # Produz o resumo (o mesmo dict) após cada lote gravado
+        existing = Counter(self._record_fingerprint(tx_data) for tx_data in self.transaction_repository.iter_by_user(user_id))
+        categories = {}
+        result = {'processed': 0, 'imported': 0, 'duplicates': 0, 'failed': 0, 'errors': []}
+        pending = []
+
+        for line, row in enumerate(rows, start=1):
+            result['processed'] += 1
+            try:
+                parsed = self._parse_row(row)
+            except (KeyError, ValueError) as e:
+                result['failed'] += 1
+                if len(result['errors']) < self.max_errors:
+                    result['errors'].append(f'linha {line}: {e}')
+                continue
+
+            # Cada transação existente absorve uma única linha igual do arquivo
+            key = self._fingerprint(parsed['occurred_at'], parsed['signed_cents'], parsed['description'])
+            if existing[key] > 0:
+                existing[key] -= 1
+                result['duplicates'] += 1
+                continue
+
+            pending.append(parsed)
+            if len(pending) >= self.batch_size:
+                self._commit(user_id, pending, categories, result)
+                yield result
+
+        self._commit(user_id, pending, categories, result)
+        yield result
+
+    def import_file(self, user_id, stream, format_='csv', mapping=None, on_progress=None):
+        result = None
+        for result in self.run(user_id, self.read(stream, format_, mapping)):
+            if on_progress:
+                on_progress(result)
+        return result
+
+    def _commit(self, user_id, pending, categories, result):
+        if not pending:
+            return
+
+        # Categorias novas do lote são resolvidas (e criadas) de uma vez
+        wanted = {(row['category'], row['type']) for row in pending}
+        unseen = [pair for pair in wanted if (pair[0].lower(), pair[1]) not in categories]
+        if unseen:
+            categories.update(self.category_service.ensure_categories(user_id, unseen))
+
+        transactions = [
+            Transaction(
+                type_=row['type'],
+                amount=row['amount'],
+                description=row['description'],
+                category=categories[(row['category'].lower(), row['type'])],
+                user_id=user_id,
+                occurred_at=row['occurred_at']
+            )
+            for row in pending
+        ]
+
+        self.transaction_repository.add_many(transactions)
+        result['imported'] += len(transactions)
+        pending.clear()
+
+    def _parse_row(self, row):
+        amount = self._parse_amount(row['amount'])
+        type_ = self.TYPE_ALIASES.get(str(row.get('type') or '').strip().lower())
+        if type_ is None:
+            type_ = 'expense' if amount < 0 else 'income'
+
+        money = Money(abs(amount))
+        if money.cents == 0:
+            raise ValueError('Valor da transação deve ser positivo')
+        cents = money.cents
+
+        return {
+            'type': type_,
+            'amount': money,
+            'signed_cents': cents if type_ == 'income' else -cents,
+            'description': str(row.get('description') or '').strip() or 'Sem descrição',
+            'category': str(row.get('category') or '').strip() or self.DEFAULT_CATEGORY,
+            'occurred_at': self._parse_date(row['date']),
+        }
+
+    @staticmethod
+    def _parse_amount(value):
+        # "1.234,56", "-12.50", "(30,00)", "R$ 10": o último separador é o decimal
+        text = str(value).strip().replace('R$', '').replace(' ', '')
+        negative = text.startswith('(') and text.endswith(')')
+        text = text.strip('()')
+
+        if ',' in text and '.' in text:
+            if text.rfind(',') > text.rfind('.'):
+                text = text.replace('.', '').replace(',', '.')
+            else:
+                text = text.replace(',', '')
+        elif ',' in text:
+            text = text.replace(',', '.')
+
+        try:
+            amount = Decimal(text)
+        except InvalidOperation as e:
+            raise ValueError(f'Valor inválido: {value!r}') from e
+
+        return -amount if negative else amount
+
+    @staticmethod
+    def _parse_date(value):
+        text = str(value).strip()
+        try:
+            if '/' in text:
+                day, month, year = text[:10].split('/')
+                dt = datetime(int(year), int(month), int(day))
+            elif text[:8].isdigit():
+                # OFX: aaaammdd seguido de hora e fuso opcionais
+                dt = datetime(int(text[:4]), int(text[4:6]), int(text[6:8]))
+            else:
+                dt = datetime.fromisoformat(text)
+        except ValueError as e:
+            raise ValueError(f'Data inválida: {value!r}') from e
+
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+
+    @staticmethod
+    def _fingerprint(occurred_at, signed_cents, description):
+        day = occurred_at.astimezone(timezone.utc).date().isoformat()
+        return day, signed_cents, ' '.join(description.lower().split())
+
+    def _record_fingerprint(self, tx_data):
+        cents = int(Decimal(tx_data['amount']['amount']).scaleb(2))
+        signed = cents if tx_data['type'] == 'income' else -cents
+        return self._fingerprint(self._parse_date(tx_data['occurred_at']), signed, tx_data['description'])
+
+    def _read_csv(self, stream, mapping=None):
+        header = stream.readline()
+        if not header:
+            return
+
+        try:
+            dialect = csv.Sniffer().sniff(header, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.reader(itertools.chain([header], stream), dialect)
+        columns = [c.strip().lstrip('\ufeff') for c in next(reader)]
+        lowered = [c.lower() for c in columns]
+
+        positions = {}
+        for key, aliases in self.COLUMN_ALIASES.items():
+            wanted = (mapping or {}).get(key)
+            if wanted:
+                if wanted not in columns:
+                    raise ValueError(f"Coluna '{wanted}' não encontrada no arquivo")
+                positions[key] = columns.index(wanted)
+                continue
+
+            for alias in aliases:
+                if alias in lowered:
+                    positions[key] = lowered.index(alias)
+                    break
+
+        missing = [k for k in ('date', 'amount', 'description') if k not in positions]
+        if missing:
+            raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            yield {key: row[pos] if pos < len(row) else '' for key, pos in positions.items()}
+
+    def _read_ofx(self, stream):
+        current = None
+        for line in stream:
+            for closing, tag, value in self.OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == 'STMTTRN':
+                    if not closing:
+                        current = {}
+                    elif current is not None:
+                        yield {
+                            'date': current.get('DTPOSTED', ''),
+                            'amount': current.get('TRNAMT', ''),
+                            'description': current.get('MEMO') or current.get('NAME', ''),
+                        }
+                        current = None
+                elif current is not None and not closing:
+                    current[tag] = value.strip()
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from ..models import Investment, Money
 
 class InvestmentService:
@@ -14,7 +15,9 @@ class InvestmentService:
             monthly_rate=monthly_rate,
             user_id=user_id,
             start_date=start_date,
-            notes=notes
+            notes=notes,
+            # O valor atual informado vale a partir de agora
+            last_accrued_at=datetime.now(timezone.utc)
         )
 
         self.investment_repository.add(investment)
@@ -35,6 +38,13 @@ class InvestmentService:
         start_date = kwargs.get('start_date', investment.start_date)
         notes = kwargs.get('notes', investment.notes)
 
+        # O formulário sempre envia o valor atual; só um valor novo reinicia a contagem do rendimento
+        if not isinstance(current_amount, Money):
+            current_amount = Money(current_amount)
+        last_accrued_at = investment.last_accrued_at
+        if current_amount != investment.current_amount:
+            last_accrued_at = datetime.now(timezone.utc)
+
         updated_investment = Investment(
             name=name,
             type_=type_,
@@ -44,7 +54,8 @@ class InvestmentService:
             user_id=user_id,
             start_date=start_date,
             notes=notes,
-            id_=investment_id
+            id_=investment_id,
+            last_accrued_at=last_accrued_at
         )
 
         self.investment_repository.update(updated_investment)
@@ -50,27 +50,11 @@ class ReportService:
 
         transactions = self._filter_by_date_range(transactions, start_date, end_date)
 
-        income_total = Money(0)
-        expense_total = Money(0)
-
+        totals = {'income': 0, 'expense': 0}
         for tx in transactions:
-            if tx.type == 'income':
-                income_total = income_total + tx.amount
-            else:
-                expense_total = expense_total + tx.amount
-
-        balance = income_total - expense_total
+            totals[tx.type] += tx.amount.cents
 
-        return {
-            'year': year,
-            'month': month,
-            'month_name': self._get_month_name(month),
-            'income_total': income_total,
-            'expense_total': expense_total,
-            'balance': balance,
-            'transaction_count': len(transactions),
-            'transactions': sorted(transactions, key=lambda x: x.occurred_at, reverse=True)
-        }
+        return self._month_report(year, month, totals['income'], totals['expense'], transactions)
 
     def get_period_report(self, user_id, start_date, end_date, transaction_type=None):
         transactions = self.transaction_repository.list_by_user(user_id)
@@ -111,39 +95,148 @@ class ReportService:
             ))
         }
 
+    def get_balance_series(self, user_id, granularity='day', start_date=None, end_date=None):
+        # Arrays paralelos lidos das somas prefixadas, sem percorrer as transações
+        series = self.transaction_repository.get_range_index(user_id).series(granularity, start_date, end_date)
+
+        return {
+            'granularity': granularity,
+            'periods': series['periods'],
+            'income': [Money.from_cents(cents) for cents in series['income']],
+            'expense': [Money.from_cents(cents) for cents in series['expense']],
+            'balance': [Money.from_cents(cents) for cents in series['balance']],
+        }
+
     def get_yearly_summary(self, user_id, year=None):
         if year is None:
             year = datetime.now(timezone.utc).year
 
-        monthly_data = []
+        return self._year_summary(year, self.get_span_summary(user_id, year, 1, 12))
 
-        for month in range(1, 13):
-            report = self.get_monthly_report(user_id, year, month)
-            monthly_data.append({
-                'month': month,
-                'month_name': report['month_name'],
-                'income': report['income_total'],
-                'expense': report['expense_total'],
-                'balance': report['balance']
-            })
+    def get_span_summary(self, user_id, start_year, start_month=1, months=12, transaction_type=None):
+        periods = self._month_range(start_year, start_month, months)
+        buckets = self._bucket_by_month(user_id, periods, transaction_type)
+        return self._summarize(periods, buckets)
+
+    def get_overview(self, user_id, now=None, limit=5):
+        # Mesmo resultado de get_monthly_report + get_top_categories + get_yearly_summary,
+        # com uma leitura e uma passada pelo histórico
+        now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        periods = self._month_range(now.year, 1, 12)
+
+        buckets = self._empty_buckets(periods)
+        by_category = {}
+        current_month = []
+
+        for tx in self.transaction_repository.list_by_user(user_id):
+            self._add_to_category(by_category, tx)
+
+            occurred_at = tx.occurred_at.astimezone(timezone.utc)
+            bucket = buckets.get((occurred_at.year, occurred_at.month))
+            if bucket is None:
+                continue
+
+            bucket[tx.type] += tx.amount.cents
+            bucket['count'] += 1
+
+            if occurred_at.month == now.month:
+                current_month.append(tx)
+
+        month = buckets[(now.year, now.month)]
 
-        year_income = Money(0)
-        year_expense = Money(0)
+        return {
+            'current_month_report': self._month_report(now.year, now.month, month['income'], month['expense'], current_month),
+            'top_categories': self._rank_categories(by_category, limit),
+            'yearly_summary': self._year_summary(now.year, self._summarize(periods, buckets)),
+        }
 
-        for month_data in monthly_data:
-            year_income = year_income + month_data['income']
-            year_expense = year_expense + month_data['expense']
+    @staticmethod
+    def _empty_buckets(periods):
+        return {period: {'income': 0, 'expense': 0, 'count': 0} for period in periods}
 
-        year_balance = year_income - year_expense
+    def _month_report(self, year, month, income_cents, expense_cents, transactions):
+        return {
+            'year': year,
+            'month': month,
+            'month_name': self._get_month_name(month),
+            'income_total': Money.from_cents(income_cents),
+            'expense_total': Money.from_cents(expense_cents),
+            'balance': Money.from_cents(income_cents - expense_cents),
+            'transaction_count': len(transactions),
+            'transactions': sorted(transactions, key=lambda x: x.occurred_at, reverse=True)
+        }
 
+    @staticmethod
+    def _year_summary(year, summary):
         return {
             'year': year,
-            'income_total': year_income,
-            'expense_total': year_expense,
-            'balance': year_balance,
+            'income_total': summary['income_total'],
+            'expense_total': summary['expense_total'],
+            'balance': summary['balance'],
+            'monthly_data': summary['monthly_data']
+        }
+
+    def _bucket_by_month(self, user_id, periods, transaction_type=None):
+        # Uma única varredura: cada transação cai direto no balde (ano, mês), em centavos
+        buckets = self._empty_buckets(periods)
+
+        for tx in self.transaction_repository.list_by_user(user_id):
+            if transaction_type and tx.type != transaction_type:
+                continue
+
+            occurred_at = tx.occurred_at.astimezone(timezone.utc)
+            bucket = buckets.get((occurred_at.year, occurred_at.month))
+            if bucket is None:
+                continue
+
+            bucket[tx.type] += tx.amount.cents
+            bucket['count'] += 1
+
+        return buckets
+
+    def _summarize(self, periods, buckets):
+        monthly_data = []
+        income_cents = 0
+        expense_cents = 0
+        count = 0
+
+        for year, month in periods:
+            bucket = buckets[(year, month)]
+            income_cents += bucket['income']
+            expense_cents += bucket['expense']
+            count += bucket['count']
+
+            monthly_data.append({
+                'year': year,
+                'month': month,
+                'month_name': self._get_month_name(month),
+                'income': Money.from_cents(bucket['income']),
+                'expense': Money.from_cents(bucket['expense']),
+                'balance': Money.from_cents(bucket['income'] - bucket['expense']),
+                'transaction_count': bucket['count']
+            })
+
+        return {
+            'start': periods[0] if periods else None,
+            'end': periods[-1] if periods else None,
+            'income_total': Money.from_cents(income_cents),
+            'expense_total': Money.from_cents(expense_cents),
+            'balance': Money.from_cents(income_cents - expense_cents),
+            'transaction_count': count,
             'monthly_data': monthly_data
         }
 
+    @staticmethod
+    def _month_range(start_year, start_month, months):
+        periods = []
+        year, month = start_year, start_month
+
+        for _ in range(months):
+            periods.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        return periods
+
     def get_category_trend(self, user_id, category_name, months=12):
         transactions = self.transaction_repository.list_by_user(user_id)
 
@@ -175,36 +268,31 @@ class ReportService:
         if transaction_type:
             transactions = [tx for tx in transactions if tx.type == transaction_type]
 
-        report = defaultdict(lambda: {'total': Money(0), 'type': None})
-
+        report = {}
         for tx in transactions:
-            category_name = tx.category.name
-            # O tipo da categoria é o mesmo tipo da transação
-            report[category_name]['total'] = report[category_name]['total'] + tx.amount
-            report[category_name]['type'] = tx.category.type
-
-        # Converte para lista de tuplas (category_name, total, type)
-        report_list = [
-            (name, data['total'], data['type'])
-            for name, data in report.items()
-        ]
+            self._add_to_category(report, tx)
 
-        # Ordena por total
-        sorted_report = sorted(
-            report_list,
-            key=lambda x: x[1].amount,
-            reverse=True
-        )
+        return self._rank_categories(report, limit)
 
-        top_items = sorted_report[:limit]
+    @staticmethod
+    def _add_to_category(report, tx):
+        # O tipo da categoria é o mesmo tipo da transação
+        category = report.setdefault(tx.category.name, {'total': 0, 'type': None})
+        category['total'] += tx.amount.cents
+        category['type'] = tx.category.type
+
+    @staticmethod
+    def _rank_categories(report, limit):
+        # Ordena por total (centavos) e mantém só as maiores
+        top_items = sorted(report.items(), key=lambda item: item[1]['total'], reverse=True)[:limit]
 
         return [
             {
                 'category': category,
-                'total': total,
-                'type': type_
+                'total': Money.from_cents(data['total']),
+                'type': data['type']
             }
-            for category, total, type_ in top_items
+            for category, data in top_items
         ]
 
     def _filter_by_date_range(self, transactions, start_date, end_date):
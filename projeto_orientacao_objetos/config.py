@@ -18,8 +18,14 @@ class Config:
     INVESTMENTS_DB_PATH = os.path.join(DATA_DIR, 'investments.json')
     CATEGORIES_DB_PATH = os.path.join(DATA_DIR, 'categories.json')
 
-    CACHE_TYPE = 'simple'
-    CACHE_DEFAULT_TIMEOUT = 300
+    # SimpleCache (memória do processo), FileSystemCache ou RedisCache
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 300))
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(DATA_DIR, 'cache'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+
+    # Rendimento automático dos investimentos a cada N segundos (0 = desligado; ou `flask accrue-investments`)
+    ACCRUAL_INTERVAL = float(os.getenv('ACCRUAL_INTERVAL', 0))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -32,6 +38,7 @@ class TestingConfig(Config):
     TRANSACTIONS_DB_PATH = os.path.join(DATA_DIR, 'transactions.json')
     INVESTMENTS_DB_PATH = os.path.join(DATA_DIR, 'investments.json')
     CATEGORIES_DB_PATH = os.path.join(DATA_DIR, 'categories.json')
+    CACHE_DIR = os.path.join(DATA_DIR, 'cache')
 
 class ProductionConfig(Config):
     DEBUG = False
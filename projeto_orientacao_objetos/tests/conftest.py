@@ -0,0 +1,5 @@
+# Garante que o pytest encontre o pacote 'app' sem precisar exportar PYTHONPATH
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from app.models import Investment, Money
+from app.repositories import InvestmentRepository, JSONStorage
+from app.services import AccrualService
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_service(tmp_path):
+    repo = InvestmentRepository(JSONStorage(str(tmp_path / 'investments.json')))
+    return AccrualService(repo), repo
+
+
+def investment(name, amount='1000', user_id='u1', current=None, last_accrued_at=T0, rate=0.01):
+    return Investment(name, 'renda_fixa', amount, current or amount, rate, user_id,
+                      start_date=T0, last_accrued_at=last_accrued_at)
+
+
+def test_juros_compostos_por_dias():
+    days_per_month = AccrualService.DAYS_PER_MONTH
+    result = AccrualService.accrue_cents([100_000, 100_000, 250_000, 50_000], [0.01, 0.01, 0.0, -2.0], [0, 365, 90, 30])
+    assert result[0] == 100_000
+    assert result[1] == round(100_000 * 1.01 ** (365 / days_per_month))
+    assert 112_600 < result[1] < 112_700
+    assert result[2] == 250_000
+    assert result[3] == 0
+
+
+def test_job_atualiza_todos_os_usuarios_numa_gravacao(tmp_path):
+    service, repo = make_service(tmp_path)
+    for name, user_id in [('A', 'u1'), ('B', 'u1'), ('C', 'u2')]:
+        repo.add(investment(name, user_id=user_id))
+    versions = {user_id: repo.get_version(user_id) for user_id in ('u1', 'u2')}
+
+    saves = []
+    original_save = repo.storage.save
+    repo.storage.save = lambda data: (saves.append(1), original_save(data))
+
+    now = T0 + timedelta(days=30, hours=20)
+    result = service.accrue_all(now)
+    expected = AccrualService.accrue_cents([100_000], [0.01], [30])[0]
+
+    assert (result['checked'], result['accrued'], result['baselined'], len(saves)) == (3, 3, 0, 1)
+    assert result['interest'] == Money.from_cents(3 * (expected - 100_000))
+    for inv in repo.list_all():
+        assert inv.current_amount.cents == expected
+        assert inv.last_accrued_at == T0 + timedelta(days=30)
+    assert all(repo.get_version(user_id) != version for user_id, version in versions.items())
+
+    # Mesmo dia: nada a aplicar, nada gravado
+    assert service.accrue_all(now + timedelta(hours=2))['accrued'] == 0
+    assert len(saves) == 1
+
+
+def test_registros_sem_data_de_referencia(tmp_path):
+    service, repo = make_service(tmp_path)
+    untouched = investment('A', last_accrued_at=None)
+    edited = investment('B', current='1200', last_accrued_at=None)
+    repo.add(untouched)
+    repo.add(edited)
+
+    now = T0 + timedelta(days=60)
+    result = service.accrue_all(now)
+    assert (result['accrued'], result['baselined']) == (1, 1)
+    assert repo.get_by_id(untouched.id, 'u1').current_amount.cents == AccrualService.accrue_cents([100_000], [0.01], [60])[0]
+    assert repo.get_by_id(edited.id, 'u1').current_amount == Money('1200')
+    assert repo.get_by_id(edited.id, 'u1').last_accrued_at == now
+
+
+def test_edicao_entre_leitura_e_gravacao_nao_se_perde(tmp_path):
+    service, repo = make_service(tmp_path)
+    for name in 'ABC':
+        repo.add(investment(name))
+    a, b, c = repo.list_all()
+    original_list = repo.list_all
+
+    def list_then_edit():
+        investments = original_list()
+        # Outra requisição grava entre a leitura do job e a gravação dele
+        repo.update(Investment('A2', 'renda_fixa', '1000', '1000', 0.01, 'u1', start_date=T0,
+                               notes='editado', id_=a.id, last_accrued_at=T0))
+        repo.update(Investment('B', 'renda_fixa', '1000', '1500', 0.01, 'u1', start_date=T0,
+                               id_=b.id, last_accrued_at=T0 + timedelta(days=3)))
+        return investments
+
+    repo.list_all = list_then_edit
+    result = service.accrue_all(T0 + timedelta(days=30))
+    repo.list_all = original_list
+
+    expected = AccrualService.accrue_cents([100_000], [0.01], [30])[0]
+    assert (result['checked'], result['accrued']) == (3, 2)
+    assert result['interest'] == Money.from_cents(2 * (expected - 100_000))
+
+    kept = repo.get_by_id(a.id, 'u1')
+    assert (kept.name, kept.notes, kept.current_amount.cents) == ('A2', 'editado', expected)
+    skipped = repo.get_by_id(b.id, 'u1')
+    assert (skipped.current_amount, skipped.last_accrued_at) == (Money('1500'), T0 + timedelta(days=3))
+    assert repo.get_by_id(c.id, 'u1').current_amount.cents == expected
+
+
+def test_taxa_alterada_entre_leitura_e_gravacao_nao_se_perde(tmp_path):
+    service, repo = make_service(tmp_path)
+    repo.add(investment('A'))
+    inv = repo.list_all()[0]
+    original_list = repo.list_all
+
+    def list_then_edit():
+        investments = original_list()
+        repo.update(Investment('A', 'renda_fixa', '1000', '1000', 0.02, 'u1', start_date=T0,
+                               id_=inv.id, last_accrued_at=T0))
+        return investments
+
+    repo.list_all = list_then_edit
+    result = service.accrue_all(T0 + timedelta(days=30))
+    repo.list_all = original_list
+
+    assert (result['checked'], result['accrued']) == (1, 0)
+    stored = repo.get_by_id(inv.id, 'u1')
+    assert (stored.monthly_rate, stored.current_amount, stored.last_accrued_at) == (0.02, Money('1000'), T0)
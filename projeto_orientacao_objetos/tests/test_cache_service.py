@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime, timezone
+from flask import Flask
+from flask_caching import Cache
+from app.models import Category, Money, Transaction
+from app.repositories import CategoryRepository, JSONStorage, TransactionRepository
+from app.services import CacheService, ReportService
+
+WHEN = datetime(2025, 3, 10, tzinfo=timezone.utc)
+MERCADO = Category('Mercado', 'expense', 'u1')
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+    with app.app_context():
+        yield app
+
+
+def make_repositories(tmp_path):
+    transactions = TransactionRepository(JSONStorage(str(tmp_path / 'transactions.json')))
+    categories = CategoryRepository(JSONStorage(str(tmp_path / 'categories.json')))
+    return transactions, categories
+
+
+def add(repo, amount, user_id='u1'):
+    transaction = Transaction('expense', amount, 'x', MERCADO, user_id=user_id, occurred_at=WHEN)
+    repo.add(transaction)
+    return transaction
+
+
+def test_versao_muda_so_com_escritas_do_usuario(tmp_path):
+    repo, _ = make_repositories(tmp_path)
+    assert repo.get_version('u1') == '.0'
+
+    transaction = add(repo, '10')
+    v1 = repo.get_version('u1')
+    other = repo.get_version('u2')
+    assert v1 != '.0'
+
+    add(repo, '5', user_id='u2')
+    assert repo.get_version('u1') == v1
+    assert repo.get_version('u2') != other
+
+    repo.delete(transaction.id, 'u1')
+    assert repo.get_version('u1') not in (v1, '.0')
+
+
+def test_escrita_invalida_relatorio_memorizado(app, tmp_path):
+    transactions, categories = make_repositories(tmp_path)
+    report_service = ReportService(transactions)
+    cache = CacheService(transactions, categories)
+    calls = []
+
+    def summary():
+        calls.append(1)
+        return report_service.get_yearly_summary('u1', 2025)
+
+    add(transactions, '10')
+    assert cache.memoize('yearly_summary', 'u1', summary, 2025)['expense_total'] == Money('10')
+    assert cache.memoize('yearly_summary', 'u1', summary, 2025)['expense_total'] == Money('10')
+    assert len(calls) == 1
+
+    add(transactions, '5')
+    assert cache.memoize('yearly_summary', 'u1', summary, 2025)['expense_total'] == Money('15')
+    assert len(calls) == 2
+
+    # Escrita em outro repositório da chave também invalida
+    categories.add(Category('Lazer', 'expense', 'u1'))
+    cache.memoize('yearly_summary', 'u1', summary, 2025)
+    assert len(calls) == 3
+
+
+def test_chave_separa_usuarios_e_argumentos(app, tmp_path):
+    transactions, categories = make_repositories(tmp_path)
+    cache = CacheService(transactions, categories)
+    add(transactions, '10')
+
+    assert cache.memoize('report', 'u1', lambda: 'u1-2025', 2025) == 'u1-2025'
+    assert cache.memoize('report', 'u2', lambda: 'u2-2025', 2025) == 'u2-2025'
+    assert cache.memoize('report', 'u1', lambda: 'u1-2024', 2024) == 'u1-2024'
+    assert cache.memoize('outro', 'u1', lambda: 'outro', 2025) == 'outro'
+    assert cache.memoize('report', 'u1', lambda: 'recalculado', 2025) == 'u1-2025'
+
+
+def test_sem_contexto_de_aplicacao_nao_memoriza(tmp_path):
+    transactions, categories = make_repositories(tmp_path)
+    cache = CacheService(transactions, categories)
+    calls = []
+    for _ in range(2):
+        cache.memoize('report', 'u1', lambda: calls.append(1))
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from app.models import Category, Transaction
+from app.repositories import CategoryRepository, JSONStorage, TransactionRepository
+from app.services import CategoryService, DashboardService, ReportService
+
+NOW = datetime(2025, 3, 15, 12, tzinfo=timezone.utc)
+
+
+def make_services(tmp_path):
+    transactions = TransactionRepository(JSONStorage(str(tmp_path / 'transactions.json')))
+    categories = CategoryService(CategoryRepository(JSONStorage(str(tmp_path / 'categories.json'))))
+    return DashboardService(transactions, categories), ReportService(transactions), transactions
+
+
+def ids(transactions):
+    return [tx.id for tx in transactions]
+
+
+def test_painel_de_relatorios_igual_a_composicao_antiga(tmp_path):
+    dashboard_service, report_service, repo = make_services(tmp_path)
+    names = [('Salário', 'income'), ('Mercado', 'expense'), ('Aluguel', 'expense'), ('Lazer', 'expense'),
+             ('Extra', 'income'), ('Saúde', 'expense'), ('Transporte', 'expense')]
+    categories = {name: Category(name, type_, 'u1') for name, type_ in names}
+    rows = [
+        ('income', '5000', 'Salário', datetime(2025, 3, 5, tzinfo=timezone.utc)),
+        ('expense', '1500', 'Aluguel', datetime(2025, 3, 10, tzinfo=timezone.utc)),
+        ('expense', '320.45', 'Mercado', datetime(2025, 3, 14, tzinfo=timezone.utc)),
+        ('expense', '0.10', 'Mercado', datetime(2025, 3, 31, 23, tzinfo=timezone.utc)),
+        ('expense', '80', 'Lazer', datetime(2025, 2, 28, 23, 59, tzinfo=timezone.utc)),
+        ('income', '5000', 'Salário', datetime(2025, 2, 5, tzinfo=timezone.utc)),
+        ('expense', '40', 'Saúde', datetime(2025, 1, 2, tzinfo=timezone.utc)),
+        ('income', '700', 'Extra', datetime(2024, 3, 20, tzinfo=timezone.utc)),
+        ('expense', '60', 'Transporte', datetime(2024, 12, 31, 23, 59, tzinfo=timezone.utc)),
+        ('expense', '25', 'Transporte', datetime(2026, 1, 1, tzinfo=timezone.utc)),
+    ]
+    for type_, amount, category, when in rows:
+        repo.add(Transaction(type_, amount, 'x', categories[category], user_id='u1', occurred_at=when))
+    repo.add(Transaction('income', '9', 'x', Category('Salário', 'income', 'u2'), user_id='u2', occurred_at=NOW))
+
+    dashboard = dashboard_service.get_reports_dashboard('u1', now=NOW)
+
+    monthly = report_service.get_monthly_report('u1', NOW.year, NOW.month)
+    current = dashboard['current_month_report']
+    assert ids(current.pop('transactions')) == ids(monthly.pop('transactions'))
+    assert current == monthly
+
+    assert dashboard['top_categories'] == report_service.get_top_categories('u1', limit=5)
+    assert len(dashboard['top_categories']) == 5
+    assert dashboard['yearly_summary'] == report_service.get_yearly_summary('u1', NOW.year)
+    assert set(dashboard) == {'current_month_report', 'top_categories', 'yearly_summary', 'categories'}
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from app.models import Category, Transaction
+from app.repositories import JSONStorage, TransactionRepository
+from app.services import ExportService
+
+SALARIO = Category('Salário', 'income', 'u1')
+MERCADO = Category('Mercado', 'expense', 'u1')
+LAZER = Category('Lazer', 'expense', 'u1')
+
+
+def make_service(tmp_path, chunk_rows=2):
+    repo = TransactionRepository(JSONStorage(str(tmp_path / 'transactions.json')))
+    repo.add_many([
+        Transaction('income', '3000', 'Salário', SALARIO, user_id='u1', occurred_at=datetime(2025, 1, 5, tzinfo=timezone.utc)),
+        Transaction('expense', '200.10', 'Feira, "orgânicos"', MERCADO, user_id='u1', occurred_at=datetime(2025, 1, 20, tzinfo=timezone.utc)),
+        Transaction('expense', '80', 'Cinema', LAZER, user_id='u1', occurred_at=datetime(2025, 1, 31, 18, tzinfo=timezone.utc)),
+        Transaction('expense', '50.05', 'Padaria', MERCADO, user_id='u1', occurred_at=datetime(2025, 2, 1, tzinfo=timezone.utc)),
+        Transaction('income', '1', 'Outro usuário', SALARIO, user_id='u2', occurred_at=datetime(2025, 1, 5, tzinfo=timezone.utc)),
+    ])
+    return ExportService(repo, chunk_rows=chunk_rows), repo
+
+
+def descriptions(records):
+    return sorted(tx_data['description'] for tx_data in records)
+
+
+def test_csv_tem_cabecalho_e_uma_linha_por_transacao(tmp_path):
+    service, repo = make_service(tmp_path)
+    chunks = list(service.stream('csv', service.records('u1')))
+    # Cabeçalho + 4 linhas em blocos de 2
+    assert len(chunks) == 3
+
+    rows = list(csv.reader(io.StringIO(''.join(chunks))))
+    assert rows[0] == ExportService.CSV_COLUMNS
+    expected = sorted(
+        [tx.id, tx.occurred_at.isoformat(), tx.type, tx.category.name, tx.description, str(tx.amount.amount)]
+        for tx in repo.list_by_user('u1')
+    )
+    assert sorted(rows[1:]) == expected
+
+
+def test_ndjson_tem_um_objeto_por_linha(tmp_path):
+    service, repo = make_service(tmp_path)
+    body = ''.join(service.stream('ndjson', service.records('u1')))
+    lines = body.splitlines()
+    assert len(lines) == 4 and body.endswith('\n')
+    assert sorted((json.loads(line) for line in lines), key=lambda d: d['id']) == sorted(
+        (tx.to_dict() for tx in repo.list_by_user('u1')), key=lambda d: d['id'])
+
+
+def test_arquivo_vazio_e_formato_invalido(tmp_path):
+    service, _ = make_service(tmp_path)
+    assert ''.join(service.stream('csv', service.records('u3'))) == ','.join(ExportService.CSV_COLUMNS) + '\r\n'
+    assert list(service.stream('ndjson', service.records('u3'))) == []
+    with pytest.raises(ValueError):
+        list(service.stream('xml', service.records('u1')))
+
+
+def test_filtros_de_periodo_tipo_e_categoria(tmp_path):
+    service, _ = make_service(tmp_path)
+    start = datetime(2025, 1, 20, tzinfo=timezone.utc)
+    end = datetime(2025, 1, 31, 18, tzinfo=timezone.utc)
+
+    assert descriptions(service.records('u1', start_date=start)) == ['Cinema', 'Feira, "orgânicos"', 'Padaria']
+    assert descriptions(service.records('u1', end_date=end)) == ['Cinema', 'Feira, "orgânicos"', 'Salário']
+    assert descriptions(service.records('u1', start_date=start, end_date=end)) == ['Cinema', 'Feira, "orgânicos"']
+    assert descriptions(service.records('u1', type_='income')) == ['Salário']
+    assert descriptions(service.records('u1', category='Mercado')) == ['Feira, "orgânicos"', 'Padaria']
+    assert descriptions(service.records('u1', start_date=start, type_='expense', category='Mercado')) == [
+        'Feira, "orgânicos"', 'Padaria']
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Os controllers criam os arquivos em Config.*_DB_PATH ao serem importados
+    import config
+    for name in ('USERS_DB_PATH', 'TRANSACTIONS_DB_PATH', 'INVESTMENTS_DB_PATH', 'CATEGORIES_DB_PATH'):
+        monkeypatch.setattr(config.Config, name, str(tmp_path / 'app' / f'{name.lower()}.json'))
+
+    from app import create_app
+    from app.controllers import transaction_controller
+
+    service, _ = make_service(tmp_path)
+    monkeypatch.setattr(transaction_controller, 'export_service', service)
+
+    client = create_app('testing').test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 'u1'
+    return client
+
+
+def test_rota_aplica_filtros_e_inclui_o_dia_final_inteiro(client):
+    response = client.get('/transactions/export?format=csv&type=expense&start_date=2025-01-01&end_date=2025-01-31')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=transacoes.csv'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert sorted(row[4] for row in rows[1:]) == ['Cinema', 'Feira, "orgânicos"']
+
+    response = client.get('/transactions/export?format=ndjson&category=Mercado')
+    assert response.mimetype == 'application/x-ndjson'
+    assert descriptions(json.loads(line) for line in response.get_data(as_text=True).splitlines()) == [
+        'Feira, "orgânicos"', 'Padaria']
+
+
+def test_rota_redireciona_formato_ou_data_invalidos(client):
+    for query in ('format=xml', 'format=csv&start_date=ontem'):
+        response = client.get(f'/transactions/export?{query}')
+        assert response.status_code == 302
+        assert response.headers['Location'].endswith('/transactions/')
@@ -0,0 +1,120 @@
+import io
+import pytest
+from datetime import datetime, timezone
+from app.models import Money
+from app.repositories import CategoryRepository, JSONStorage, TransactionRepository
+from app.services import CategoryService, ImportService
+
+CSV = """Data;Histórico;Valor;Categoria
+05/01/2025;Salário;5.000,00;Trabalho
+10/01/2025;Mercado  Central;-1.234,56;Mercado
+10/01/2025;Mercado  Central;-1.234,56;Mercado
+15/01/2025;Tarifa;;
+;;;
+12/01/2025;Farmácia;(30,00);
+"""
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250203120000[-3:BRT]
+<TRNAMT>-45.90
+<MEMO>Padaria
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250205
+<TRNAMT>1200.00
+<NAME>Pix recebido
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+def make_service(tmp_path, **kwargs):
+    transactions = TransactionRepository(JSONStorage(str(tmp_path / 'transactions.json')))
+    categories = CategoryRepository(JSONStorage(str(tmp_path / 'categories.json')))
+    service = ImportService(transactions, CategoryService(categories), **kwargs)
+    return service, transactions, categories
+
+
+def test_csv_com_formato_brasileiro(tmp_path):
+    service, transactions, categories = make_service(tmp_path)
+    result = service.import_file('u1', io.StringIO(CSV), 'csv')
+
+    assert (result['processed'], result['imported'], result['duplicates'], result['failed']) == (5, 4, 0, 1)
+    assert result['errors'] == ["linha 4: Valor inválido: ''"]
+
+    imported = sorted(transactions.list_by_user('u1'), key=lambda tx: (tx.occurred_at, tx.description))
+    assert [(tx.type, tx.amount, tx.description, tx.category.name) for tx in imported] == [
+        ('income', Money('5000'), 'Salário', 'Trabalho'),
+        ('expense', Money('1234.56'), 'Mercado  Central', 'Mercado'),
+        ('expense', Money('1234.56'), 'Mercado  Central', 'Mercado'),
+        ('expense', Money('30'), 'Farmácia', ImportService.DEFAULT_CATEGORY),
+    ]
+    assert imported[0].occurred_at == datetime(2025, 1, 5, tzinfo=timezone.utc)
+    assert sorted(cat.name for cat in categories.list_by_user('u1')) == ['Importado', 'Mercado', 'Trabalho']
+
+
+def test_ofx_e_mapeamento_de_colunas(tmp_path):
+    service, transactions, _ = make_service(tmp_path)
+    result = service.import_file('u1', io.StringIO(OFX), 'ofx')
+    assert (result['imported'], result['failed']) == (2, 0)
+    assert sorted((tx.type, tx.amount, tx.description) for tx in transactions.list_by_user('u1')) == [
+        ('expense', Money('45.90'), 'Padaria'), ('income', Money('1200'), 'Pix recebido'),
+    ]
+
+    csv = "quando,quanto,o que\n2025-03-01,10.50,Café\n"
+    mapping = {'date': 'quando', 'amount': 'quanto', 'description': 'o que'}
+    assert service.import_file('u2', io.StringIO(csv), 'csv', mapping)['imported'] == 1
+    assert transactions.list_by_user('u2')[0].amount == Money('10.50')
+
+
+def test_reimportar_nao_duplica_e_repeticoes_do_arquivo_sobrevivem(tmp_path):
+    service, transactions, _ = make_service(tmp_path)
+    service.import_file('u1', io.StringIO(CSV), 'csv')
+
+    again = service.import_file('u1', io.StringIO(CSV), 'csv')
+    assert (again['imported'], again['duplicates']) == (0, 4)
+
+    # Três linhas iguais contra duas já gravadas: só a terceira entra
+    extra = CSV.replace(
+        "12/01/2025;Farmácia", "10/01/2025;mercado central;-1.234,56;Mercado\n12/01/2025;Farmácia"
+    )
+    result = service.import_file('u1', io.StringIO(extra), 'csv')
+    assert (result['imported'], result['duplicates']) == (1, 4)
+    assert len(transactions.list_by_user('u1')) == 5
+
+    # Mesmo arquivo para outro usuário não é duplicata
+    assert service.import_file('u2', io.StringIO(CSV), 'csv')['imported'] == 4
+
+
+def test_grava_em_lotes_e_informa_progresso(tmp_path):
+    service, transactions, _ = make_service(tmp_path, batch_size=2)
+    writes = []
+    original = transactions.add_many
+    transactions.add_many = lambda txs: (writes.append(len(txs)), original(txs))
+
+    progress = []
+    rows = "data,valor,descricao\n" + "".join(f"2025-01-{day:02d},-{day},compra {day}\n" for day in range(1, 6))
+    result = service.import_file('u1', io.StringIO(rows), 'csv', on_progress=lambda r: progress.append(r['imported']))
+
+    assert writes == [2, 2, 1]
+    assert progress == [2, 4, 5]
+    assert result['imported'] == 5
+    assert transactions.verify_totals() == []
+
+
+def test_linhas_invalidas_e_limite_de_erros(tmp_path):
+    service, transactions, _ = make_service(tmp_path, max_errors=2)
+    rows = "data,valor,descricao\n2025-01-01,abc,x\n2025-13-01,10,x\n2025-01-02,0,x\n2025-01-03,10,ok\n"
+    result = service.import_file('u1', io.StringIO(rows), 'csv')
+
+    assert (result['processed'], result['imported'], result['failed']) == (4, 1, 3)
+    assert result['errors'] == ["linha 1: Valor inválido: 'abc'", "linha 2: Data inválida: '2025-13-01'"]
+
+    with pytest.raises(ValueError, match='amount'):
+        service.import_file('u1', io.StringIO("data,descricao\n2025-01-01,x\n"), 'csv')
+    with pytest.raises(ValueError):
+        service.import_file('u1', io.StringIO(CSV), 'xls')
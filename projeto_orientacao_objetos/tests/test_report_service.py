@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+from app.models import Category, Money, Transaction
+from app.repositories import JSONStorage, TransactionRepository
+from app.services import ReportService
+
+SALARIO = Category('Salário', 'income', 'u1')
+MERCADO = Category('Mercado', 'expense', 'u1')
+
+
+def make_service(tmp_path):
+    repo = TransactionRepository(JSONStorage(str(tmp_path / 'transactions.json')))
+    return ReportService(repo), repo
+
+
+def add(repo, type_, amount, when, user_id='u1'):
+    category = SALARIO if type_ == 'income' else MERCADO
+    repo.add(Transaction(type_, amount, 'x', category, user_id=user_id, occurred_at=when))
+
+
+def test_resumo_de_periodo_atravessa_a_virada_do_ano(tmp_path):
+    service, repo = make_service(tmp_path)
+    add(repo, 'income', '3000', datetime(2024, 12, 5, tzinfo=timezone.utc))
+    add(repo, 'expense', '0.10', datetime(2024, 12, 31, 23, 59, tzinfo=timezone.utc))
+    add(repo, 'expense', '0.20', datetime(2024, 12, 31, 12, tzinfo=timezone.utc))
+    add(repo, 'expense', '100', datetime(2025, 1, 1, tzinfo=timezone.utc))
+    # 31/01 21h em São Paulo já é fevereiro em UTC
+    add(repo, 'expense', '50', datetime(2025, 1, 31, 21, tzinfo=timezone(timedelta(hours=-3))))
+    add(repo, 'income', '999', datetime(2025, 3, 1, tzinfo=timezone.utc))
+    add(repo, 'income', '1', datetime(2024, 12, 10, tzinfo=timezone.utc), user_id='u2')
+
+    span = service.get_span_summary('u1', 2024, 12, 3)
+    assert (span['start'], span['end']) == ((2024, 12), (2025, 2))
+    assert [(m['year'], m['month'], m['month_name']) for m in span['monthly_data']] == [
+        (2024, 12, 'Dezembro'), (2025, 1, 'Janeiro'), (2025, 2, 'Fevereiro'),
+    ]
+    december, january, february = span['monthly_data']
+    assert december['expense'] == Money('0.30')
+    assert december['balance'] == Money('2999.70')
+    assert december['transaction_count'] == 3
+    assert (january['expense'], january['transaction_count']) == (Money('100'), 1)
+    assert (february['expense'], february['transaction_count']) == (Money('50'), 1)
+    assert span['income_total'] == Money('3000')
+    assert span['expense_total'] == Money('150.30')
+    assert span['balance'] == Money('2849.70')
+    assert span['transaction_count'] == 5
+
+    expenses = service.get_span_summary('u1', 2024, 12, 3, transaction_type='expense')
+    assert (expenses['income_total'], expenses['transaction_count']) == (Money(0), 4)
+
+
+def test_resumo_anual_igual_aos_relatorios_mensais(tmp_path):
+    service, repo = make_service(tmp_path)
+    add(repo, 'income', '1000', datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc))
+    add(repo, 'income', '2000', datetime(2025, 1, 1, tzinfo=timezone.utc))
+    add(repo, 'expense', '200.10', datetime(2025, 1, 20, tzinfo=timezone.utc))
+    add(repo, 'expense', '50.05', datetime(2025, 12, 31, 23, 59, 59, tzinfo=timezone.utc))
+    add(repo, 'expense', '75', datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+    yearly = service.get_yearly_summary('u1', 2025)
+    assert yearly['year'] == 2025
+    assert len(yearly['monthly_data']) == 12
+    assert yearly['income_total'] == Money('2000')
+    assert yearly['expense_total'] == Money('250.15')
+    assert yearly['balance'] == Money('1749.85')
+
+    for data in yearly['monthly_data']:
+        monthly = service.get_monthly_report('u1', 2025, data['month'])
+        assert (data['income'], data['expense'], data['balance'], data['transaction_count']) == (
+            monthly['income_total'], monthly['expense_total'], monthly['balance'], monthly['transaction_count'],
+        )
+
+    assert service.get_yearly_summary('u1', 2024)['income_total'] == Money('1000')
+    assert service.get_yearly_summary('u1', 2026)['expense_total'] == Money('75')
@@ -0,0 +1,109 @@
+import json
+from datetime import datetime, timedelta, timezone
+from app.models import Category, Transaction
+from app.repositories import JSONStorage, TransactionRepository
+
+SALARIO = Category('Salário', 'income', 'u1')
+MERCADO = Category('Mercado', 'expense', 'u1')
+
+
+def make_repo(tmp_path):
+    path = tmp_path / 'transactions.json'
+    return TransactionRepository(JSONStorage(str(path))), path
+
+
+def tx(type_, amount, when, user_id='u1', id_=None):
+    category = SALARIO if type_ == 'income' else MERCADO
+    return Transaction(type_, amount, 'x', category, user_id=user_id, occurred_at=when, id_=id_)
+
+
+def rescan(path):
+    # Recalcula os agregados direto do histórico gravado, sem passar pelo repositório
+    data = json.loads(path.read_text(encoding='utf-8'))
+    totals, daily = {}, {}
+    for user_id, items in data.items():
+        if user_id == '__meta__':
+            continue
+        for tx_data in items:
+            tx = Transaction.from_dict(tx_data)
+            counters = totals.setdefault(user_id, {'income': 0, 'expense': 0, 'count': 0})
+            counters[tx.type] += tx.amount.cents
+            counters['count'] += 1
+            day = tx.occurred_at.astimezone(timezone.utc).date().isoformat()
+            bucket = daily.setdefault(user_id, {}).setdefault(day, [0, 0, 0])
+            bucket[0 if tx.type == 'income' else 1] += tx.amount.cents
+            bucket[2] += 1
+    return data['__meta__'], totals, daily
+
+
+def assert_meta_matches_history(repo, path):
+    meta, totals, daily = rescan(path)
+    assert meta['totals'] == totals
+    assert meta['daily'] == daily
+    for user_id in ('u1', 'u2'):
+        expected = totals.get(user_id, {'income': 0, 'expense': 0, 'count': 0})
+        assert repo.get_totals(user_id) == expected
+    assert repo.verify_totals() == []
+
+
+def test_agregados_acompanham_cada_gravacao(tmp_path):
+    repo, path = make_repo(tmp_path)
+    t0 = datetime(2025, 1, 31, 12, tzinfo=timezone.utc)
+
+    repo.add(tx('income', '3000', t0))
+    assert_meta_matches_history(repo, path)
+
+    # 31/01 22h em São Paulo já é 01/02 em UTC
+    repo.add_many([
+        tx('expense', '200.10', t0),
+        tx('expense', '0.05', datetime(2025, 1, 31, 22, tzinfo=timezone(timedelta(hours=-3)))),
+        tx('income', '10', t0, user_id='u2', id_='u2-a'),
+    ])
+    assert_meta_matches_history(repo, path)
+    assert repo.get_totals('u1') == {'income': 300_000, 'expense': 20_015, 'count': 3}
+
+    first = repo.list_by_user('u1')[0]
+    repo.update(tx('expense', '99.99', t0 + timedelta(days=10), id_=first.id))
+    assert_meta_matches_history(repo, path)
+
+    repo.delete('u2-a', 'u2')
+    assert_meta_matches_history(repo, path)
+    assert 'u2' not in rescan(path)[0]['totals']
+
+    for item in repo.list_by_user('u1'):
+        repo.delete(item.id, 'u1')
+    meta, _, _ = rescan(path)
+    assert (meta['totals'], meta['daily']) == ({}, {})
+
+
+def test_verify_totals_detecta_e_repara_meta_corrompido(tmp_path):
+    repo, path = make_repo(tmp_path)
+    t0 = datetime(2025, 3, 10, tzinfo=timezone.utc)
+    repo.add_many([tx('income', '100', t0), tx('expense', '40', t0), tx('income', '5', t0, user_id='u2')])
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    data['__meta__']['totals']['u1']['expense'] += 1
+    data['__meta__']['daily']['u2']['2025-03-10'][2] = 7
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+    # Relê o arquivo: a assinatura mudou
+    repo = TransactionRepository(JSONStorage(str(path)))
+    assert repo.verify_totals() == ['u1', 'u2']
+    assert repo.verify_totals() == ['u1', 'u2']
+
+    assert repo.verify_totals(repair=True) == ['u1', 'u2']
+    assert_meta_matches_history(repo, path)
+    assert repo.get_totals('u1') == {'income': 10_000, 'expense': 4_000, 'count': 2}
+
+
+def test_arquivo_sem_meta_e_reconstruido(tmp_path):
+    repo, path = make_repo(tmp_path)
+    repo.add_many([tx('income', '100', datetime(2025, 3, 10, tzinfo=timezone.utc)), tx('expense', '1.5', datetime(2025, 3, 11, tzinfo=timezone.utc))])
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    del data['__meta__']
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+    repo = TransactionRepository(JSONStorage(str(path)))
+    assert repo.get_totals('u1') == {'income': 10_000, 'expense': 150, 'count': 2}
+    assert repo.verify_totals() == []